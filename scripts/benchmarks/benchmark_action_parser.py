@@ -0,0 +1,90 @@
+import argparse
+import ast
+import glob
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+import src.evals.utils as eval_utils
+from src.evals.action_parser import ActionError, _parse, execute_action, parse_action
+
+warnings.filterwarnings("ignore")
+
+
+def load_ground_truth_actions():
+    actions = []
+    for path in sorted(glob.glob("data/processed/queries_and_answers/*.csv")):
+        answers = pd.read_csv(path, dtype=str)["answer"].apply(ast.literal_eval)
+        actions += [[action.replace("\n", "\\n") for action in answer] for answer in answers]
+    return actions
+
+
+def execute_with_eval(action):
+    try:
+        eval(action, vars(eval_utils))
+    except Exception:
+        pass
+
+
+def execute_with_parser(action):
+    try:
+        execute_action(action)
+    except ActionError:
+        pass
+
+
+def time_replays(action_lists, execute, repeats):
+    """Returns the mean time per action in microseconds, including the tool calls."""
+    start = time.perf_counter()
+    num_actions = 0
+    for _ in range(repeats):
+        for actions in action_lists:
+            for domain in eval_utils.DOMAINS:
+                domain.reset_state()
+            for action in actions:
+                execute(action)
+            num_actions += len(actions)
+    return (time.perf_counter() - start) / num_actions * 1e6
+
+
+def time_parsing(actions, parse, repeats):
+    """Returns the mean time to turn an action string into a call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for action in actions:
+            try:
+                parse(action)
+            except (ActionError, SyntaxError):
+                pass
+    return (time.perf_counter() - start) / (repeats * len(actions)) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks executing actions with eval() and with the parser.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of times the ground truth answers are replayed.")
+    args = parser.parse_args()
+
+    action_lists = load_ground_truth_actions()
+    actions = [action for actions in action_lists for action in actions]
+    _parse.cache_clear()
+    parse_us = time_parsing(actions, lambda action: compile(action, "<action>", "eval"), args.repeats)
+    uncached_us = time_parsing(actions, lambda action: _parse.__wrapped__(action), args.repeats)
+    # Fills the cache, which happens once per distinct action
+    time_parsing(actions, parse_action, 1)
+    cached_us = time_parsing(actions, parse_action, args.repeats)
+    eval_us = time_replays(action_lists, execute_with_eval, args.repeats)
+    parser_us = time_replays(action_lists, execute_with_parser, args.repeats)
+    for domain in eval_utils.DOMAINS:
+        domain.reset_state()
+
+    print(f"Replayed {len(action_lists)} ground truth answers, {len(actions)} actions, {args.repeats} times")
+    print(f"Per action, compiling for eval():  {parse_us:.1f} us")
+    print(f"Per action, parsing:               {uncached_us:.1f} us")
+    print(f"Per action, cached parse:          {cached_us:.1f} us")
+    print(f"Per action with the tool call, eval():  {eval_us:.1f} us")
+    print(f"Per action with the tool call, parser:  {parser_us:.1f} us")
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME
+from src.tools.domain_table import DomainTable
+
+
+def make_emails(num_rows):
+    """Returns an emails table with num_rows rows, repeating the processed emails with new IDs."""
+    emails = pd.read_csv("data/processed/emails.csv", dtype=str)
+    emails = emails.iloc[np.arange(num_rows) % len(emails)].reset_index(drop=True)
+    emails["email_id"] = [str(i).zfill(8) for i in range(num_rows)]
+    return emails
+
+
+def new_email(email_id):
+    return [email_id, "outbox", "jane@example.com", "Reminder", HARDCODED_CURRENT_TIME, "Meeting at 10am"]
+
+
+def time_frame_appends(emails, num_appends):
+    """Returns the mean time per append in microseconds when appending with emails.loc[len(emails)]."""
+    emails = emails.copy()
+    start = time.perf_counter()
+    for i in range(num_appends):
+        emails.loc[len(emails)] = new_email(str(i))
+    return (time.perf_counter() - start) / num_appends * 1e6
+
+
+def time_table_appends(emails, num_appends):
+    """Returns the mean time per append in microseconds when appending to a table, including reading it at the end."""
+    table = DomainTable(emails, indexed_columns=("email_id",))
+    # The first write copies the pristine table, which is not part of the per-append cost
+    table.set_values([0], "subject", "Updated")
+    start = time.perf_counter()
+    for i in range(num_appends):
+        table.append_row(new_email(str(i)))
+    table.frame
+    return (time.perf_counter() - start) / num_appends * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks appending emails to tables of different sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Table sizes.")
+    parser.add_argument("--num_appends", type=int, default=200, help="Number of emails appended per table size.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'frame append (us)':>18} {'table append (us)':>18}")
+    for size in args.sizes:
+        emails = make_emails(size)
+        frame_us = time_frame_appends(emails, args.num_appends)
+        table_us = time_table_appends(emails, args.num_appends)
+        print(f"{size:>9} {frame_us:>18.1f} {table_us:>18.1f}")
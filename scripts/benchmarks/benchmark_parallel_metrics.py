@@ -0,0 +1,67 @@
+import argparse
+import ast
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+from src.evals.utils import AVAILABLE_LLMS, calculate_metrics, get_latest_results_path
+
+warnings.filterwarnings("ignore")
+
+results_root_dir = os.path.join("data", "results")
+tools = ["multi_domain", "email", "calendar", "analytics", "project_management", "customer_relationship_manager"]
+
+
+def load_results(all_tools_in_prompt):
+    """Returns the ground truth and latest predictions of every model and tool, as calculate_all_metrics reads them."""
+    results = []
+    for model in AVAILABLE_LLMS:
+        for tool in tools:
+            paths = get_latest_results_path(results_root_dir, model, tool, all_tools_in_prompt)
+            if paths is None:
+                continue
+            predictions = pd.read_csv(paths[0], dtype=str)
+            ground_truth = pd.read_csv(paths[1], dtype=str)
+            ground_truth["answer"] = ground_truth["answer"].apply(ast.literal_eval)
+            predictions["function_calls"] = predictions["function_calls"].apply(ast.literal_eval)
+            results.append((ground_truth, predictions))
+    return results
+
+
+def time_metrics(results, num_workers):
+    """Returns the time to calculate the metrics of every results file in seconds, and the metrics."""
+    start = time.perf_counter()
+    # calculate_metrics prints a summary of each file
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics = [
+            calculate_metrics(ground_truth, predictions, print_errors=False, num_workers=num_workers)
+            for ground_truth, predictions in results
+        ]
+    return time.perf_counter() - start, metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks calculating the metrics with 1 to N worker processes.")
+    parser.add_argument("--max_workers", type=int, default=os.cpu_count(), help="Largest number of workers to time.")
+    parser.add_argument("--all_tools", action="store_true", help="Use the results with all tools in the prompt.")
+    args = parser.parse_args()
+
+    results = load_results(args.all_tools)
+    num_rows = sum(len(predictions) for _, predictions in results)
+    # Fills the cache of the ground truth states, so that every number of workers only replays the predictions
+    _, expected = time_metrics(results, 1)
+
+    print(f"Calculated the metrics of {len(results)} results files, {num_rows} predictions, on {os.cpu_count()} cores")
+    serial_s = None
+    for num_workers in range(1, args.max_workers + 1):
+        seconds, metrics = time_metrics(results, num_workers)
+        serial_s = serial_s or seconds
+        assert all(frame.equals(expected_frame) for frame, expected_frame in zip(metrics, expected))
+        print(f"{num_workers} workers: {seconds:.1f} s, {serial_s / seconds:.2f}x")
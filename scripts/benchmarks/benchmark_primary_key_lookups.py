@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+from src.tools.domain_table import DomainTable
+
+
+def make_emails(num_rows):
+    """Returns an emails table with num_rows rows, repeating the processed emails with new IDs."""
+    emails = pd.read_csv("data/processed/emails.csv", dtype=str)
+    emails = emails.iloc[np.arange(num_rows) % len(emails)].reset_index(drop=True)
+    emails["email_id"] = [str(i).zfill(8) for i in range(num_rows)]
+    return emails
+
+
+def time_per_call(function, arguments):
+    """Returns the mean time per call in microseconds."""
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / len(arguments) * 1e6
+
+
+def scan_lookup(emails, email_id):
+    return emails[emails["email_id"] == email_id].to_dict(orient="records")
+
+
+def index_lookup(table, email_id):
+    return table.frame.iloc[table.rows("email_id", email_id)].to_dict(orient="records")
+
+
+def scan_update(emails, email_id):
+    emails.loc[emails["email_id"] == email_id, "subject"] = "Updated"
+
+
+def index_update(table, email_id):
+    table.set_values(table.rows("email_id", email_id), "subject", "Updated")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks looking up and updating emails by ID.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000], help="Table sizes.")
+    parser.add_argument("--num_calls", type=int, default=50, help="Number of lookups and updates per table size.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'build (ms)':>11} {'scan get (us)':>14} {'index get (us)':>15} {'scan update (us)':>17} {'index update (us)':>18}")
+    for size in args.sizes:
+        emails = make_emails(size)
+        email_ids = list(np.random.default_rng(0).choice(emails["email_id"].to_numpy(), args.num_calls))
+        table = DomainTable(emails, indexed_columns=("email_id",))
+        start = time.perf_counter()
+        table.rows("email_id", email_ids[0])
+        build_ms = (time.perf_counter() - start) * 1000
+        # The first write copies the pristine table, which is not part of the per-update cost
+        index_update(table, email_ids[0])
+
+        scan_get_us = time_per_call(lambda email_id: scan_lookup(emails, email_id), email_ids)
+        index_get_us = time_per_call(lambda email_id: index_lookup(table, email_id), email_ids)
+        scan_update_us = time_per_call(lambda email_id: scan_update(emails.copy(deep=False), email_id), email_ids)
+        index_update_us = time_per_call(lambda email_id: index_update(table, email_id), email_ids)
+        print(
+            f"{size:>9} {build_ms:>11.1f} {scan_get_us:>14.1f} {index_get_us:>15.1f} "
+            f"{scan_update_us:>17.1f} {index_update_us:>18.1f}"
+        )
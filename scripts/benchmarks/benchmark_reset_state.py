@@ -0,0 +1,78 @@
+import argparse
+import ast
+import glob
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+import src.evals.utils as eval_utils
+
+warnings.filterwarnings("ignore")
+
+# The CSVs that reset_state() used to re-read for every domain
+PROCESSED_TABLES = [
+    "data/processed/calendar_events.csv",
+    "data/processed/emails.csv",
+    "data/processed/analytics_data.csv",
+    "data/processed/project_tasks.csv",
+    "data/processed/customer_relationship_manager_data.csv",
+]
+
+
+def csv_reset():
+    """Resets all domains the way reset_state() did before the in-memory snapshots."""
+    for path in PROCESSED_TABLES:
+        pd.read_csv(path, dtype=str)
+
+
+def snapshot_reset():
+    """Resets all domains from the in-memory snapshots."""
+    for domain in eval_utils.DOMAINS:
+        domain.reset_state()
+
+
+def load_ground_truth_actions(num_queries):
+    actions = []
+    for path in sorted(glob.glob("data/processed/queries_and_answers/*.csv")):
+        answers = pd.read_csv(path, dtype=str)["answer"].apply(ast.literal_eval)
+        actions += [[action.replace("\n", "\\n") for action in answer] for answer in answers]
+    return actions[:num_queries]
+
+
+def time_resets(action_lists, reset):
+    """Returns the mean reset cost per evaluation in milliseconds."""
+    total = 0.0
+    for actions in action_lists:
+        # Each evaluation resets all domains before executing the actions and again afterwards
+        start = time.perf_counter()
+        reset()
+        total += time.perf_counter() - start
+        for action in actions:
+            try:
+                eval(action, vars(eval_utils))
+            except Exception:
+                continue
+        start = time.perf_counter()
+        reset()
+        total += time.perf_counter() - start
+        snapshot_reset()
+    return total / len(action_lists) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the cost of resetting the sandbox per evaluation.")
+    parser.add_argument("--num_queries", type=int, default=200, help="Number of ground truth answers to replay.")
+    args = parser.parse_args()
+
+    action_lists = load_ground_truth_actions(args.num_queries)
+    csv_ms = time_resets(action_lists, csv_reset)
+    snapshot_ms = time_resets(action_lists, snapshot_reset)
+    print(f"Replayed {len(action_lists)} ground truth answers")
+    print(f"Reset cost per evaluation, re-reading CSVs:   {csv_ms:.3f} ms")
+    print(f"Reset cost per evaluation, in-memory restore: {snapshot_ms:.3f} ms")
+    print(f"Speed-up: {csv_ms / snapshot_ms:.1f}x")
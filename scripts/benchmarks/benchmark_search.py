@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+from src.tools.domain_table import DomainTable
+from src.tools.query_planner import Between, Contains, find_rows
+
+# Mixed searches of the customers, as keyword arguments of customer_relationship_manager.search_customers
+SEARCHES = [
+    {"customer_name": "smith"},
+    {"status": "Lead", "assigned_to_email": "sam"},
+    {"product_interest": "Software", "last_contact_date_min": "2023-10-01"},
+    {"customer_email": "example.com", "status": "Qualified", "follow_up_by_max": "2023-12-31"},
+    {"customer_name": "a", "product_interest": "Hardware", "status": "Won"},
+    {"last_contact_date_min": "2023-05-01", "last_contact_date_max": "2023-05-31", "follow_up_by_min": "2023-06-15"},
+    {"customer_name": "does not exist", "status": "Lead"},
+]
+TEXT_COLUMNS = ("customer_name", "customer_email", "product_interest", "status", "assigned_to_email")
+DATE_COLUMNS = ("last_contact_date", "follow_up_by")
+
+
+def make_customers(num_rows):
+    """Returns a customers table with num_rows rows, repeating the processed customers with new IDs."""
+    customers = pd.read_csv("data/processed/customer_relationship_manager_data.csv", dtype=str)
+    customers = customers.iloc[np.arange(num_rows) % len(customers)].reset_index(drop=True)
+    customers["customer_id"] = [str(i).zfill(8) for i in range(num_rows)]
+    return customers
+
+
+def make_table(customers):
+    return DomainTable(
+        customers,
+        indexed_columns=("customer_id", *TEXT_COLUMNS, *DATE_COLUMNS),
+        text_indexes={"name_text": ("customer_name",), "email_text": ("customer_email",)},
+    )
+
+
+def search_by_filtering(customers, parameters):
+    """Searches the customers by filtering a copy of the whole table once per parameter."""
+    customers = customers.copy()
+    for column in TEXT_COLUMNS:
+        if parameters.get(column):
+            customers = customers[customers[column].str.contains(parameters[column], case=False)]
+    for column in DATE_COLUMNS:
+        if parameters.get(f"{column}_min"):
+            customers = customers[customers[column] >= parameters[f"{column}_min"]]
+        if parameters.get(f"{column}_max"):
+            customers = customers[customers[column] <= parameters[f"{column}_max"]]
+    return customers.to_dict(orient="records")[:5]
+
+
+def search_with_planner(table, parameters):
+    """Searches the customers with the query planner, as search_customers does."""
+    text_indexes = {"customer_name": "name_text", "customer_email": "email_text"}
+    predicates = [
+        Contains(column, parameters[column], text_indexes.get(column))
+        for column in TEXT_COLUMNS
+        if column in parameters
+    ]
+    predicates += [
+        Between(column, parameters.get(f"{column}_min"), parameters.get(f"{column}_max"))
+        for column in DATE_COLUMNS
+        if f"{column}_min" in parameters or f"{column}_max" in parameters
+    ]
+    return table.frame.iloc[find_rows(table, predicates, limit=5)].to_dict(orient="records")
+
+
+def time_searches(search, repeats):
+    """Returns the mean time per search in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for parameters in SEARCHES:
+            search(parameters)
+    return (time.perf_counter() - start) / (repeats * len(SEARCHES)) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks mixed multi-predicate customer searches.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Table sizes.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times each search is run.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'filtering (us)':>15} {'planner (us)':>13}")
+    for size in args.sizes:
+        customers = make_customers(size)
+        table = make_table(customers)
+        for parameters in SEARCHES:
+            # Builds the indexes, which happens once per pristine table, and checks both searches agree
+            assert search_with_planner(table, parameters) == search_by_filtering(customers, parameters)
+        filtering_us = time_searches(lambda parameters: search_by_filtering(customers, parameters), args.repeats)
+        planner_us = time_searches(lambda parameters: search_with_planner(table, parameters), args.repeats)
+        print(f"{size:>9} {filtering_us:>15.1f} {planner_us:>13.1f}")
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+from src.tools.data_loading import read_csv_cached
+
+PROCESSED_TABLES = [
+    "data/processed/calendar_events.csv",
+    "data/processed/emails.csv",
+    "data/processed/analytics_data.csv",
+    "data/processed/project_tasks.csv",
+    "data/processed/customer_relationship_manager_data.csv",
+]
+
+
+def scale_table(path, scale_factor, output_dir):
+    """Writes a copy of the table with every row repeated scale_factor times and returns its path."""
+    data = pd.read_csv(path, dtype=str)
+    scaled_path = os.path.join(output_dir, os.path.basename(path))
+    pd.concat([data] * scale_factor, ignore_index=True).to_csv(scaled_path, index=False)
+    return scaled_path
+
+
+def time_load(load, path, repeats):
+    """Returns the fastest of several loads in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks loading the processed tables from CSV and from the cache.")
+    parser.add_argument("--scale_factor", type=int, default=1, help="Number of times to repeat the rows of each table.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of loads per table. The fastest is reported.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        print(f"{'table':<40} {'rows':>9} {'csv (ms)':>10} {'cache (ms)':>11} {'speed-up':>9}")
+        for path in PROCESSED_TABLES:
+            if args.scale_factor > 1:
+                path = scale_table(path, args.scale_factor, output_dir)
+            # Build the sidecar cache before timing the cached loads
+            rows = len(read_csv_cached(path, dtype=str))
+            csv_ms = time_load(lambda p: pd.read_csv(p, dtype=str), path, args.repeats)
+            cache_ms = time_load(lambda p: read_csv_cached(p, dtype=str), path, args.repeats)
+            table = os.path.splitext(os.path.basename(path))[0]
+            print(f"{table:<40} {rows:>9} {csv_ms:>10.2f} {cache_ms:>11.2f} {csv_ms / cache_ms:>8.1f}x")
@@ -1,5 +1,8 @@
+import argparse
+import shutil
 import sys
 import os
+import time
 
 project_root = os.path.abspath(os.path.curdir)
 sys.path.append(project_root)
@@ -17,6 +20,42 @@ domains = {
     "email": email,
     "project_management": project_management,
 }
-for domain in domains:
-    print(f"Generating {domain} sandbox data...")
-    domains[domain].generate_data()
+
+parser = argparse.ArgumentParser(description="Generates the mocked data of every domain.")
+parser.add_argument(
+    "--scale_factor",
+    "--scale-factor",
+    type=float,
+    default=None,
+    help="Generates this many times as many rows as the data in the data directory, with vectorized sampling, into "
+    "--data_dir instead of the data directory.",
+)
+parser.add_argument(
+    "--data_dir",
+    "--data-dir",
+    type=str,
+    default=None,
+    help="Directory the scaled data is written to, data_sf<scale factor> by default. Set WORKBENCH_DATA_DIR to it to "
+    "use it with the tools.",
+)
+parser.add_argument("--seed", type=int, default=42, help="Seed of the scaled data.")
+args = parser.parse_args()
+
+if args.scale_factor is None:
+    if args.data_dir is not None:
+        parser.error("--data_dir requires --scale_factor.")
+    for domain in domains:
+        print(f"Generating {domain} sandbox data...")
+        domains[domain].generate_data()
+else:
+    if args.scale_factor <= 0:
+        parser.error("--scale_factor must be positive.")
+    data_dir = args.data_dir or f"data_sf{args.scale_factor:g}"
+    # The tools also read the raw company directory from the data directory
+    shutil.copytree("data/raw", os.path.join(data_dir, "raw"), dirs_exist_ok=True)
+    for domain in domains:
+        print(f"Generating {domain} sandbox data at scale factor {args.scale_factor:g}...")
+        start = time.perf_counter()
+        domains[domain].generate_scaled_data(args.scale_factor, data_dir, seed=args.seed)
+        print(f"Generated in {time.perf_counter() - start:.1f}s")
+    print(f"Scaled data written to {data_dir}")
@@ -2,6 +2,16 @@ import pandas as pd
 import numpy as np
 from datetime import timedelta, datetime
 from tqdm import tqdm
+import os
+import sys
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+
+from src.data_generation.data_generation_utils import positions_within_groups, scaled_count, scaled_days
+
+# Visitor IDs are 4-digit strings, distinct on each day
+NUM_VISITOR_IDS = 10_000
 
 
 def generate_visitor_id(used_ids):
@@ -65,5 +75,49 @@ def generate_data():
     analytics_data.to_csv("data/processed/analytics_data.csv", index=False)
 
 
+def generate_scaled_data(scale_factor, data_dir, seed=42):
+    """
+    Generates scale_factor times as many visits as generate_data(), with vectorized sampling.
+
+    Visits are drawn from the same distributions as in generate_data(), with no visitor ID twice on a day. The window
+    of days ends on the same day and grows backwards in proportion to the scale factor, so the days hold about as many
+    visits as in the base data, until it reaches EARLIEST_SCALED_DATE.
+    """
+    rng = np.random.default_rng(seed)
+    num_records = scaled_count(1000, scale_factor)
+    start_date = datetime(2023, 9, 1)
+    end_date = datetime(2023, 11, 30)
+    days = scaled_days((end_date - start_date).days, scale_factor, (end_date - timedelta(days=1)).date())
+    day = np.sort(rng.integers(0, len(days), size=num_records))
+
+    # The visitors of a day step through the IDs from a random one by a random stride coprime with their number, so
+    # that they never repeat
+    positions = positions_within_groups(day)
+    if positions.max() >= NUM_VISITOR_IDS:
+        raise ValueError(f"Scale factor {scale_factor} has more than {NUM_VISITOR_IDS} visits on a day.")
+    offsets = rng.integers(0, NUM_VISITOR_IDS, size=len(days))
+    strides = rng.integers(0, NUM_VISITOR_IDS // 10, size=len(days)) * 10 + rng.choice([1, 3, 7, 9], size=len(days))
+    visitor_id = (offsets[day] + positions * strides[day]) % NUM_VISITOR_IDS
+
+    session_duration_seconds = rng.exponential(20, size=num_records).astype(int)
+    page_views = (rng.exponential(5, size=num_records) + 1).astype(int)
+    analytics_data = pd.DataFrame(
+        {
+            "date_of_visit": np.datetime_as_string(days[day], unit="D").astype(object),
+            "visitor_id": np.char.zfill(visitor_id.astype(str), 4).astype(object),
+            "page_views": page_views,
+            "session_duration_seconds": session_duration_seconds,
+            "traffic_source": rng.choice(
+                ["direct", "referral", "search engine", "social media"], size=num_records, p=[0.5, 0.1, 0.1, 0.3]
+            ),
+            "user_engaged": (session_duration_seconds > 10) & (page_views > 1),
+        }
+    )
+    # Visits are listed in random order, like in the base data
+    analytics_data = analytics_data.iloc[rng.permutation(num_records)]
+    os.makedirs(os.path.join(data_dir, "processed"), exist_ok=True)
+    analytics_data.to_csv(os.path.join(data_dir, "processed", "analytics_data.csv"), index=False)
+
+
 if __name__ == "__main__":
     generate_data()
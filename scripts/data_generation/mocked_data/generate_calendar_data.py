@@ -13,7 +13,23 @@ import sys
 
 project_root = os.path.abspath(os.path.curdir)
 sys.path.append(project_root)
-from src.data_generation.data_generation_utils import create_calendar_event
+from src.data_generation.data_generation_utils import (
+    HARDCODED_CURRENT_TIME,
+    calendar_days_in_future,
+    calendar_days_in_past,
+    distinct_choices_within_groups,
+    format_datetimes,
+    format_ids,
+    positions_within_groups,
+    scaled_count,
+    scaled_days,
+)
+
+# Working hours of the scaled calendar, in minutes since midnight
+WORK_START_MINUTES = 9 * 60
+WORK_END_MINUTES = 18 * 60
+# Each weekday has room for this many scaled events, unless the window cannot grow enough to hold them all
+EVENTS_PER_DAY = 4
 
 
 def generate_data():
@@ -29,5 +45,52 @@ def generate_data():
     events.to_csv("data/processed/calendar_events.csv", index=False)
 
 
+def generate_scaled_data(scale_factor, data_dir, seed=42):
+    """
+    Generates scale_factor times as many calendar events as generate_data(), with vectorized sampling.
+
+    Events are drawn as in generate_data(): weekdays only, half-hour durations of up to two hours, no overlapping
+    events and no event name twice on a day. The window of weekdays ends on the same day and grows backwards in
+    proportion to the scale factor, so the days hold about as many events as in the base data. Once the window reaches
+    EARLIEST_SCALED_DATE, days hold more events, with durations capped so that they fit in the working day.
+    """
+    rng = np.random.default_rng(seed)
+    event_names = pd.read_csv("data/raw/events.csv", header=None)[0].to_numpy()
+    emails = pd.read_csv("data/raw/email_addresses.csv", header=None)[0].to_numpy()
+    num_events = scaled_count(300, scale_factor)
+
+    first_day = (HARDCODED_CURRENT_TIME - pd.Timedelta(calendar_days_in_past, unit="d")).date()
+    last_day = (HARDCODED_CURRENT_TIME + pd.Timedelta(calendar_days_in_future, unit="d")).date()
+    days = scaled_days(np.busday_count(first_day, last_day) + 1, scale_factor, last_day, weekdays_only=True)
+    events_per_day = max(EVENTS_PER_DAY, -(-num_events // len(days)))
+    if events_per_day > min(len(event_names), (WORK_END_MINUTES - WORK_START_MINUTES) // 30):
+        raise ValueError(f"Scale factor {scale_factor} does not fit in the calendar.")
+
+    # Each event takes one of the slots of a day, and the events of a day follow each other with random gaps
+    day = np.sort(rng.choice(len(days) * events_per_day, size=num_events, replace=False)) // events_per_day
+    max_duration = (WORK_END_MINUTES - WORK_START_MINUTES) // events_per_day // 30 * 30
+    duration = np.minimum(rng.choice([30, 60, 90, 120], size=num_events), max_duration)
+    events_on_day = np.bincount(day)[day]
+    free_minutes = WORK_END_MINUTES - WORK_START_MINUTES - np.bincount(day, weights=duration)[day].astype(int)
+    gap = rng.integers(0, free_minutes // (30 * events_on_day) + 1) * 30
+    end = np.cumsum(gap + duration)
+    # Minutes from the start of the working day, subtracting the cumulative minutes of the previous days
+    first_of_day = positions_within_groups(day) == 0
+    end = end - np.maximum.accumulate(np.where(first_of_day, end - gap - duration, 0))
+    start = days[day].astype("datetime64[m]") + (WORK_START_MINUTES + end - duration).astype("timedelta64[m]")
+
+    events = pd.DataFrame(
+        {
+            "event_id": format_ids(rng.permutation(num_events), width=max(8, len(str(num_events - 1)))),
+            "event_name": event_names[distinct_choices_within_groups(rng, day, len(event_names))],
+            "participant_email": emails[rng.integers(0, len(emails), size=num_events)],
+            "event_start": format_datetimes(start),
+            "duration": duration,
+        }
+    )
+    os.makedirs(os.path.join(data_dir, "processed"), exist_ok=True)
+    events.to_csv(os.path.join(data_dir, "processed", "calendar_events.csv"), index=False)
+
+
 if __name__ == "__main__":
     generate_data()
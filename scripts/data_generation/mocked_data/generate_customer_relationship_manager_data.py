@@ -9,9 +9,130 @@ import sys
 project_root = os.path.abspath(os.path.curdir)
 sys.path.append(project_root)
 
-from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME
+from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME, format_ids, scaled_count
 from scripts.data_generation.mocked_data.generate_project_management_data import sales_team_emails
 
+first_names = [
+    "Alex",
+    "Jordan",
+    "Taylor",
+    "Casey",
+    "Jamie",
+    "Morgan",
+    "Cameron",
+    "Reese",
+    "Quinn",
+    "Peyton",
+    "Shannon",
+    "Rahul",
+    "Riley",
+    "Jessie",
+    "Dakota",
+    "Angel",
+    "Parker",
+    "Avery",
+    "Jaden",
+    "Kerry",
+]
+
+last_names = [
+    "Smith",
+    "Johnson",
+    "Williams",
+    "Jones",
+    "Brown",
+    "Davis",
+    "Miller",
+    "Wilson",
+    "Moore",
+    "Taylor",
+    "Anderson",
+    "Thomas",
+    "Jackson",
+    "White",
+    "Harris",
+    "Martin",
+    "Thompson",
+    "Garcia",
+    "Martinez",
+    "Robinson",
+]
+
+company_prefixes = [
+    "Tech",
+    "Bio",
+    "Green",
+    "Quant",
+    "Next",
+    "Inno",
+    "Ultra",
+    "Cyber",
+    "Future",
+    "Pro",
+    "Neo",
+    "Smart",
+    "Alpha",
+    "Omni",
+    "Solar",
+    "Geo",
+    "Nano",
+    "Aero",
+    "Blue",
+    "Eco",
+]
+
+company_suffixes = [
+    "Solutions",
+    "Tech",
+    "Logics",
+    "Systems",
+    "Robotics",
+    "Energy",
+    "Dynamics",
+    "Networks",
+    "Labs",
+    "Analytics",
+    "Innovations",
+    "Ventures",
+    "Designs",
+    "Electronics",
+    "Software",
+    "Hardware",
+    "Cloud",
+    "Security",
+    "Foods",
+    "Biotech",
+]
+
+company_modifiers = [
+    "Global",
+    "Dynamic",
+    "Interactive",
+    "Vision",
+    "Peak",
+    "Edge",
+    "Stream",
+    "Link",
+    "Wave",
+    "Core",
+    "Flex",
+    "Point",
+    "Access",
+    "Force",
+    "Space",
+    "Mind",
+    "Port",
+    "Path",
+    "Scope",
+    "Trace",
+]
+
+# Define product interests
+product_interests = ["Software", "Hardware", "Services", "Consulting", "Training"]
+
+# Define crm stages
+statuses = ["Qualified", "Won", "Lost", "Lead", "Proposal"]
+
 
 # Define a function to generate random customer names
 def generate_random_name(first_names, last_names):
@@ -20,73 +141,6 @@ def generate_random_name(first_names, last_names):
 
 # Define a function to generate random email addresses
 def generate_random_email(name):
-    company_prefixes = [
-        "Tech",
-        "Bio",
-        "Green",
-        "Quant",
-        "Next",
-        "Inno",
-        "Ultra",
-        "Cyber",
-        "Future",
-        "Pro",
-        "Neo",
-        "Smart",
-        "Alpha",
-        "Omni",
-        "Solar",
-        "Geo",
-        "Nano",
-        "Aero",
-        "Blue",
-        "Eco",
-    ]
-    company_suffixes = [
-        "Solutions",
-        "Tech",
-        "Logics",
-        "Systems",
-        "Robotics",
-        "Energy",
-        "Dynamics",
-        "Networks",
-        "Labs",
-        "Analytics",
-        "Innovations",
-        "Ventures",
-        "Designs",
-        "Electronics",
-        "Software",
-        "Hardware",
-        "Cloud",
-        "Security",
-        "Foods",
-        "Biotech",
-    ]
-    company_modifiers = [
-        "Global",
-        "Dynamic",
-        "Interactive",
-        "Vision",
-        "Peak",
-        "Edge",
-        "Stream",
-        "Link",
-        "Wave",
-        "Core",
-        "Flex",
-        "Point",
-        "Access",
-        "Force",
-        "Space",
-        "Mind",
-        "Port",
-        "Path",
-        "Scope",
-        "Trace",
-    ]
-
     prefix = random.choice(company_prefixes)
     suffix = random.choice(company_suffixes)
     modifier = random.choice(company_modifiers)
@@ -115,56 +169,6 @@ def generate_customer_notes():
 def generate_data():
     random.seed(42)
     np.random.seed(42)
-    first_names = [
-        "Alex",
-        "Jordan",
-        "Taylor",
-        "Casey",
-        "Jamie",
-        "Morgan",
-        "Cameron",
-        "Reese",
-        "Quinn",
-        "Peyton",
-        "Shannon",
-        "Rahul",
-        "Riley",
-        "Jessie",
-        "Dakota",
-        "Angel",
-        "Parker",
-        "Avery",
-        "Jaden",
-        "Kerry",
-    ]
-    last_names = [
-        "Smith",
-        "Johnson",
-        "Williams",
-        "Jones",
-        "Brown",
-        "Davis",
-        "Miller",
-        "Wilson",
-        "Moore",
-        "Taylor",
-        "Anderson",
-        "Thomas",
-        "Jackson",
-        "White",
-        "Harris",
-        "Martin",
-        "Thompson",
-        "Garcia",
-        "Martinez",
-        "Robinson",
-    ]
-
-    # Define product interests
-    product_interests = ["Software", "Hardware", "Services", "Consulting", "Training"]
-
-    # Define crm stages
-    statuses = ["Qualified", "Won", "Lost", "Lead", "Proposal"]
 
     # Initialize an empty DataFrame
     crm_data = pd.DataFrame(
@@ -216,5 +220,65 @@ def generate_data():
     crm_data.to_csv("data/processed/customer_relationship_manager_data.csv", index=False)
 
 
+def generate_scaled_data(scale_factor, data_dir, seed=42):
+    """
+    Generates scale_factor times as many customers as generate_data(), with vectorized sampling.
+
+    Customers are drawn as in generate_data(), with the same contact dates, and their emails are built from their
+    names. There are only 400 distinct names, so names repeat once there are more customers than that.
+    """
+    rng = np.random.default_rng(seed)
+    num_customers = scaled_count(200, scale_factor)
+    first = np.array(first_names, dtype=object)
+    last = np.array(last_names, dtype=object)
+    num_names = len(first_names) * len(last_names)
+    name = rng.choice(num_names, size=num_customers, replace=num_customers > num_names)
+    first, last = first[name // len(last_names)], last[name % len(last_names)]
+
+    prefix = rng.choice(np.array(company_prefixes, dtype=object), size=num_customers)
+    suffix = rng.choice(np.array(company_suffixes, dtype=object), size=num_customers)
+    modifier = rng.choice(np.array(company_modifiers, dtype=object), size=num_customers)
+    # Format: Prefix+Modifier+Suffix, Prefix+Suffix, Modifier+Suffix, as in generate_random_email()
+    company_format = rng.integers(0, 3, size=num_customers)
+    company = np.choose(company_format, [prefix + modifier + suffix, prefix + suffix, modifier + suffix])
+    customer_email = pd.Series(first + "." + last + "@" + company).str.lower().to_numpy()
+
+    phone_parts = [
+        rng.integers(low, high + 1, size=num_customers).astype(str).astype(object)
+        for low, high in [(100, 999), (100, 999), (1000, 9999)]
+    ]
+    has_phone = rng.random(num_customers) < 0.5
+    customer_phone = np.where(has_phone, phone_parts[0] + "-" + phone_parts[1] + "-" + phone_parts[2], None)
+
+    today = np.datetime64(HARDCODED_CURRENT_TIME.date())
+    last_contact_date = today - rng.integers(0, 61, size=num_customers)
+    follow_up_by = last_contact_date + rng.integers(7, 31, size=num_customers)
+    num_notes = rng.integers(0, 4, size=num_customers)
+    activities = np.array(["Had a call", "On holiday", "Saw the demo", "Met in person"], dtype=object)
+    notes = np.full(num_customers, "", dtype=object)
+    for i in range(3):
+        note_date = np.datetime_as_string(today - rng.integers(0, 61, size=num_customers), unit="D").astype(object)
+        activity = rng.choice(activities, size=num_customers)
+        notes += np.where(i < num_notes, note_date + ": " + activity + ". ", "")
+
+    crm_data = pd.DataFrame(
+        {
+            "customer_id": format_ids(np.arange(num_customers), width=max(8, len(str(num_customers - 1)))),
+            "assigned_to_email": rng.choice(np.asarray(sales_team_emails, dtype=object), size=num_customers),
+            "customer_name": first + " " + last,
+            "customer_email": customer_email,
+            "customer_phone": customer_phone,
+            "last_contact_date": np.datetime_as_string(last_contact_date, unit="D").astype(object),
+            "product_interest": rng.choice(np.array(product_interests, dtype=object), size=num_customers),
+            "status": rng.choice(np.array(statuses, dtype=object), size=num_customers),
+            "follow_up_by": np.datetime_as_string(follow_up_by, unit="D").astype(object),
+            "notes": notes,
+        }
+    )
+    crm_data = crm_data.sort_values(by="last_contact_date", ascending=False, kind="stable")
+    os.makedirs(os.path.join(data_dir, "processed"), exist_ok=True)
+    crm_data.to_csv(os.path.join(data_dir, "processed", "customer_relationship_manager_data.csv"), index=False)
+
+
 if __name__ == "__main__":
     generate_data()
@@ -7,7 +7,15 @@ import numpy as np
 project_root = os.path.abspath(os.path.curdir)
 sys.path.append(project_root)
 
-from src.data_generation.data_generation_utils import create_email
+from src.data_generation.data_generation_utils import (
+    HARDCODED_CURRENT_TIME,
+    create_email,
+    distinct_choices_within_groups,
+    format_datetimes,
+    format_ids,
+    scaled_count,
+    scaled_days,
+)
 
 
 def generate_data():
@@ -43,5 +51,48 @@ def generate_data():
     emails_df.to_csv("data/processed/emails.csv", index=False)
 
 
+def generate_scaled_data(scale_factor, data_dir, seed=42):
+    """
+    Generates scale_factor times as many emails as generate_data(), with vectorized sampling.
+
+    Emails are drawn as in generate_data(): received between 9am and 4pm, with no subject twice on a day. The window
+    of days ends on the same day and grows backwards in proportion to the scale factor, so the days hold about as many
+    emails as in the base data, until it reaches EARLIEST_SCALED_DATE.
+    """
+    rng = np.random.default_rng(seed)
+    email_content = pd.read_csv("data/raw/email_content_pairs.csv")
+    email_content["Content"] = email_content["Content"].str.replace("\n", "\\n")
+    num_emails = scaled_count(500, scale_factor)
+
+    first_day = pd.to_datetime("2023-10-01T00:00:00").date()
+    last_day = HARDCODED_CURRENT_TIME.date()
+    days = scaled_days((last_day - first_day).days + 1, scale_factor, last_day)
+    day = np.sort(rng.integers(0, len(days), size=num_emails))
+
+    # Each email of a day has another subject, and its content is drawn among the pairs with that subject
+    subject_codes, subjects = pd.factorize(email_content["Subject"])
+    pairs_by_subject = np.argsort(subject_codes, kind="stable")
+    first_pair = np.searchsorted(subject_codes[pairs_by_subject], np.arange(len(subjects)))
+    num_pairs = np.bincount(subject_codes)
+    subject = distinct_choices_within_groups(rng, day, len(subjects))
+    pair = pairs_by_subject[first_pair[subject] + rng.integers(0, num_pairs[subject])]
+
+    seconds = rng.integers(9, 16, size=num_emails) * 3600 + rng.integers(0, 3600, size=num_emails)
+    sent_datetime = days[day].astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+    order = np.argsort(sent_datetime, kind="stable")
+    emails_df = pd.DataFrame(
+        {
+            "email_id": format_ids(rng.permutation(num_emails), width=max(8, len(str(num_emails - 1)))),
+            "inbox/outbox": "inbox",
+            "sender/recipient": email_content["Sender"].to_numpy()[pair][order],
+            "subject": email_content["Subject"].to_numpy()[pair][order],
+            "sent_datetime": format_datetimes(sent_datetime[order]),
+            "body": email_content["Content"].to_numpy()[pair][order],
+        }
+    )
+    os.makedirs(os.path.join(data_dir, "processed"), exist_ok=True)
+    emails_df.to_csv(os.path.join(data_dir, "processed", "emails.csv"), index=False)
+
+
 if __name__ == "__main__":
     generate_data()
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import random
+import string
 from datetime import timedelta
 import sys
 import os
@@ -10,7 +11,7 @@ project_root = os.path.abspath(os.path.curdir)
 sys.path.append(project_root)
 random.seed(42)
 
-from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME
+from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME, format_ids, scaled_count
 
 team_member_emails = pd.read_csv("data/raw/email_addresses.csv", header=None).values.flatten()
 team_with_no_overdue_tasks = team_member_emails[: int(len(team_member_emails) / 3)]
@@ -50,6 +51,38 @@ task_templates = {
     ],
 }
 
+placeholder_values = {
+    "feature": [
+        "login system",
+        "payment gateway",
+        "user profile management",
+        "search functionality",
+        "data export",
+        "report generation",
+    ],
+    "module": ["user authentication", "payment processing", "content delivery", "data storage", "user management"],
+    "functionality": [
+        "search functionality",
+        "data export",
+        "report generation",
+        "user management",
+        "content delivery",
+    ],
+    "service": ["email notification", "third-party login", "cloud storage", "payment gateway", "file upload"],
+    "library_framework": ["react", "Django", "Node.js", "Flask", "Vue.js"],
+    "page_feature": ["homepage", "dashboard", "settings page", "profile page", "landing page"],
+    "API_service": ["REST API", "Google Maps API", "Stripe payment API", "Twilio SMS API", "AWS S3 API"],
+    "element": ["navigation bar", "modal window", "form submission button", "dropdown menu", "carousel"],
+    "product_section": ["mobile app", "website", "admin panel", "e-commerce platform", "blog"],
+    "workflow_process": [
+        "checkout process",
+        "sign-up flow",
+        "feedback submission",
+        "onboarding process",
+        "content creation",
+    ],
+}
+
 
 # Define a function to generate random dates for task due dates
 def generate_random_due_date(start, end):
@@ -74,39 +107,8 @@ def create_task(project_management_data, task_templates, team_emails_by_board, l
     # Choose a unique task-person combination
     while True:
         assigned_to_email = random.choice(team_member_emails)
-        task_name = template.format(
-            feature=random.choice(
-                [
-                    "login system",
-                    "payment gateway",
-                    "user profile management",
-                    "search functionality",
-                    "data export",
-                    "report generation",
-                ]
-            ),
-            module=random.choice(
-                ["user authentication", "payment processing", "content delivery", "data storage", "user management"]
-            ),
-            functionality=random.choice(
-                ["search functionality", "data export", "report generation", "user management", "content delivery"]
-            ),
-            service=random.choice(
-                ["email notification", "third-party login", "cloud storage", "payment gateway", "file upload"]
-            ),
-            library_framework=random.choice(["react", "Django", "Node.js", "Flask", "Vue.js"]),
-            page_feature=random.choice(["homepage", "dashboard", "settings page", "profile page", "landing page"]),
-            API_service=random.choice(
-                ["REST API", "Google Maps API", "Stripe payment API", "Twilio SMS API", "AWS S3 API"]
-            ),
-            element=random.choice(
-                ["navigation bar", "modal window", "form submission button", "dropdown menu", "carousel"]
-            ),
-            product_section=random.choice(["mobile app", "website", "admin panel", "e-commerce platform", "blog"]),
-            workflow_process=random.choice(
-                ["checkout process", "sign-up flow", "feedback submission", "onboarding process", "content creation"]
-            ),
-        )
+        # Every placeholder is drawn, in order, even though the template only uses one of them
+        task_name = template.format(**{name: random.choice(values) for name, values in placeholder_values.items()})
         # If this person has not been assigned this task, break the loop
         if not (
             (project_management_data["task_name"] == task_name)
@@ -161,5 +163,66 @@ def generate_data():
     project_management_data.to_csv("data/processed/project_tasks.csv", index=False)
 
 
+def generate_scaled_data(scale_factor, data_dir, seed=42):
+    """
+    Generates scale_factor times as many tasks as generate_data(), with vectorized sampling.
+
+    Tasks are drawn as in generate_data(), with the same due dates, and team members with no overdue tasks still have
+    their overdue tasks completed. A board only has about 130 distinct task-person combinations, so unlike
+    generate_data() they may repeat.
+    """
+    rng = np.random.default_rng(seed)
+    lists = np.array(["Backlog", "In Progress", "In Review", "Completed"], dtype=object)
+    team_emails_by_board = {
+        "Back end": backend_team_emails,
+        "Front end": frontend_team_emails,
+        "Design": design_team_emails,
+    }
+    num_tasks_per_board = scaled_count(100, scale_factor)
+    start_date = np.datetime64(HARDCODED_CURRENT_TIME.date() - timedelta(days=3))
+    end_date = np.datetime64(HARDCODED_CURRENT_TIME.date() + timedelta(days=13))
+
+    boards = []
+    for board, team_emails in team_emails_by_board.items():
+        # Task names of each template, filled with each value of its placeholder
+        names = [
+            [template.format(**{field: value}) for value in placeholder_values[field]]
+            for template in task_templates[board]
+            for _, field, _, _ in string.Formatter().parse(template)
+            if field
+        ]
+        num_names = np.array([len(template_names) for template_names in names])
+        first_name = np.cumsum(num_names) - num_names
+        names = np.array([name for template_names in names for name in template_names], dtype=object)
+        template = rng.integers(0, len(num_names), size=num_tasks_per_board)
+        team_emails = np.asarray(team_emails, dtype=object)
+        due_days = rng.integers(0, (end_date - start_date).astype(int) + 1, size=num_tasks_per_board)
+        boards.append(
+            pd.DataFrame(
+                {
+                    "task_name": names[first_name[template] + rng.integers(0, num_names[template])],
+                    "assigned_to_email": team_emails[rng.integers(0, len(team_emails), size=num_tasks_per_board)],
+                    "list_name": rng.choice(lists, size=num_tasks_per_board, p=[0.7, 0.04, 0.16, 0.1]),
+                    "due_date": start_date + due_days,
+                    "board": board,
+                }
+            )
+        )
+    project_management_data = pd.concat(boards, ignore_index=True)
+
+    due_date = project_management_data["due_date"].to_numpy()
+    overdue = due_date < np.datetime64(HARDCODED_CURRENT_TIME.date())
+    overdue &= project_management_data["assigned_to_email"].isin(team_with_no_overdue_tasks).to_numpy()
+    project_management_data.loc[overdue, "list_name"] = "Completed"
+    project_management_data["due_date"] = np.datetime_as_string(due_date, unit="D").astype(object)
+    # Tasks are numbered in the order they are drawn, then sorted by due date
+    num_tasks = len(project_management_data)
+    task_ids = format_ids(np.arange(num_tasks), width=max(8, len(str(num_tasks - 1))))
+    project_management_data.insert(0, "task_id", task_ids)
+    project_management_data = project_management_data.sort_values(by="due_date", kind="stable")
+    os.makedirs(os.path.join(data_dir, "processed"), exist_ok=True)
+    project_management_data.to_csv(os.path.join(data_dir, "processed", "project_tasks.csv"), index=False)
+
+
 if __name__ == "__main__":
     generate_data()
@@ -47,6 +47,12 @@ arg_parser.add_argument(
     help="Only consider domain specific tools.",
     default=False,
 )
+arg_parser.add_argument(
+    "--num_workers",
+    type=int,
+    help="Number of processes to evaluate the predictions in. Defaults to 1.",
+    default=1,
+)
 
 args = arg_parser.parse_args()
 all_tools_in_prompt = args.all_tools
@@ -66,7 +72,9 @@ if __name__ == "__main__":
         total_incorrect_two_or_more_actions = 0
         total_context_window_errors = 0
         for tool in tools:
-            results = get_latest_results_from_dir(results_root_dir, model, tool, args.print_errors, all_tools_in_prompt)
+            results = get_latest_results_from_dir(
+                results_root_dir, model, tool, args.print_errors, all_tools_in_prompt, args.num_workers
+            )
             if results is None:
                 continue
             else:
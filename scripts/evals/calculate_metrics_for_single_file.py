@@ -22,10 +22,16 @@ parser.add_argument(
     help="path to ground truth csv. By default this is stored in data/processed/",
     required=True,
 )
+parser.add_argument(
+    "--num_workers",
+    type=int,
+    help="Number of processes to evaluate the predictions in. Defaults to 1.",
+    default=1,
+)
 args = parser.parse_args()
 
 predictions = pd.read_csv(args.predictions_path)
 ground_truth = pd.read_csv(args.ground_truth_path, dtype=str)
 ground_truth["answer"] = ground_truth["answer"].apply(ast.literal_eval)
 predictions["function_calls"] = predictions["function_calls"].apply(ast.literal_eval)
-calculate_metrics(ground_truth, predictions)
+calculate_metrics(ground_truth, predictions, num_workers=args.num_workers)
@@ -0,0 +1,59 @@
+import argparse
+import ast
+import glob
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+import src.evals.utils as eval_utils
+
+warnings.filterwarnings("ignore")
+
+
+def compare_results_file(results_path, ground_truth_path):
+    """
+    Returns the rows of a results file where comparing change sets and comparing the whole frames disagree, with the
+    number of rows checked.
+    """
+    predictions = pd.read_csv(results_path, dtype=str)
+    ground_truth = pd.read_csv(ground_truth_path, dtype=str)
+    ground_truth["answer"] = ground_truth["answer"].apply(ast.literal_eval)
+    predictions["function_calls"] = predictions["function_calls"].apply(ast.literal_eval)
+    df = eval_utils.merge_predictions_and_ground_truth(ground_truth, predictions)
+    disagreements = []
+    for row, (prediction, answer, error) in enumerate(zip(df["prediction"], df["ground_truth"], df["error"])):
+        states_are_equal = eval_utils._states_are_equal(prediction, answer)
+        correct = not error and states_are_equal
+        side_effects = eval_utils._state_changed(prediction) and not states_are_equal
+        if eval_utils.is_correct(prediction, answer, error) != correct:
+            disagreements.append((row, "is_correct", correct))
+        if eval_utils.has_side_effects(prediction, answer) != side_effects:
+            disagreements.append((row, "has_side_effects", side_effects))
+    return disagreements, len(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Checks that comparing change sets agrees with comparing the whole frames on every result."
+    )
+    parser.add_argument("--results_dir", default=os.path.join("data", "results"), help="Directory of the results.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    num_rows = 0
+    num_disagreements = 0
+    for results_path in sorted(glob.glob(os.path.join(args.results_dir, "*", "*.csv"))):
+        tool = os.path.basename(os.path.dirname(results_path))
+        ground_truth_path = os.path.join("data", "processed", "queries_and_answers", f"{tool}_queries_and_answers.csv")
+        disagreements, num_file_rows = compare_results_file(results_path, ground_truth_path)
+        num_rows += num_file_rows
+        num_disagreements += len(disagreements)
+        for row, check, expected in disagreements:
+            print(f"{results_path}, row {row}: {check} should be {expected}")
+    print(f"Checked {num_rows} rows in {time.perf_counter() - start:.0f} s, {num_disagreements} disagreements")
+    sys.exit(1 if num_disagreements else 0)
@@ -7,6 +7,8 @@ np.random.seed(42)
 HARDCODED_CURRENT_TIME = pd.to_datetime("2023-11-30T00:00:00")
 calendar_days_in_future = 21  # end date is 21 december
 calendar_days_in_past = 121  # start date is 1 august
+# Scaled data never goes back further than this, so that every date can be parsed as a pd.Timestamp
+EARLIEST_SCALED_DATE = np.datetime64("1700-01-01")
 
 
 def get_first_free_slot(date, original_events_on_date, duration_minutes):
@@ -205,3 +207,59 @@ def get_natural_language_time(str_time):
         return dt.strftime("%-I%p").lower()[:-2]
     else:
         return dt.strftime("%-I:%M%p").lower()[:-2]
+
+
+def scaled_count(base_count, scale_factor):
+    """Number of rows of a table scaled from base_count rows, at least one."""
+    return max(int(round(base_count * scale_factor)), 1)
+
+
+def scaled_days(base_days, scale_factor, last_day, weekdays_only=False):
+    """Returns the days of a date window ending on last_day, base_days long at scale factor 1 and proportionally
+    longer or shorter at other scale factors, but never starting before EARLIEST_SCALED_DATE.
+
+    The days are returned in ascending order as datetime64[D] values.
+    """
+    last_day = np.datetime64(last_day, "D")
+    if weekdays_only:
+        last_day = np.busday_offset(last_day, 0, roll="backward")
+        max_days = np.busday_count(EARLIEST_SCALED_DATE, last_day) + 1
+        num_days = min(max(int(np.ceil(base_days * scale_factor)), 1), max_days)
+        return np.busday_offset(last_day, np.arange(1 - num_days, 1), roll="backward")
+    max_days = int((last_day - EARLIEST_SCALED_DATE).astype(int)) + 1
+    num_days = min(max(int(np.ceil(base_days * scale_factor)), 1), max_days)
+    return last_day - np.arange(num_days - 1, -1, -1)
+
+
+def positions_within_groups(groups):
+    """Position of each row within its group, for rows sorted by group.
+
+    Example: [0, 0, 3, 3, 3, 5] -> [0, 1, 0, 1, 2, 0]
+    """
+    groups = np.asarray(groups)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    return np.arange(len(groups)) - np.repeat(starts, np.diff(np.r_[starts, len(groups)]))
+
+
+def distinct_choices_within_groups(rng, groups, num_choices):
+    """Chooses one of num_choices options for each row, so that the rows of a group, sorted by group, never share an
+    option. Each group starts at a random option and takes the following ones in turn.
+    """
+    groups = np.asarray(groups)
+    positions = positions_within_groups(groups)
+    if len(positions) and positions.max() >= num_choices:
+        raise ValueError(f"Groups of more than {num_choices} rows cannot have distinct options.")
+    _, group_codes = np.unique(groups, return_inverse=True)
+    offsets = rng.integers(0, num_choices, size=group_codes.max() + 1 if len(groups) else 0)
+    return (offsets[group_codes] + positions) % num_choices
+
+
+def format_ids(numbers, width=8):
+    """Zero-padded string IDs of non-negative integers, as str(number).zfill(width) formats them."""
+    numbers = np.asarray(numbers)
+    return np.char.zfill(numbers.astype(str), width).astype(object)
+
+
+def format_datetimes(values):
+    """Formats datetime64 values as "YYYY-MM-DD HH:MM:SS" strings."""
+    return np.char.replace(np.datetime_as_string(values.astype("datetime64[s]"), unit="s"), "T", " ").astype(object)
@@ -0,0 +1,148 @@
+import ast
+import copy
+import functools
+from collections import namedtuple
+
+from src.tools.toolkits import tool_information
+
+# Number of distinct action strings whose parses are kept
+ACTION_CACHE_SIZE = 65536
+
+# Tools by name, e.g. "calendar.create_event"
+TOOLS_BY_NAME = {information["name"]: information["tool"] for information in tool_information}
+
+ParsedAction = namedtuple("ParsedAction", ["tool", "args", "kwargs"])
+ParsedAction.__doc__ = """
+Call of a tool parsed from an action string.
+
+Parameters
+----------
+tool : langchain.tools.BaseTool
+    Tool the action calls.
+args : tuple
+    Positional arguments.
+kwargs : tuple
+    Keyword arguments, as (name, value) pairs in the order they are given.
+"""
+
+
+class ActionError(ValueError):
+    """
+    Error raised for an action that cannot be executed.
+
+    Parameters
+    ----------
+    action : str
+        Action string.
+    reason : str
+        Why the action cannot be executed.
+    """
+
+    def __init__(self, action, reason):
+        super().__init__(f"{reason}: {action}")
+        self.action = action
+        self.reason = reason
+
+
+def _is_immutable(value):
+    return value is None or isinstance(value, (str, int, float, complex, bool, bytes))
+
+
+@functools.lru_cache(maxsize=ACTION_CACHE_SIZE)
+def _parse(action):
+    # Returns the parsed action, or why it cannot be parsed. Failures are cached too, as agents repeat bad actions.
+    try:
+        call = ast.parse(action.strip(), mode="eval").body
+    except SyntaxError as error:
+        return f"Invalid syntax ({error.msg})"
+    except (ValueError, TypeError):
+        return "Invalid syntax"
+
+    function = call.func if isinstance(call, ast.Call) else None
+    names = []
+    while isinstance(function, ast.Attribute):
+        names.append(function.attr)
+        function = function.value
+    if not isinstance(function, ast.Name):
+        return "Not a call of a tool"
+    names = [function.id] + names[::-1]
+    if len(names) != 3 or names[-1] != "func":
+        return "Not a call of <domain>.<tool>.func"
+    name = ".".join(names[:2])
+    if name not in TOOLS_BY_NAME:
+        return f"Unknown tool {name}"
+
+    if any(isinstance(arg, ast.Starred) for arg in call.args) or any(keyword.arg is None for keyword in call.keywords):
+        return "Unpacked arguments are not supported"
+    keywords = [keyword.arg for keyword in call.keywords]
+    if len(set(keywords)) != len(keywords):
+        return "Repeated keyword argument"
+    # Arguments must be literals, so that executing an action never runs other code
+    try:
+        args = tuple(ast.literal_eval(arg) for arg in call.args)
+        kwargs = tuple((keyword.arg, ast.literal_eval(keyword.value)) for keyword in call.keywords)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return "Arguments must be literals"
+    return ParsedAction(TOOLS_BY_NAME[name], args, kwargs)
+
+
+def parse_action(action):
+    """
+    Parses an action string, e.g. 'calendar.delete_event.func(event_id="00000013")', into the tool it calls and its
+    arguments.
+
+    Parses are cached by action string. Only calls of the registered tools with literal arguments are accepted, so no
+    other code can run.
+
+    Parameters
+    ----------
+    action : str
+        Action string.
+
+    Returns
+    -------
+    parsed_action : ParsedAction
+        Tool and arguments of the call.
+
+    Raises
+    ------
+    ActionError
+        If the action is not a call of a registered tool with literal arguments.
+    """
+    if not isinstance(action, str):
+        raise ActionError(repr(action), "Action is not a string")
+    parsed = _parse(action)
+    if isinstance(parsed, str):
+        raise ActionError(action, parsed)
+    return parsed
+
+
+def execute_action(action):
+    """
+    Executes an action string by calling the tool's function, as evaluating the string would.
+
+    Parameters
+    ----------
+    action : str
+        Action string.
+
+    Returns
+    -------
+    result : object
+        What the tool returns.
+
+    Raises
+    ------
+    ActionError
+        If the action is not a call of a registered tool with literal arguments, or the tool raises an exception, which
+        is chained to it.
+    """
+    tool, args, kwargs = parse_action(action)
+    kwargs = dict(kwargs)
+    if not all(_is_immutable(value) for value in args + tuple(kwargs.values())):
+        # Tools must not modify the cached arguments
+        args, kwargs = copy.deepcopy((args, kwargs))
+    try:
+        return tool.func(*args, **kwargs)
+    except Exception as error:
+        raise ActionError(action, f"{tool.name} raised {type(error).__name__}: {error}") from error
@@ -0,0 +1,184 @@
+import collections
+import glob
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import zlib
+
+import pandas as pd
+
+from src.tools.data_loading import CACHE_DIR_NAME, data_path
+from src.tools.workspace import TABLE_LOADERS, pristine_table
+
+# Ground truth states are persisted in this SQLite file in the cache directory of the processed data
+CACHE_FILE_NAME = "ground_truth_states.sqlite"
+# Number of ground truth answers whose states are kept in memory
+GROUND_TRUTH_CACHE_SIZE = 4096
+# The tools, the action parser and how states are compared determine the cached states
+_SOURCE_PATTERNS = [
+    os.path.join(os.path.dirname(__file__), os.pardir, "tools", "*.py"),
+    os.path.join(os.path.dirname(__file__), "action_parser.py"),
+    os.path.join(os.path.dirname(__file__), "utils.py"),
+]
+
+
+def normalize_actions(actions):
+    """
+    Returns the key of a list of actions: a tuple of the actions without surrounding whitespace, which does not change
+    what they do.
+    """
+    return tuple(action.strip() if isinstance(action, str) else action for action in actions)
+
+
+def _sources_digest():
+    digest = hashlib.sha256(pd.__version__.encode())
+    for path in sorted(path for pattern in _SOURCE_PATTERNS for path in glob.glob(pattern)):
+        with open(path, "rb") as file:
+            digest.update(os.path.basename(path).encode() + b"\0" + file.read())
+    return digest.hexdigest()
+
+
+def _frame_digest(frame):
+    digest = hashlib.sha256(repr((list(frame.columns), [str(dtype) for dtype in frame.dtypes])).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class GroundTruthStateCache:
+    """
+    Cache of the states that ground truth answers result in.
+
+    Ground truth answers are fixed, so each one only needs to be executed once, however many predictions it is
+    compared with. States are keyed by the normalized tuple of actions and by a fingerprint of the pristine tables
+    and of the tools' source code, so they are recomputed whenever the data or the tools change.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file the states are persisted to across runs. Defaults to ground_truth_states.sqlite in the cache
+        directory of the processed data.
+    persist : bool, optional
+        Whether to persist the states to disk. If False, they are only kept in memory.
+    """
+
+    def __init__(self, path=None, persist=True):
+        self.path = path
+        self.persist = persist
+        self.hits = 0
+        self.misses = 0
+        self._states = collections.OrderedDict()
+        self._sources = None
+        self._frame_digests = {}
+        self._lock = threading.RLock()
+
+    def clear(self):
+        """
+        Clears the states kept in memory. The states persisted to disk are kept.
+        """
+        with self._lock:
+            self._states.clear()
+            self._frame_digests.clear()
+            self.hits = self.misses = 0
+
+    def fingerprint(self):
+        """
+        Returns the fingerprint of the pristine tables and the tools that the cached states are valid for.
+        """
+        with self._lock:
+            if self._sources is None:
+                self._sources = _sources_digest()
+            digest = hashlib.sha256(self._sources.encode())
+            for name in sorted(TABLE_LOADERS):
+                frame = pristine_table(name)
+                cached = self._frame_digests.get(name)
+                if cached is None or cached[0] is not frame:
+                    # Keeps the frame alive so that its id is never reused for another frame
+                    cached = self._frame_digests[name] = (frame, _frame_digest(frame))
+                digest.update(name.encode() + b"\0" + cached[1].encode())
+            return digest.hexdigest()
+
+    def get(self, actions, compute):
+        """
+        Returns the states that a list of actions results in, computing them only if they are not cached.
+
+        Parameters
+        ----------
+        actions : list
+            List of actions as strings.
+        compute : callable
+            Function that executes a list of actions and returns what describes the state they result in, e.g. its
+            change sets. It must be picklable.
+
+        Returns
+        -------
+        states : object
+            What compute returns for the actions. It is shared by every caller, so it must not be modified.
+        """
+        actions = normalize_actions(actions)
+        with self._lock:
+            key = self._key(actions)
+            if key in self._states:
+                self._states.move_to_end(key)
+                self.hits += 1
+                return self._states[key]
+            states = self._read(key)
+            if states is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                states = compute(list(actions))
+                self._write(key, states)
+            self._states[key] = states
+            if len(self._states) > GROUND_TRUTH_CACHE_SIZE:
+                self._states.popitem(last=False)
+            return states
+
+    def _key(self, actions):
+        return hashlib.sha256(f"{self.fingerprint()}:{actions!r}".encode()).hexdigest()
+
+    def _database_path(self):
+        return self.path or data_path("processed", CACHE_DIR_NAME, CACHE_FILE_NAME)
+
+    def _connect(self):
+        path = self._database_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=60)
+        connection.execute("CREATE TABLE IF NOT EXISTS states (key TEXT PRIMARY KEY, value BLOB)")
+        return connection
+
+    def _read(self, key):
+        if not self.persist:
+            return None
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute("SELECT value FROM states WHERE key = ?", (key,)).fetchone()
+            finally:
+                connection.close()
+            return None if row is None else pickle.loads(zlib.decompress(row[0]))
+        except (OSError, sqlite3.Error, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # A missing or unreadable cache only means the states are computed again
+            return None
+
+    def _write(self, key, states):
+        if not self.persist:
+            return
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT OR IGNORE INTO states (key, value) VALUES (?, ?)",
+                        (key, zlib.compress(pickle.dumps(states, protocol=pickle.HIGHEST_PROTOCOL), 1)),
+                    )
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error):
+            # The cache cannot be written, for example on a read-only file system, so the states are kept in memory
+            pass
+
+
+# Change sets of the states of the ground truth answers, which is_correct and has_side_effects compare with
+GROUND_TRUTH_STATES = GroundTruthStateCache()
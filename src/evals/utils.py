@@ -1,8 +1,10 @@
 import re
 import os
+import concurrent.futures
 import pandas as pd
 import random
 import ast
+import json
 from langchain_openai import ChatOpenAI, OpenAI
 from langchain_community.chat_models.anthropic import ChatAnthropic
 from langchain_community.chat_models.anyscale import ChatAnyscale
@@ -10,7 +12,12 @@ from langchain.agents import initialize_agent, AgentType
 import csv
 from src.tools import calendar, email, analytics, project_management, customer_relationship_manager, company_directory
 from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME
+from src.evals.action_parser import ActionError, execute_action
+from src.evals.ground_truth_cache import GROUND_TRUTH_STATES
+from src.tools.state_fingerprint import CASE_SENSITIVE_COLUMNS, frozen_fingerprint
+from src.tools.workspace import TABLE_LOADERS, Workspace, current_workspace
 from src.tools.toolkits import (
+    bind_tools_to_workspace,
     calendar_toolkit,
     email_toolkit,
     analytics_toolkit,
@@ -22,6 +29,11 @@ from src.tools.toolkits import (
 
 
 DOMAINS = [calendar, email, analytics, project_management, customer_relationship_manager]
+# Tables holding the state of each domain, in the order of DOMAINS
+STATE_TABLES = ["calendar_events", "emails", "plots_data", "project_tasks", "crm_data"]
+# Number of shards calculate_metrics splits the rows into per worker process, so that workers finishing early take over
+# the remaining shards
+SHARDS_PER_WORKER = 4
 AVAILABLE_LLMS = [
     "gpt-4",
     "gpt-3.5",
@@ -35,18 +47,27 @@ def convert_agent_action_to_function_call(action):
     """Converts langchain_core.agents.AgentAction to an API call"""
     args = []
     for k, v in action.tool_input.items():
-        args.append(f'{k}="{v}"')
+        # Lists, like the IDs of the bulk tools, are written as literals so that they are replayed as lists. Other
+        # values are written as strings in double quotes, as the ground truth answers are, with quotes and newlines
+        # escaped.
+        value = repr(v) if isinstance(v, (list, tuple)) else json.dumps(str(v), ensure_ascii=False)
+        args.append(f"{k}={value}")
     return action.tool + ".func(" + ", ".join(args) + ")"
 
 
-def execute_actions_and_reset_state(actions):
+def execute_actions_and_reset_state(actions, errors=None):
     """
     Executes a list of actions on the calendar and returns the resulting calendar events.
 
+    The actions run against the current workspace, so evaluations on different threads can each use their own. Each
+    action is parsed once and dispatched to its tool, and actions that cannot be executed are skipped.
+
     Parameters
     ----------
     actions : list
         List of actions to be executed. Each action should be a function call.
+    errors : list, optional
+        List that the ActionError of each skipped action is appended to.
 
     Returns
     -------
@@ -65,9 +86,10 @@ def execute_actions_and_reset_state(actions):
     # Execute the actions
     for action in actions:
         try:
-            eval(action)
-        except:
-            continue
+            execute_action(action)
+        except ActionError as error:
+            if errors is not None:
+                errors.append(error)
     new_calendar_state = calendar.CALENDAR_EVENTS.copy()
     new_email_state = email.EMAILS.copy()
     new_analytics_state = analytics.PLOTS_DATA.copy()
@@ -173,27 +195,64 @@ def get_function_name(action):
     return ".".join(action.split("(")[0].split(".")[0:2])
 
 
-def is_correct(predicted_actions, ground_truth_actions, error):
+def convert_strs_to_lowercase(df):
+    """Converts the strings of a state to lowercase in place, except in the fields where the case matters"""
+    for col in df.columns:
+        if col not in CASE_SENSITIVE_COLUMNS:
+            df[col] = df[col].str.lower()
+    return df
+
+
+def _execute_and_convert_to_lowercase(actions):
+    _, *states = execute_actions_and_reset_state(actions)
+    return tuple(convert_strs_to_lowercase(state) for state in states)
+
+
+def execute_actions_and_record_changes(actions):
     """
-    Checks if the prediction is correct by comparing the state change after executing the actions.
+    Executes a list of actions like execute_actions_and_reset_state, but returns the change set of each domain instead
+    of copies of the resulting state.
+
+    A change set only holds hashes of the rows the actions inserted, updated or deleted, so computing and comparing
+    change sets takes time proportional to the number of actions rather than to the size of the tables. Two states have
+    equal change sets when their frames are equal, and a state has empty change sets when it is the original one.
 
     Parameters
     ----------
-    predicted_actions : list
-        List of predicted actions as strings.
-    ground_truth_actions : list
-        List of ground truth actions as strings.
-    error : str
-        Error message from the prediction.
+    actions : list
+        List of actions to be executed. Each action should be a function call.
 
     Returns
     -------
-    bool
-        True if the predicted actions result in the same state change as the ground truth actions.
+    change_sets tuple
+        ChangeSet of each domain, in the order of DOMAINS, as the tables are.
+    lowercase_change_sets tuple
+        ChangeSet of each domain with its strings converted to lowercase, as is_correct compares states.
 
+    A change set is None if the state must be compared as a whole, e.g. because it holds values that cannot be hashed,
+    which execute_actions_and_reset_state then does.
     """
-    if error:
-        return False
+    for domain in DOMAINS:
+        domain.reset_state()
+    for action in actions:
+        try:
+            execute_action(action)
+        except ActionError:
+            pass
+    tables = [current_workspace().table(name) for name in STATE_TABLES]
+    change_sets = tuple(table.change_set() for table in tables)
+    lowercase_change_sets = tuple(table.change_set(lowercase=True) for table in tables)
+    for domain in DOMAINS:
+        domain.reset_state()
+    return change_sets, lowercase_change_sets
+
+
+def _ground_truth_change_sets(actions):
+    return execute_actions_and_record_changes(actions)[1]
+
+
+def _states_are_equal(predicted_actions, ground_truth_actions):
+    # Compares the states converted to lowercase by comparing the whole frames
     (
         successful_execution,
         predicted_calendar_state,
@@ -203,21 +262,12 @@ def is_correct(predicted_actions, ground_truth_actions, error):
         predicted_customer_relationship_manager_state,
     ) = execute_actions_and_reset_state(predicted_actions)
     (
-        _,
         ground_truth_calendar_state,
         ground_truth_email_state,
         ground_truth_analytics_state,
         ground_truth_project_management_state,
         ground_truth_customer_relationship_manager_state,
-    ) = execute_actions_and_reset_state(ground_truth_actions)
-
-    def convert_strs_to_lowercase(df):
-        # For some fields the case matters, so we don't convert them to lowercase
-        fields_not_to_convert = ["status", "list_name", "board"]
-        for col in df.columns:
-            if col not in fields_not_to_convert:
-                df[col] = df[col].str.lower()
-        return df
+    ) = _execute_and_convert_to_lowercase(ground_truth_actions)
 
     # We allow for case-insensitive comparison of strings for most fields
     predicted_calendar_state = convert_strs_to_lowercase(predicted_calendar_state)
@@ -228,14 +278,6 @@ def is_correct(predicted_actions, ground_truth_actions, error):
         predicted_customer_relationship_manager_state
     )
 
-    ground_truth_calendar_state = convert_strs_to_lowercase(ground_truth_calendar_state)
-    ground_truth_email_state = convert_strs_to_lowercase(ground_truth_email_state)
-    ground_truth_analytics_state = convert_strs_to_lowercase(ground_truth_analytics_state)
-    ground_truth_project_management_state = convert_strs_to_lowercase(ground_truth_project_management_state)
-    ground_truth_customer_relationship_manager_state = convert_strs_to_lowercase(
-        ground_truth_customer_relationship_manager_state
-    )
-
     return (
         successful_execution
         and predicted_calendar_state.equals(ground_truth_calendar_state)
@@ -246,6 +288,75 @@ def is_correct(predicted_actions, ground_truth_actions, error):
     )
 
 
+def _state_is_correct(predicted_lowercase_change_sets, predicted_actions, ground_truth_actions):
+    # The ground truth change sets are cached, so each ground truth answer is only executed once
+    ground_truth_change_sets = GROUND_TRUTH_STATES.get(ground_truth_actions, _ground_truth_change_sets)
+    if None in predicted_lowercase_change_sets or None in ground_truth_change_sets:
+        return _states_are_equal(predicted_actions, ground_truth_actions)
+    return predicted_lowercase_change_sets == ground_truth_change_sets
+
+
+def is_correct(predicted_actions, ground_truth_actions, error):
+    """
+    Checks if the prediction is correct by comparing the state change after executing the actions.
+
+    The states are compared through the change sets of the rows the actions inserted, updated and deleted, which are
+    case-insensitive except in the fields where the case matters. The change sets of the ground truth actions are
+    cached, so each ground truth answer is only executed once. Use state_differences to see how the states differ.
+
+    Parameters
+    ----------
+    predicted_actions : list
+        List of predicted actions as strings.
+    ground_truth_actions : list
+        List of ground truth actions as strings.
+    error : str
+        Error message from the prediction.
+
+    Returns
+    -------
+    bool
+        True if the predicted actions result in the same state change as the ground truth actions.
+
+    """
+    if error:
+        return False
+    _, predicted_lowercase_change_sets = execute_actions_and_record_changes(predicted_actions)
+    return _state_is_correct(predicted_lowercase_change_sets, predicted_actions, ground_truth_actions)
+
+
+def state_differences(predicted_actions, ground_truth_actions):
+    """
+    Returns the rows that differ between the states the predicted and the ground truth actions result in, converted to
+    lowercase as is_correct compares them.
+
+    Unlike is_correct, this copies and compares the whole tables, so it is meant for inspecting errors.
+
+    Parameters
+    ----------
+    predicted_actions : list
+        List of predicted actions as strings.
+    ground_truth_actions : list
+        List of ground truth actions as strings.
+
+    Returns
+    -------
+    dict
+        For each domain whose states differ, a frame of the rows only in one of the states, with a column "state"
+        holding "prediction" or "ground truth".
+    """
+    predicted_states = _execute_and_convert_to_lowercase(predicted_actions)
+    ground_truth_states = _execute_and_convert_to_lowercase(ground_truth_actions)
+    differences = {}
+    for domain, predicted_state, ground_truth_state in zip(DOMAINS, predicted_states, ground_truth_states):
+        if not predicted_state.equals(ground_truth_state):
+            rows = predicted_state.merge(ground_truth_state, how="outer", indicator="state")
+            rows = rows[rows["state"] != "both"]
+            rows["state"] = rows["state"].map({"left_only": "prediction", "right_only": "ground truth"})
+            differences[domain.__name__.split(".")[-1]] = rows.reset_index(drop=True)
+    return differences
+
+
 def extract_function_names(s):
     """Extracts function names from a string"""
     return re.findall(r"(\b\w+\.\w+)\(", s)
@@ -268,6 +379,20 @@ def has_side_effects(predicted_actions, ground_truth_actions):
         True if the predicted actions result in different state change than the ground truth actions.
 
     """
+    predicted_change_sets, predicted_lowercase_change_sets = execute_actions_and_record_changes(predicted_actions)
+    if None in predicted_change_sets:
+        state_changed = _state_changed(predicted_actions)
+    else:
+        # Every change set is empty when the state is the original one
+        state_changed = any(any(change_set) for change_set in predicted_change_sets)
+
+    # Errors like exceeding the context window or running out of time don't have side effects, so we assume no errors
+    correct = _state_is_correct(predicted_lowercase_change_sets, predicted_actions, ground_truth_actions)
+    return state_changed and not correct
+
+
+def _state_changed(predicted_actions):
+    # Checks if the predicted actions change the state by comparing the whole frames
     for domain in DOMAINS:
         domain.reset_state()
     original_state = {
@@ -293,10 +418,7 @@ def has_side_effects(predicted_actions, ground_truth_actions):
     state_changed |= not predicted_customer_relationship_manager_state.equals(
         original_state["customer_relationship_manager"]
     )
-
-    errors = ""  # Errors like exceeding the context window or running out of time don't have side effects, so we assume no errors
-    correct = is_correct(predicted_actions, ground_truth_actions, errors)
-    return state_changed and not correct
+    return state_changed
 
 
 def generate_query_and_answer(template):
@@ -343,8 +465,11 @@ def generate_all_queries_and_answers(templates, max_queries_per_template, verbos
     return generated_queries_and_answers
 
 
-def calculate_metrics(ground_truth_df, predictions_df, print_errors=True):
-    """"""
+def merge_predictions_and_ground_truth(ground_truth_df, predictions_df):
+    """
+    Returns a frame with the prediction, error and ground truth of each query, as lists of actions whose newlines are
+    escaped.
+    """
     predictions = predictions_df.rename(columns={"function_calls": "prediction"})
     predictions = predictions.fillna("")
 
@@ -357,12 +482,72 @@ def calculate_metrics(ground_truth_df, predictions_df, print_errors=True):
     # Replace all newlines with "\\n" for all actions
     df["prediction"] = df["prediction"].apply(lambda actions: [action.replace("\n", "\\n") for action in actions])
     df["ground_truth"] = df["ground_truth"].apply(lambda actions: [action.replace("\n", "\\n") for action in actions])
+    return df
+
+
+def _preload_tables():
+    # Initializer of the worker processes: loads every table and hashes its rows once, so that each row only costs
+    # replaying its actions
+    for name in TABLE_LOADERS:
+        frozen_fingerprint(current_workspace().table(name).pristine)
+
 
-    df["exact_match"] = [is_exact_match(pred, gt) for pred, gt in zip(df["prediction"], df["ground_truth"])]
-    df["correct"] = [
-        is_correct(pred, gt, error) for pred, gt, error in zip(df["prediction"], df["ground_truth"], df["error"])
+def _evaluate_rows(rows):
+    # Returns whether each prediction is an exact match, is correct and has unwanted side effects
+    return [
+        (is_exact_match(pred, gt), is_correct(pred, gt, error), has_side_effects(pred, gt)) for pred, gt, error in rows
     ]
-    df["unwanted_side_effects"] = [has_side_effects(pred, gt) for pred, gt in zip(df["prediction"], df["ground_truth"])]
+
+
+def evaluate_rows(rows, num_workers=1):
+    """
+    Evaluates predictions against their ground truth answers, in worker processes if num_workers is more than 1.
+
+    The rows are split into contiguous shards that the workers evaluate in their own copy of the tools' state, which an
+    initializer loads once per worker, and the results are merged back in the order of the rows.
+
+    Parameters
+    ----------
+    rows : list
+        Tuples of the predicted actions, the ground truth actions and the error of each prediction.
+    num_workers : int, optional
+        Number of worker processes. With 1, the rows are evaluated in the current process.
+
+    Returns
+    -------
+    list
+        Tuple of whether the prediction is an exact match, is correct and has unwanted side effects, for each row.
+    """
+    if num_workers <= 1 or len(rows) <= 1:
+        return _evaluate_rows(rows)
+    num_shards = num_workers * SHARDS_PER_WORKER
+    shard_size = (len(rows) + num_shards - 1) // num_shards
+    shards = [rows[start : start + shard_size] for start in range(0, len(rows), shard_size)]
+    with concurrent.futures.ProcessPoolExecutor(num_workers, initializer=_preload_tables) as executor:
+        return [outcome for outcomes in executor.map(_evaluate_rows, shards) for outcome in outcomes]
+
+
+def calculate_metrics(ground_truth_df, predictions_df, print_errors=True, num_workers=1):
+    """
+    Evaluates each prediction against its ground truth answer and returns the merged frame with the metrics.
+
+    Parameters
+    ----------
+    ground_truth_df : pd.DataFrame
+        Queries and their ground truth answers.
+    predictions_df : pd.DataFrame
+        Queries with the predicted function calls and errors.
+    print_errors : bool, optional
+        Whether to print the queries that were not answered correctly.
+    num_workers : int, optional
+        Number of worker processes the predictions are evaluated in. The metrics are the same whatever the number.
+    """
+    df = merge_predictions_and_ground_truth(ground_truth_df, predictions_df)
+
+    outcomes = evaluate_rows(list(zip(df["prediction"], df["ground_truth"], df["error"])), num_workers)
+    df["exact_match"] = [exact_match for exact_match, _, _ in outcomes]
+    df["correct"] = [correct for _, correct, _ in outcomes]
+    df["unwanted_side_effects"] = [side_effects for _, _, side_effects in outcomes]
     df["no_actions"] = [not len(pred) for pred in df["prediction"]]
     # wrong email if @example is in the prediction and @atlas is not in the prediction. Prediction is a list so needs to be converted to a string
     df["wrong_email"] = [("@example" in str(pred)) and ("@atlas" not in str(pred)) for pred in df["prediction"]]
@@ -570,7 +755,9 @@ def get_latest_results_path(results_root_dir, model, tool, all_tools_in_prompt=T
         return max(model_results_files, key=os.path.getctime), ground_truth_path
 
 
-def get_latest_results_from_dir(results_root_dir, model, tool, print_errors=False, all_tools_in_prompt=True):
+def get_latest_results_from_dir(
+    results_root_dir, model, tool, print_errors=False, all_tools_in_prompt=True, num_workers=1
+):
     """Get the latest results for each model in the results directory"""
     results = get_latest_results_path(results_root_dir, model, tool, all_tools_in_prompt)
     if not results:
@@ -583,7 +770,7 @@ def get_latest_results_from_dir(results_root_dir, model, tool, print_errors=Fals
         ground_truth["answer"] = ground_truth["answer"].apply(ast.literal_eval)
         predictions["function_calls"] = predictions["function_calls"].apply(ast.literal_eval)
         print(f"\nCalculating metrics for {tool} with {model}")
-        df = calculate_metrics(ground_truth, predictions, print_errors=print_errors)
+        df = calculate_metrics(ground_truth, predictions, print_errors=print_errors, num_workers=num_workers)
         num_correct = df["correct"].sum()
         num_incorrect = len(df) - num_correct
         num_side_effects = df["unwanted_side_effects"].sum()
@@ -681,10 +868,12 @@ def generate_results(queries_path, model_name, tool_selection="all", num_retrys=
             toolkits = queries_df["domains"].iloc[i].strip("][").replace("'", "").split(", ")
             tools = get_toolkits(toolkits)
 
+        # Each query runs in its own workspace so that its actions do not leak into the next query
+        workspace = Workspace()
         agent = initialize_agent(
             llm=llm,
             agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
-            tools=tools,
+            tools=bind_tools_to_workspace(tools, workspace),
             verbose=True,
             return_intermediate_steps=True,
             max_iterations=20,
@@ -752,9 +941,6 @@ def generate_results(queries_path, model_name, tool_selection="all", num_retrys=
             ],
             ignore_index=True,
         )
-        # Reset all data after each query
-        for domain in DOMAINS:
-            domain.reset_state()
 
     domain = queries_path.split("/")[-1].split(".")[0].replace("_queries_and_answers", "")
     save_dir = os.path.join("data", "results", domain)
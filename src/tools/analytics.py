@@ -1,22 +1,71 @@
+import numpy as np
 import pandas as pd
 from langchain.tools import tool
 
-ANALYTICS_DATA = pd.read_csv("data/processed/analytics_data.csv", dtype=str)
-ANALYTICS_DATA["user_engaged"] = ANALYTICS_DATA["user_engaged"] == "True"  # Convert to boolean
-PLOTS_DATA = pd.DataFrame(columns=["file_path"])
+from src.tools.daily_metrics import daily_metrics
+from src.tools.data_loading import data_path, read_csv_cached
+from src.tools.domain_table import adopt_assigned_frame
+from src.tools.workspace import current_workspace, register_table
+
+
+def _load_analytics_data():
+    analytics_data = read_csv_cached(data_path("processed", "analytics_data.csv"), dtype=str)
+    analytics_data["user_engaged"] = analytics_data["user_engaged"] == "True"  # Convert to boolean
+    return analytics_data
+
+
+def _load_plots_data():
+    return pd.DataFrame(columns=["file_path"])
+
+
+# Tables are loaded on first use rather than on import
+register_table("analytics_data", _load_analytics_data, indexed_columns=("visitor_id",))
+register_table("plots_data", _load_plots_data)
 METRICS = ["total_visits", "session_duration_seconds", "user_engaged"]
 METRIC_NAMES = ["total visits", "average session duration", "engaged users"]
 
 
+def __getattr__(name):
+    # ANALYTICS_DATA and PLOTS_DATA are served from the current workspace so that they always reflect its state
+    if name == "ANALYTICS_DATA":
+        return current_workspace().table("analytics_data").frame
+    if name == "PLOTS_DATA":
+        return current_workspace().table("plots_data").frame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _analytics_data_table():
+    return adopt_assigned_frame(current_workspace().table("analytics_data"), globals(), "ANALYTICS_DATA")
+
+
+def _plots_data_table():
+    return adopt_assigned_frame(current_workspace().table("plots_data"), globals(), "PLOTS_DATA")
+
+
+def _daily_metrics_for(analytics_data, time_min, time_max):
+    # Dates are compared as strings, so other bounds are left to the original comparisons
+    if not all(isinstance(time, str) for time in (time_min, time_max) if time):
+        return None
+    return daily_metrics(analytics_data)
+
+
+def _visits_between(analytics_data, time_min, time_max):
+    # Returns a mask of the visits between the dates, comparing the dates as strings. The frame is not copied.
+    dates = analytics_data["date_of_visit"]
+    keep = np.ones(len(dates), dtype=bool)
+    if time_min:
+        keep = (dates >= time_min).to_numpy()
+    if time_max:
+        keep[keep] = (dates[keep] <= time_max).to_numpy()
+    return keep
+
+
 def reset_state():
     """
     Resets the analytics data to the original state.
     """
-    global ANALYTICS_DATA
-    ANALYTICS_DATA = pd.read_csv("data/processed/analytics_data.csv", dtype=str)
-    ANALYTICS_DATA["user_engaged"] = ANALYTICS_DATA["user_engaged"] == "True"  # Convert to boolean
-    global PLOTS_DATA
-    PLOTS_DATA = pd.DataFrame(columns=["file_path"])
+    _analytics_data_table().reset()
+    _plots_data_table().reset()
 
 
 @tool("analytics.get_visitor_information_by_id", return_direct=False)
@@ -42,7 +91,8 @@ def get_visitor_information_by_id(visitor_id=None):
     """
     if not visitor_id:
         return "Visitor ID not provided."
-    visitor_data = ANALYTICS_DATA[ANALYTICS_DATA["visitor_id"] == visitor_id].to_dict(orient="records")
+    table = _analytics_data_table()
+    visitor_data = table.frame.iloc[table.rows("visitor_id", visitor_id)].to_dict(orient="records")
     if visitor_data:
         return visitor_data
     else:
@@ -76,7 +126,6 @@ def create_plot(time_min=None, time_max=None, value_to_plot=None, plot_type=None
     "plots/2023-10-01_2023-12-31_total_visits.png"
 
     """
-    global PLOTS_DATA
     if not time_min:
         return "Start date not provided."
     if not time_max:
@@ -96,7 +145,7 @@ def create_plot(time_min=None, time_max=None, value_to_plot=None, plot_type=None
 
     # Plot the data here and save it to a file
     file_path = f"plots/{time_min}_{time_max}_{value_to_plot}_{plot_type}.png"
-    PLOTS_DATA.loc[len(PLOTS_DATA)] = [file_path]
+    _plots_data_table().append_row([file_path])
     return file_path
 
 
@@ -122,13 +171,12 @@ def total_visits_count(time_min=None, time_max=None):
     >>> analytics.total_visits_count("2023-10-01", "2023-10-06")
     {{"2023-10-01": 1, "2023-10-02": 2, "2023-10-03": 3, "2023-10-04": 1, "2023-10-05": 0, "2023-10-06": 4}}
     """
-    if time_min:
-        data = ANALYTICS_DATA[ANALYTICS_DATA["date_of_visit"] >= time_min]
-    else:
-        data = ANALYTICS_DATA
-    if time_max:
-        data = data[data["date_of_visit"] <= time_max]
-    return data.groupby("date_of_visit").size().to_dict()
+    analytics_data = _analytics_data_table().frame
+    metrics = _daily_metrics_for(analytics_data, time_min, time_max)
+    if metrics is not None:
+        return metrics.per_day(metrics.visits, time_min, time_max)
+    dates = analytics_data["date_of_visit"][_visits_between(analytics_data, time_min, time_max)]
+    return dates.groupby(dates).size().to_dict()
 
 
 @tool("analytics.engaged_users_count", return_direct=False)
@@ -153,15 +201,13 @@ def engaged_users_count(time_min=None, time_max=None):
     >>> analytics.engaged_users_count("2023-10-01", "2023-10-06")
     {{"2023-10-01": 1, "2023-10-02": 2, "2023-10-03": 2, "2023-10-04": 1, "2023-10-05": 0, "2023-10-06": 4}}
     """
-    if time_min:
-        data = ANALYTICS_DATA[ANALYTICS_DATA["date_of_visit"] >= time_min]
-    else:
-        data = ANALYTICS_DATA[:]
-    if time_max:
-        data = data[data["date_of_visit"] <= time_max]
-    data["user_engaged"] = data["user_engaged"].astype(bool).astype(int)
-
-    return data.groupby("date_of_visit").sum()["user_engaged"].to_dict()
+    analytics_data = _analytics_data_table().frame
+    metrics = _daily_metrics_for(analytics_data, time_min, time_max)
+    if metrics is not None:
+        return metrics.per_day(metrics.engaged_users, time_min, time_max)
+    keep = _visits_between(analytics_data, time_min, time_max)
+    engaged = analytics_data["user_engaged"][keep].astype(bool).astype(int)
+    return engaged.groupby(analytics_data["date_of_visit"][keep]).sum().to_dict()
 
 
 @tool("analytics.traffic_source_count", return_direct=False)
@@ -188,18 +234,18 @@ def traffic_source_count(time_min=None, time_max=None, traffic_source=None):
     >>> analytics.traffic_source_count("2023-10-01", "2023-10-06", "search engine")
     {{"2023-10-01": 0, "2023-10-02": 1, "2023-10-03": 0, "2023-10-04": 3, "2023-10-05": 2, "2023-10-06": 4}}
     """
-    if time_min:
-        data = ANALYTICS_DATA[ANALYTICS_DATA["date_of_visit"] >= time_min]
-    else:
-        data = ANALYTICS_DATA[:]
-    if time_max:
-        data = data[data["date_of_visit"] <= time_max]
-
+    analytics_data = _analytics_data_table().frame
+    metrics = _daily_metrics_for(analytics_data, time_min, time_max)
+    if metrics is not None and (not traffic_source or isinstance(traffic_source, str)):
+        visits = metrics.source_visits(traffic_source) if traffic_source else metrics.visits
+        return metrics.per_day(visits, time_min, time_max)
+    keep = _visits_between(analytics_data, time_min, time_max)
+    dates = analytics_data["date_of_visit"][keep]
     if traffic_source:
-        data["visits_from_source"] = (data["traffic_source"] == traffic_source).astype(int)
-        return data.groupby("date_of_visit").sum()["visits_from_source"].to_dict()
+        visits_from_source = (analytics_data["traffic_source"][keep] == traffic_source).astype(int)
+        return visits_from_source.groupby(dates).sum().to_dict()
     else:
-        return data.groupby("date_of_visit").size().to_dict()
+        return dates.groupby(dates).size().to_dict()
 
 
 @tool("analytics.get_average_session_duration", return_direct=False)
@@ -224,17 +270,10 @@ def get_average_session_duration(time_min=None, time_max=None):
     >>> analytics.get_average_session_duration("2023-10-01", "2023-10-06")
     {{"2023-10-01": 10.0, "2023-10-02": 20.5, "2023-10-03": 32.8, "2023-10-04": 40.2, "2023-10-05": 5.3, "2023-10-06": 53.0}}
     """
-    if time_min:
-        data = ANALYTICS_DATA[ANALYTICS_DATA["date_of_visit"] >= time_min]
-    else:
-        data = ANALYTICS_DATA
-    if time_max:
-        data = data[data["date_of_visit"] <= time_max]
-
-    data["session_duration_seconds"] = data["session_duration_seconds"].astype(float)
-    return (
-        data[["date_of_visit", "session_duration_seconds"]]
-        .groupby("date_of_visit")
-        .mean()["session_duration_seconds"]
-        .to_dict()
-    )
+    analytics_data = _analytics_data_table().frame
+    metrics = _daily_metrics_for(analytics_data, time_min, time_max)
+    if metrics is not None and metrics.average_session_duration is not None:
+        return metrics.per_day(metrics.average_session_duration, time_min, time_max)
+    keep = _visits_between(analytics_data, time_min, time_max)
+    durations = analytics_data["session_duration_seconds"][keep].astype(float)
+    return durations.groupby(analytics_data["date_of_visit"][keep]).mean().to_dict()
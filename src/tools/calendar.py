@@ -1,17 +1,44 @@
+import numpy as np
 import pandas as pd
 from langchain.tools import tool
 
-# Data is hard-coded so that the agent can call them without passing the dataframe as an argument.
+from src.tools.data_loading import data_path, read_csv_cached
+from src.tools.domain_table import adopt_assigned_frame, id_list
+from src.tools.query_planner import AnyContains, TimestampBetween, find_rows
+from src.tools.workspace import current_workspace, register_table
+
+
+def _load_calendar_events():
+    return read_csv_cached(data_path("processed", "calendar_events.csv"), dtype=str)
+
+
+# Tables are registered per module so that the agent can call the tools without passing the dataframe as an argument.
 # We cannot use a class because LangChain does not support tools inside classes.
-CALENDAR_EVENTS = pd.read_csv("data/processed/calendar_events.csv", dtype=str)
+# Tables are loaded on first use rather than on import
+register_table(
+    "calendar_events",
+    _load_calendar_events,
+    indexed_columns=("event_id",),
+    timestamp_indexes={"start_time": "event_start"},
+)
+
+
+def __getattr__(name):
+    # CALENDAR_EVENTS is served from the current workspace so that it always reflects its state
+    if name == "CALENDAR_EVENTS":
+        return current_workspace().table("calendar_events").frame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _calendar_events_table():
+    return adopt_assigned_frame(current_workspace().table("calendar_events"), globals(), "CALENDAR_EVENTS")
 
 
 def reset_state():
     """
     Resets the calendar events to the original state.
     """
-    global CALENDAR_EVENTS
-    CALENDAR_EVENTS = pd.read_csv("data/processed/calendar_events.csv", dtype=str)
+    _calendar_events_table().reset()
 
 
 @tool("calendar.get_event_information_by_id", return_direct=False)
@@ -48,7 +75,8 @@ def get_event_information_by_id(event_id=None, field=None):
         return "Event ID not provided."
     if not field:
         return "Field not provided."
-    event = CALENDAR_EVENTS[CALENDAR_EVENTS["event_id"] == event_id].to_dict(orient="records")
+    table = _calendar_events_table()
+    event = table.frame.iloc[table.rows("event_id", event_id)].to_dict(orient="records")
     if event:
         if field in event[0]:
             return {field: event[0][field]}
@@ -58,6 +86,44 @@ def get_event_information_by_id(event_id=None, field=None):
         return "Event not found."
 
 
+@tool("calendar.get_event_information_by_ids", return_direct=False)
+def get_event_information_by_ids(event_ids=None, fields=None):
+    """
+    Returns fields of several events by their IDs in one call.
+
+    Parameters
+    ----------
+    event_ids : list, optional
+        IDs of the events.
+    fields : list, optional
+        Fields to return for each event. Available fields are: "event_id", "event_name", "participant_email", "event_start", "duration"
+
+    Returns
+    -------
+    events : dict
+        Information of each event for the given fields, by ID.
+
+    Examples
+    --------
+    >>> calendar.get_event_information_by_ids(["00000000", "00000001"], ["event_name", "duration"])
+    {{"00000000": {{"event_name": "Meeting with Sam", "duration": "60"}}, "00000001": {{"event_name": "Lunch with Sam", "duration": "30"}}}}
+    """
+    if not event_ids:
+        return "Event IDs not provided."
+    if not fields:
+        return "Fields not provided."
+    event_ids = [event_ids] if isinstance(event_ids, str) else list(event_ids)
+    fields = [fields] if isinstance(fields, str) else list(fields)
+    table = _calendar_events_table()
+    if any(field not in table.frame.columns for field in fields):
+        return "Field not found."
+    records = table.records("event_id", event_ids, fields)
+    return {
+        event_id: record if record is not None else "Event not found."
+        for event_id, record in zip(event_ids, records)
+    }
+
+
 @tool("calendar.search_events", return_direct=False)
 def search_events(query="", time_min=None, time_max=None):
     """
@@ -84,9 +150,15 @@ def search_events(query="", time_min=None, time_max=None):
     {{"event_id": "00000001", "event_name": "Lunch with Sam", "participant_email": "sam@example.com", "event_start": "2021-06-01 13:00:00", "duration": "30}}"
     ]
     """
-    events = CALENDAR_EVENTS[
-        (CALENDAR_EVENTS["event_name"].str.contains(query, case=False))
-        | (CALENDAR_EVENTS["participant_email"].str.contains(query, case=False))
+    table = _calendar_events_table()
+    events = _first_events_matching(table, query, time_min, time_max, 5)
+    if events is not None:
+        return events if events else "No events found."
+
+    all_events = table.frame
+    events = all_events[
+        (all_events["event_name"].str.contains(query, case=False))
+        | (all_events["participant_email"].str.contains(query, case=False))
     ].to_dict(orient="records")
     if time_min:
         events = [event for event in events if pd.Timestamp(event["event_start"]) >= pd.Timestamp(time_min)]
@@ -98,6 +170,44 @@ def search_events(query="", time_min=None, time_max=None):
         return "No events found."
 
 
+def _start_bounds(time_min, time_max):
+    # Returns the bounds as nanoseconds, matching pd.Timestamp(time) comparisons, or None if they cannot be compared
+    # that way
+    try:
+        bounds = [pd.Timestamp(time) if time else None for time in (time_min, time_max)]
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if any(bound is not None and (bound is pd.NaT or bound.tzinfo is not None) for bound in bounds):
+        return None
+    minimum, maximum = bounds
+    return (
+        pd.Timestamp.min.value if minimum is None else minimum.value,
+        pd.Timestamp.max.value if maximum is None else maximum.value,
+    )
+
+
+def _first_events_matching(table, query, time_min, time_max, limit):
+    """
+    Returns the first events, in table order and at most limit of them, that match the query and start between the
+    times, or None if they cannot be found without filtering every event.
+
+    Events starting between the times are found with a binary search over their pre-parsed start times, and are
+    matched against the query in table order until limit of them are found. This gives the same events as matching
+    every event and then filtering by time, as long as every start time is a timestamp string and the text columns
+    support the str accessor.
+    """
+    bounds = _start_bounds(time_min, time_max)
+    if bounds is None:
+        return None
+    predicates = [AnyContains(("event_name", "participant_email"), query)]
+    if time_min or time_max:
+        predicates.append(TimestampBetween("start_time", *bounds))
+    rows = find_rows(table, predicates, limit)
+    if rows is None:
+        return None
+    return table.frame.iloc[rows].to_dict(orient="records")
+
+
 @tool("calendar.create_event", return_direct=False)
 def create_event(event_name=None, participant_email=None, event_start=None, duration=None):
     """
@@ -124,9 +234,6 @@ def create_event(event_name=None, participant_email=None, event_start=None, dura
     >>> calendar.create_event("Meeting with Sam", "sam@example.com", "2021-06-01 13:00:00", "60")
     "00000000"
     """
-    # Working with classes is difficult in LangChain, so we use a global variable instead.
-    global CALENDAR_EVENTS
-
     if not event_name:
         return "Event name not provided."
     if not participant_email:
@@ -138,7 +245,8 @@ def create_event(event_name=None, participant_email=None, event_start=None, dura
 
     participant_email = participant_email.lower()
 
-    event_id = str(int(CALENDAR_EVENTS["event_id"].max()) + 1).zfill(8)
+    table = _calendar_events_table()
+    event_id = table.next_id("event_id", 8)
     new_event = pd.DataFrame(
         {
             "event_id": [event_id],
@@ -148,7 +256,7 @@ def create_event(event_name=None, participant_email=None, event_start=None, dura
             "duration": [duration],
         }
     )
-    CALENDAR_EVENTS = pd.concat([CALENDAR_EVENTS, new_event])
+    table.append_rows(new_event)
     return event_id
 
 
@@ -173,18 +281,51 @@ def delete_event(event_id=None):
     "Event deleted successfully."
 
     """
-    global CALENDAR_EVENTS
-
     if not event_id:
         return "Event ID not provided."
 
-    if event_id in CALENDAR_EVENTS["event_id"].values:
-        CALENDAR_EVENTS = CALENDAR_EVENTS[CALENDAR_EVENTS["event_id"] != event_id]
+    table = _calendar_events_table()
+    rows = table.rows("event_id", event_id)
+    if len(rows):
+        table.delete_rows(rows)
         return "Event deleted successfully."
     else:
         return "Event not found."
 
 
+@tool("calendar.delete_events", return_direct=False)
+def delete_events(event_ids=None):
+    """
+    Deletes several events by their IDs in one call, as calling delete_event once for each distinct ID would.
+
+    Parameters
+    ----------
+    event_ids : list, optional
+        IDs of the events to be deleted.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating whether the deletion was successful, by ID.
+
+    Examples
+    --------
+    >>> calendar.delete_events(["00000000", "00000001"])
+    {{"00000000": "Event deleted successfully.", "00000001": "Event not found."}}
+    """
+    if not event_ids:
+        return "Event IDs not provided."
+    table = _calendar_events_table()
+    rows = {event_id: table.rows("event_id", event_id) for event_id in id_list(event_ids)}
+    found = [event_rows for event_rows in rows.values() if len(event_rows)]
+    if found:
+        table.delete_rows(np.unique(np.concatenate(found)))
+    return {
+        event_id: "Event deleted successfully." if len(event_rows) else "Event not found."
+        for event_id, event_rows in rows.items()
+    }
+
+
 @tool("calendar.update_event", return_direct=False)
 def update_event(event_id=None, field=None, new_value=None):
     """
@@ -210,14 +351,53 @@ def update_event(event_id=None, field=None, new_value=None):
     "Event updated successfully."
 
     """
-    global CALENDAR_EVENTS
-
     if not event_id or not field or not new_value:
         return "Event ID, field, or new value not provided."
-    if event_id in CALENDAR_EVENTS["event_id"].values:
+    table = _calendar_events_table()
+    rows = table.rows("event_id", event_id)
+    if len(rows):
         if field == "participant_email":
             new_value = new_value.lower()
-        CALENDAR_EVENTS.loc[CALENDAR_EVENTS["event_id"] == event_id, field] = new_value
+        table.set_values(rows, field, new_value)
         return "Event updated successfully."
     else:
         return "Event not found."
+
+
+@tool("calendar.update_events", return_direct=False)
+def update_events(event_ids=None, field=None, new_value=None):
+    """
+    Updates a field of several events in one call, as calling update_event once for each distinct ID would.
+
+    Parameters
+    ----------
+    event_ids: list, optional
+        8-digit IDs of the events.
+    field: str, optional
+        Field to update.
+    new_value: str, optional
+        New value for the field.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating whether the update was successful, by ID.
+
+    Examples
+    --------
+    >>> calendar.update_events(["00000000", "00000001"], "duration", "30")
+    {{"00000000": "Event updated successfully.", "00000001": "Event updated successfully."}}
+    """
+    if not event_ids or not field or not new_value:
+        return "Event IDs, field, or new value not provided."
+    table = _calendar_events_table()
+    rows = {event_id: table.rows("event_id", event_id) for event_id in id_list(event_ids)}
+    found = [event_rows for event_rows in rows.values() if len(event_rows)]
+    if found:
+        if field == "participant_email":
+            new_value = new_value.lower()
+        table.set_values(np.unique(np.concatenate(found)), field, new_value)
+    return {
+        event_id: "Event updated successfully." if len(event_rows) else "Event not found."
+        for event_id, event_rows in rows.items()
+    }
@@ -1,7 +1,95 @@
-import pandas as pd
+import functools
+import re
+import threading
+
+import numpy as np
 from langchain.tools import tool
 
-EMAILS = pd.read_csv("data/raw/email_addresses.csv", header=None, names=["email_address"])
+from src.tools.data_loading import data_path, read_csv_cached
+from src.tools.query_planner import literal_words
+from src.tools.text_index import FrozenNgramIndex
+
+# Number of recent name lookups each directory remembers
+LOOKUP_CACHE_SIZE = 1024
+
+# Directory of the current EMAILS frame, built on first use
+_DIRECTORY = None
+_DIRECTORY_LOCK = threading.Lock()
+
+
+def __getattr__(name):
+    # EMAILS is loaded on first use rather than on import
+    if name == "EMAILS":
+        return _email_addresses()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _email_addresses():
+    if "EMAILS" not in globals():
+        email_addresses_path = data_path("raw", "email_addresses.csv")
+        globals()["EMAILS"] = read_csv_cached(email_addresses_path, header=None, names=["email_address"])
+    return globals()["EMAILS"]
+
+
+class Directory:
+    """
+    Email addresses of the company directory, with an n-gram index for finding the addresses containing a name.
+
+    A name is matched as Series.str.contains(name) matches it: as a case-sensitive regular expression. For names whose
+    only special character is the "." wildcard, the addresses containing the parts between wildcards are looked up in
+    the index, and only those are matched against the regular expression. Recent lookups are cached, as the directory
+    never changes.
+
+    Parameters
+    ----------
+    email_addresses : pd.DataFrame
+        Directory with an email_address column. It must not be modified in place.
+    """
+
+    def __init__(self, email_addresses):
+        self.email_addresses = email_addresses
+        self._addresses = email_addresses["email_address"].to_numpy()
+        # str.contains fails on other values, so the index is only used if every address is a string
+        self._index = None
+        if all(isinstance(address, str) for address in self._addresses):
+            self._index = FrozenNgramIndex([address.lower() for address in self._addresses])
+        self._rows = functools.lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._find_rows)
+
+    def _find_rows(self, name):
+        # Returns the positions of the addresses containing the name, or None if they cannot be looked up
+        words = literal_words(name)
+        if self._index is None or words is None:
+            return None
+        candidates = self._index.candidates(words)
+        if candidates is None:
+            candidates = np.arange(len(self._addresses))
+        addresses = self._addresses
+        if "." in name:
+            search = re.compile(name).search
+            return tuple(row for row in candidates.tolist() if search(addresses[row]))
+        # Without wildcards, the regular expression matches exactly the addresses containing the name
+        return tuple(row for row in candidates.tolist() if name in addresses[row])
+
+    def find(self, name):
+        """
+        Returns the addresses containing the name, as
+        email_addresses[email_addresses["email_address"].str.contains(name)]["email_address"].values does.
+        """
+        rows = self._rows(name) if isinstance(name, str) else None
+        if rows is None:
+            email_addresses = self.email_addresses
+            return email_addresses[email_addresses["email_address"].str.contains(name)]["email_address"].values
+        return self._addresses[list(rows)]
+
+
+def _directory():
+    # The directory is rebuilt if EMAILS was replaced
+    global _DIRECTORY
+    email_addresses = _email_addresses()
+    with _DIRECTORY_LOCK:
+        if _DIRECTORY is None or _DIRECTORY.email_addresses is not email_addresses:
+            _DIRECTORY = Directory(email_addresses)
+        return _DIRECTORY
 
 
 @tool("company_directory.find_email_address", return_direct=False)
@@ -24,9 +112,38 @@ def find_email_address(name=""):
     >>> directory.find_email_address("John")
     "john.smith@example.com"
     """
-    global EMAILS
     if name == "":
         return "Name not provided."
     name = name.lower()
-    email_address = EMAILS[EMAILS["email_address"].str.contains(name)]
-    return email_address["email_address"].values
+    return _directory().find(name)
+
+
+@tool("company_directory.find_email_addresses", return_direct=False)
+def find_email_addresses(names=None):
+    """
+    Finds the email addresses of several employees by their names in one call.
+
+    Parameters
+    ----------
+    names : list, optional
+        Names of the people.
+
+    Returns
+    -------
+    email_addresses : dict
+        Email addresses of each person, by name.
+
+    Examples
+    --------
+    >>> directory.find_email_addresses(["John", "Jane"])
+    {{"John": ["john.smith@example.com"], "Jane": ["jane.doe@example.com"]}}
+    """
+    if not names:
+        return "Names not provided."
+    if isinstance(names, str):
+        names = [names]
+    email_addresses = {}
+    for name in names:
+        addresses = find_email_address.func(name)
+        email_addresses[name] = addresses.tolist() if isinstance(addresses, np.ndarray) else addresses
+    return email_addresses
@@ -1,15 +1,54 @@
+import numpy as np
 import pandas as pd
 from langchain.tools import tool
 
-CRM_DATA = pd.read_csv("data/processed/customer_relationship_manager_data.csv", dtype=str)
+from src.tools.data_loading import data_path, read_csv_cached
+from src.tools.domain_table import adopt_assigned_frame, id_list
+from src.tools.query_planner import Between, Contains, find_rows
+from src.tools.workspace import current_workspace, register_table
+
+def _load_crm_data():
+    return read_csv_cached(data_path("processed", "customer_relationship_manager_data.csv"), dtype=str)
+
+
+# Tables are loaded on first use rather than on import. Customers are searched through the indexes: categories by their
+# distinct values, dates by their sorted distinct values and names and emails by their n-grams.
+register_table(
+    "crm_data",
+    _load_crm_data,
+    indexed_columns=(
+        "customer_id",
+        "customer_name",
+        "customer_email",
+        "product_interest",
+        "status",
+        "assigned_to_email",
+        "last_contact_date",
+        "follow_up_by",
+    ),
+    text_indexes={"name_text": ("customer_name",), "email_text": ("customer_email",)},
+)
+
+
+def __getattr__(name):
+    # CRM_DATA is served from the current workspace so that it always reflects its state
+    if name == "CRM_DATA":
+        return current_workspace().table("crm_data").frame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _crm_data_table():
+    return adopt_assigned_frame(current_workspace().table("crm_data"), globals(), "CRM_DATA")
 
 
 def reset_state():
     """
     Resets the CRM data to the original state.
     """
-    global CRM_DATA
-    CRM_DATA = pd.read_csv("data/processed/customer_relationship_manager_data.csv", dtype=str)
+    _crm_data_table().reset()
+
+
+_FIELD_NOT_VALID = "Field not valid. Please choose from: 'customer_name', 'assigned_to_email', 'customer_email', 'customer_phone', 'last_contact_date', 'product_interest', 'status', 'notes', 'follow_up_by'"
 
 
 @tool("customer_relationship_manager.search_customers", return_direct=False)
@@ -60,7 +99,7 @@ def search_customers(
     "customer_email": "john.smith@example.com", "customer_phone": "123-456-7890", "last_contact_date": "2023-01-01",
     "product_interest": "Software", "status": "Qualified", "follow_up_by": "2023-01-15", "notes": "Had a call on 2023-01-01. "}}
     """
-    customers = CRM_DATA.copy()
+    table = _crm_data_table()
     if not any(
         [
             customer_name,
@@ -76,6 +115,31 @@ def search_customers(
     ):
         return "No search parameters provided. Please provide at least one parameter."
 
+    text_indexes = {"customer_name": "name_text", "customer_email": "email_text"}
+    predicates = [
+        Contains(column, pattern, text_indexes.get(column))
+        for column, pattern in [
+            ("customer_name", customer_name),
+            ("customer_email", customer_email),
+            ("product_interest", product_interest),
+            ("status", status),
+            ("assigned_to_email", assigned_to_email),
+        ]
+        if pattern
+    ]
+    predicates += [
+        Between(column, minimum or None, maximum or None)
+        for column, minimum, maximum in [
+            ("last_contact_date", last_contact_date_min, last_contact_date_max),
+            ("follow_up_by", follow_up_by_min, follow_up_by_max),
+        ]
+        if minimum or maximum
+    ]
+    rows = find_rows(table, predicates, limit=5)
+    if rows is not None:
+        return table.frame.iloc[rows].to_dict(orient="records")
+
+    customers = table.frame
     if customer_name:
         customers = customers[customers["customer_name"].str.contains(customer_name, case=False)]
     if customer_email:
@@ -121,28 +185,83 @@ def update_customer(customer_id=None, field=None, new_value=None):
     >>> crm.update_customer("00000001", "status", "Won")
     "Customer updated successfully."
     """
-    global CRM_DATA
-
     if not customer_id or not field or not new_value:
         return "Customer ID, field, or new value not provided."
 
+    new_value, error = _checked_customer_update(field, new_value)
+    if error:
+        return error
+
+    table = _crm_data_table()
+    rows = table.rows("customer_id", customer_id)
+    if len(rows):
+        if field in table.frame.columns:
+            table.set_values(rows, field, new_value)
+            return "Customer updated successfully."
+        else:
+            return _FIELD_NOT_VALID
+    else:
+        return "Customer not found."
+
+
+@tool("customer_relationship_manager.update_customers", return_direct=False)
+def update_customers(customer_ids=None, field=None, new_value=None):
+    """
+    Updates a field of several customer records in one call, as calling update_customer once for each distinct ID would.
+
+    Parameters
+    ----------
+    customer_ids : list
+        IDs of the customers.
+    field : str
+        Field to update. Available fields are: "customer_name", "assigned_to_email", "customer_email", "customer_phone", "last_contact_date", "product_interest", "status", "notes", "follow_up_by"
+    new_value : str
+        New value for the field.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating the status of the update, by ID.
+
+    Examples
+    --------
+    >>> crm.update_customers(["00000001", "00000002"], "status", "Won")
+    {{"00000001": "Customer updated successfully.", "00000002": "Customer updated successfully."}}
+    """
+    if not customer_ids or not field or not new_value:
+        return "Customer IDs, field, or new value not provided."
+
+    new_value, error = _checked_customer_update(field, new_value)
+    if error:
+        return error
+
+    table = _crm_data_table()
+    rows = {customer_id: table.rows("customer_id", customer_id) for customer_id in id_list(customer_ids)}
+    if field not in table.frame.columns:
+        return {
+            customer_id: _FIELD_NOT_VALID if len(customer_rows) else "Customer not found."
+            for customer_id, customer_rows in rows.items()
+        }
+    found = [customer_rows for customer_rows in rows.values() if len(customer_rows)]
+    if found:
+        table.set_values(np.unique(np.concatenate(found)), field, new_value)
+    return {
+        customer_id: "Customer updated successfully." if len(customer_rows) else "Customer not found."
+        for customer_id, customer_rows in rows.items()
+    }
+
+
+def _checked_customer_update(field, new_value):
+    # Returns the value a customer field is set to and None, or None and the message explaining why it is not valid
     if field == "status" and new_value not in ["Qualified", "Won", "Lost", "Lead", "Proposal"]:
-        return "Status not valid. Please choose from: 'Qualified', 'Won', 'Lost', 'Lead', 'Proposal'"
+        return None, "Status not valid. Please choose from: 'Qualified', 'Won', 'Lost', 'Lead', 'Proposal'"
 
     if field == "product_interest" and new_value not in ["Software", "Hardware", "Services", "Consulting", "Training"]:
-        return "Product interest not valid. Please choose from: 'Software', 'Hardware', 'Services', 'Consulting', 'Training'"
+        return None, "Product interest not valid. Please choose from: 'Software', 'Hardware', 'Services', 'Consulting', 'Training'"
 
     if field == "customer_email" or field == "assigned_to_email":
         new_value = new_value.lower()
-
-    if customer_id in CRM_DATA["customer_id"].values:
-        if field in CRM_DATA.columns:
-            CRM_DATA.loc[CRM_DATA["customer_id"] == customer_id, field] = new_value
-            return "Customer updated successfully."
-        else:
-            return "Field not valid. Please choose from: 'customer_name', 'assigned_to_email', 'customer_email', 'customer_phone', 'last_contact_date', 'product_interest', 'status', 'notes', 'follow_up_by'"
-    else:
-        return "Customer not found."
+    return new_value, None
 
 
 @tool("customer_relationship_manager.add_customer", return_direct=False)
@@ -191,7 +310,6 @@ def add_customer(
     >>> crm.add_customer("Sam Smith", "sam@example.com", "Lead", "sam.smith@example.com", "123-456-7890", "2023-01-01", "Software")
     "00000201"
     """
-    global CRM_DATA
     if not all([customer_name, assigned_to_email, status]):
         return "Please provide all required fields: customer_name, assigned_to_email, status."
 
@@ -199,7 +317,8 @@ def add_customer(
     if customer_email:
         customer_email = customer_email.lower()
 
-    new_id = str(int(CRM_DATA["customer_id"].max()) + 1).zfill(8)
+    table = _crm_data_table()
+    new_id = table.next_id("customer_id", 8)
     new_customer = pd.DataFrame(
         {
             "customer_id": [new_id],
@@ -214,7 +333,7 @@ def add_customer(
             "follow_up_by": [follow_up_by],
         }
     )
-    CRM_DATA = pd.concat([CRM_DATA, new_customer], ignore_index=True)
+    table.append_rows(new_customer, ignore_index=True)
     return new_id
 
 
@@ -238,10 +357,44 @@ def delete_customer(customer_id=None):
     >>> crm.delete_customer("00000001")
     "Customer deleted successfully."
     """
-    global CRM_DATA
     if not customer_id:
         return "Customer ID not provided."
-    if customer_id not in CRM_DATA["customer_id"].values:
+    table = _crm_data_table()
+    rows = table.rows("customer_id", customer_id)
+    if not len(rows):
         return "Customer not found."
-    CRM_DATA = CRM_DATA[CRM_DATA["customer_id"] != customer_id]
+    table.delete_rows(rows)
     return "Customer deleted successfully."
+
+
+@tool("customer_relationship_manager.delete_customers", return_direct=False)
+def delete_customers(customer_ids=None):
+    """
+    Deletes several customers by their IDs in one call, as calling delete_customer once for each distinct ID would.
+
+    Parameters
+    ----------
+    customer_ids : list
+        IDs of the customers.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating the status of the deletion, by ID.
+
+    Examples
+    --------
+    >>> crm.delete_customers(["00000000", "00000001"])
+    {{"00000000": "Customer deleted successfully.", "00000001": "Customer not found."}}
+    """
+    if not customer_ids:
+        return "Customer IDs not provided."
+    table = _crm_data_table()
+    rows = {customer_id: table.rows("customer_id", customer_id) for customer_id in id_list(customer_ids)}
+    found = [customer_rows for customer_rows in rows.values() if len(customer_rows)]
+    if found:
+        table.delete_rows(np.unique(np.concatenate(found)))
+    return {
+        customer_id: "Customer deleted successfully." if len(customer_rows) else "Customer not found."
+        for customer_id, customer_rows in rows.items()
+    }
@@ -0,0 +1,102 @@
+import bisect
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# Daily metrics of each analytics frame they were computed for, by id of the frame
+_DAILY_METRICS = {}
+_DAILY_METRICS_LOCK = threading.Lock()
+
+
+class DailyMetrics:
+    """
+    Per-day aggregates of the analytics visits, computed once so that the analytics tools answer a date range by
+    slicing them instead of filtering and grouping every visit.
+
+    The aggregates are computed the same way the tools compute them for a date range, and every value only depends on
+    the visits of its day, so slicing them gives the same values as computing them for the date range.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Analytics data with one row per visit. Every date of visit must be a string.
+    """
+
+    def __init__(self, data):
+        dates = data["date_of_visit"]
+        codes, uniques = pd.factorize(dates, sort=True)
+        self.dates = list(uniques)
+        num_dates = len(self.dates)
+        self.visits = np.bincount(codes, minlength=num_dates)
+        self.engaged_users = np.bincount(
+            codes, weights=data["user_engaged"].astype(bool).astype(int), minlength=num_dates
+        ).astype(np.int64)
+
+        source_codes, sources = pd.factorize(data["traffic_source"])
+        counts = np.bincount(
+            codes[source_codes >= 0] * len(sources) + source_codes[source_codes >= 0],
+            minlength=num_dates * len(sources),
+        ).reshape(num_dates, len(sources))
+        self._source_visits = {source: counts[:, i] for i, source in enumerate(sources) if isinstance(source, str)}
+
+        try:
+            durations = data["session_duration_seconds"].astype(float)
+        except (ValueError, TypeError):
+            # The tool raises the same error for date ranges with such a duration, so it is left to compute them
+            self.average_session_duration = None
+        else:
+            self.average_session_duration = durations.groupby(dates).mean().reindex(self.dates).to_numpy()
+
+    def source_visits(self, traffic_source):
+        """
+        Returns the number of visits from the traffic source on each day.
+        """
+        if traffic_source in self._source_visits:
+            return self._source_visits[traffic_source]
+        return np.zeros(len(self.dates), dtype=np.int64)
+
+    def per_day(self, values, time_min=None, time_max=None):
+        """
+        Returns {date: value} for the days with visits between time_min and time_max, inclusive, in date order.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Value of each day, e.g. DailyMetrics.visits.
+        time_min : str, optional
+            First date. Dates are compared as strings, like the tools compare them.
+        time_max : str, optional
+            Last date.
+        """
+        start = bisect.bisect_left(self.dates, time_min) if time_min else 0
+        end = bisect.bisect_right(self.dates, time_max) if time_max else len(self.dates)
+        return dict(zip(self.dates[start:end], values[start:end].tolist()))
+
+
+def _supports_daily_metrics(data):
+    # Dates are compared with the bounds as strings, which the sorted dates only reproduce if they are all strings
+    if not {"date_of_visit", "user_engaged", "traffic_source", "session_duration_seconds"} <= set(data.columns):
+        return False
+    dates = data["date_of_visit"]
+    return dates.dtype == object and pd.api.types.infer_dtype(dates, skipna=False) in ("string", "empty")
+
+
+def daily_metrics(data):
+    """
+    Returns the daily metrics of an analytics frame, computing them on first use, or None if the frame holds values
+    the tools would handle differently.
+
+    Frames must not be modified in place once their metrics are computed, like the pristine tables they are built
+    for.
+    """
+    key = id(data)
+    with _DAILY_METRICS_LOCK:
+        if key in _DAILY_METRICS and _DAILY_METRICS[key][0]() is data:
+            return _DAILY_METRICS[key][1]
+    metrics = DailyMetrics(data) if _supports_daily_metrics(data) else None
+    with _DAILY_METRICS_LOCK:
+        reference = weakref.ref(data, lambda _: _DAILY_METRICS.pop(key, None))
+        _DAILY_METRICS[key] = (reference, metrics)
+    return metrics
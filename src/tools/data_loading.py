@@ -0,0 +1,136 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Environment variable that sets the directory the tables are loaded from
+DATA_DIR_ENV_VAR = "WORKBENCH_DATA_DIR"
+# The repository's data directory, used when no other directory is set
+DEFAULT_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "data"))
+# Sidecar caches are stored in this directory next to the CSV they were built from
+CACHE_DIR_NAME = ".cache"
+_SOURCE_METADATA_KEY = b"workbench_source"
+_data_dir = None
+
+
+def set_data_dir(data_dir):
+    """
+    Sets the directory the tables are loaded from, taking precedence over the WORKBENCH_DATA_DIR environment variable.
+
+    Tables are loaded on first use, so this must be called before any tool is used. Passing None restores the default.
+
+    Parameters
+    ----------
+    data_dir : str or None
+        Directory containing the processed and raw subdirectories.
+    """
+    global _data_dir
+    _data_dir = None if data_dir is None else os.path.abspath(data_dir)
+
+
+def get_data_dir():
+    """
+    Returns the directory the tables are loaded from.
+
+    This is the directory passed to set_data_dir(), otherwise the WORKBENCH_DATA_DIR environment variable, otherwise
+    the repository's data directory, so the tools work independently of the current working directory.
+    """
+    if _data_dir is not None:
+        return _data_dir
+    return os.path.abspath(os.environ.get(DATA_DIR_ENV_VAR, DEFAULT_DATA_DIR))
+
+
+def data_path(*parts):
+    """
+    Returns the path of a file in the data directory.
+
+    Examples
+    --------
+    >>> data_path("processed", "emails.csv")
+    "/path/to/WorkBench/data/processed/emails.csv"
+    """
+    return os.path.join(get_data_dir(), *parts)
+
+
+def _cache_path(csv_path):
+    directory, file_name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, CACHE_DIR_NAME, os.path.splitext(file_name)[0] + ".feather")
+
+
+def _source_signature(csv_path, read_csv_kwargs):
+    # The cache is only valid for the same version of the CSV read with the same arguments
+    stat = os.stat(csv_path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{sorted(read_csv_kwargs.items())!r}".encode()
+
+
+def _read_cache(cache_path, signature):
+    try:
+        table = feather.read_table(cache_path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (table.schema.metadata or {}).get(_SOURCE_METADATA_KEY) != signature:
+        return None
+    frame = table.to_pandas()
+    for column, values in zip(frame.columns, table.columns):
+        if values.null_count and frame[column].dtype == object:
+            # Arrow reads missing strings back as None, but read_csv uses NaN
+            values = frame[column].to_numpy(copy=True)
+            values[pd.isna(values)] = np.nan
+            frame[column] = values
+    return frame
+
+
+def _write_cache(frame, cache_path, signature):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE_METADATA_KEY: signature})
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Write to a temporary file first so that other processes never read a partially written cache
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+    os.close(file_descriptor)
+    try:
+        feather.write_feather(table, temporary_path, compression="uncompressed")
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, cache_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def read_csv_cached(csv_path, **read_csv_kwargs):
+    """
+    Reads a CSV with pd.read_csv, using a Feather sidecar cache to avoid parsing it again.
+
+    The cache is stored in a .cache directory next to the CSV and is rebuilt whenever the CSV's modification time or
+    size changes, or when it was built with different read_csv arguments. If the cache cannot be written, for example
+    on a read-only file system, the CSV is read directly.
+
+    Parameters
+    ----------
+    csv_path : str
+        Path to the CSV file.
+    **read_csv_kwargs
+        Keyword arguments passed to pd.read_csv, e.g. dtype=str.
+
+    Returns
+    -------
+    frame : pd.DataFrame
+        The same frame pd.read_csv(csv_path, **read_csv_kwargs) returns.
+
+    Examples
+    --------
+    >>> read_csv_cached("data/processed/emails.csv", dtype=str)
+    """
+    cache_path = _cache_path(csv_path)
+    signature = _source_signature(csv_path, read_csv_kwargs)
+    frame = _read_cache(cache_path, signature)
+    if frame is not None:
+        return frame
+    frame = pd.read_csv(csv_path, **read_csv_kwargs)
+    try:
+        _write_cache(frame, cache_path, signature)
+    except (OSError, pa.ArrowException):
+        pass
+    return frame
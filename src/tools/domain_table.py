@@ -0,0 +1,807 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from src.tools.state_fingerprint import FingerprintTracker
+from src.tools.text_index import FrozenNgramIndex, NgramIndex, document
+from src.tools.timestamp_index import FrozenTimestampIndex, TimestampIndex
+
+_NO_ROWS = np.array([], dtype=np.intp)
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+class FrozenColumnIndex:
+    """
+    Hash index from the values of a column to the positions of the rows holding them. It is never modified, so one
+    instance can be shared by every table with the same pristine frame.
+
+    Positions are stored grouped by value in a single array, which keeps the memory use close to one integer per row
+    even for millions of rows. Missing values are not indexed, as they never compare equal to anything.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values of the column.
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        # A stable sort keeps the positions of each value in ascending order; missing values (code -1) sort first
+        self._positions = np.argsort(codes, kind="stable")[np.count_nonzero(codes < 0) :]
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        # A pandas Index maps each value to its code with a hash table that is much faster to build than a dict
+        self._values = pd.Index(uniques, dtype=object)
+        self.num_rows = len(values)
+        self.num_missing = int(np.count_nonzero(codes < 0))
+        self._sorted_strings = None
+        self._num_others = None
+
+    def sorted_strings(self):
+        """
+        Returns the distinct string values in ascending order, and the number of rows holding values that are neither
+        strings nor missing.
+        """
+        if self._sorted_strings is None:
+            is_string = np.array([isinstance(value, str) for value in self._values], dtype=bool)
+            self._num_others = int((self._offsets[1:] - self._offsets[:-1])[~is_string].sum())
+            self._sorted_strings = sorted(self._values[is_string])
+        return self._sorted_strings, self._num_others
+
+    def values(self):
+        """
+        Returns the distinct values that are not missing.
+        """
+        return self._values
+
+    def positions(self, value):
+        # Unhashable values raise a TypeError here, so callers can fall back to comparing every row
+        hash(value)
+        try:
+            code = self._values.get_loc(value)
+        except KeyError:
+            return _NO_ROWS
+        return self._positions[self._offsets[code] : self._offsets[code + 1]]
+
+
+class ColumnIndex:
+    """
+    Hash index of a column that is kept up to date as rows are added, modified and removed.
+
+    Changes are stored on top of a frozen index, so the cost of creating, updating and discarding it only depends on
+    the number of values that changed.
+
+    Parameters
+    ----------
+    base : FrozenColumnIndex
+        Index of the column before any change.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.changes = {}
+        # The largest string is found by walking down the base's sorted strings, and a sorted list of the strings
+        # added since, skipping those no row holds anymore
+        self._base_end = None
+        self._added_strings = []
+        self._listed_strings = set()
+        self._num_others = 0
+        self._num_missing = 0
+
+    def keys(self, value):
+        """
+        Returns the keys of the rows where the column equals value, in ascending order.
+        """
+        if value in self.changes:
+            return self.changes[value]
+        return self.base.positions(value)
+
+    def add(self, key, values):
+        (value,) = values
+        if _is_missing(value):
+            self._num_missing += 1
+            return
+        keys = self.keys(value)
+        self.changes[value] = np.insert(keys, np.searchsorted(keys, key), key)
+        if not isinstance(value, str):
+            self._num_others += 1
+        elif value not in self._listed_strings:
+            bisect.insort(self._added_strings, value)
+            self._listed_strings.add(value)
+
+    def discard(self, key, values):
+        (value,) = values
+        if _is_missing(value):
+            self._num_missing -= 1
+            return
+        keys = self.keys(value)
+        self.changes[value] = keys[keys != key]
+        if not isinstance(value, str):
+            self._num_others -= 1
+
+    def maximum(self):
+        """
+        Returns the largest value, as Series.max() does for a column of strings, or None if the column holds other
+        values or no values at all.
+
+        Each call takes amortised constant time, as strings no row holds anymore are skipped only once.
+        """
+        base_strings, base_num_others = self.base.sorted_strings()
+        if base_num_others + self._num_others:
+            return None
+        if self._base_end is None:
+            self._base_end = len(base_strings)
+        while self._base_end and not len(self.keys(base_strings[self._base_end - 1])):
+            self._base_end -= 1
+        while self._added_strings and not len(self.keys(self._added_strings[-1])):
+            self._listed_strings.discard(self._added_strings.pop())
+        maxima = []
+        if self._base_end:
+            maxima.append(base_strings[self._base_end - 1])
+        if self._added_strings:
+            maxima.append(self._added_strings[-1])
+        return max(maxima) if maxima else None
+
+    def num_non_strings(self):
+        """
+        Returns the number of rows holding a missing value or a value that is not a string.
+        """
+        _, base_num_others = self.base.sorted_strings()
+        return self.base.num_missing + self._num_missing + base_num_others + self._num_others
+
+    def num_distinct(self):
+        """
+        Returns an upper bound on the number of distinct values that are not missing.
+        """
+        return len(self.base.values()) + len(self.changes)
+
+    def estimate_between(self, minimum=None, maximum=None):
+        """
+        Returns an estimate of the number of rows holding a string between minimum and maximum, inclusive, assuming the
+        rows are spread evenly over the distinct strings of the base.
+        """
+        strings, _ = self.base.sorted_strings()
+        if not strings:
+            return len(self.changes)
+        start = bisect.bisect_left(strings, minimum) if minimum is not None else 0
+        end = bisect.bisect_right(strings, maximum) if maximum is not None else len(strings)
+        num_rows = self.base.num_rows - self.base.num_missing
+        return (end - start) * num_rows / len(strings) + len(self.changes)
+
+    def keys_where(self, predicate):
+        """
+        Returns the keys of the rows whose value satisfies the predicate, in ascending order.
+
+        The predicate is called once per distinct value, so this is fast for columns with few distinct values, such as
+        categories.
+        """
+        values = [value for value in self.base.values() if value not in self.changes]
+        values += list(self.changes)
+        # Values no row holds anymore are skipped, as they may not be of the type the predicate expects
+        keys = [keys for value, keys in zip(values, map(self.keys, values)) if len(keys) and predicate(value)]
+        return np.sort(np.concatenate(keys)) if keys else _NO_ROWS
+
+    def keys_between(self, minimum=None, maximum=None):
+        """
+        Returns the keys of the rows holding a string between minimum and maximum, inclusive, in ascending order.
+
+        Strings are compared as Python compares them, and found with a binary search over the sorted distinct strings.
+        Either bound may be None to leave the range open on that side.
+        """
+        values = set()
+        for strings in (self.base.sorted_strings()[0], self._added_strings):
+            start = bisect.bisect_left(strings, minimum) if minimum is not None else 0
+            end = bisect.bisect_right(strings, maximum) if maximum is not None else len(strings)
+            values.update(strings[start:end])
+        keys = [self.keys(value) for value in values]
+        return np.sort(np.concatenate(keys)) if keys else _NO_ROWS
+
+
+class DomainTable:
+    """
+    Copy-on-write working copy of a domain table.
+
+    The pristine table is loaded once and never modified. The working copy is only created on the first write, and
+    tools record the rows they modify so that reset() restores just those rows instead of re-reading the CSV.
+
+    Appended rows are buffered and concatenated to the working copy in one go when the table is next read or modified
+    in place, so a series of inserts does not copy the whole table once per row. Likewise, deleted rows are only
+    marked as deleted, and removed from the working copy all at once when the table is next read.
+
+    Tools find rows through indexes instead of scanning the table: hash indexes on the indexed columns, n-gram indexes
+    on the text indexes and sorted indexes on the timestamp indexes. Rows are identified in the indexes by a key that
+    does not change when other rows are added or removed, so every write only updates the entries of the rows it
+    touches.
+
+    Writes also keep a fingerprint of the table up to date, so that states can be compared without comparing whole
+    frames.
+
+    Parameters
+    ----------
+    pristine : pd.DataFrame
+        Original state of the table. It is shared and must not be modified in place.
+    indexed_columns : tuple, optional
+        Columns with hash indexes, e.g. ("email_id",).
+    text_indexes : dict, optional
+        Columns of each n-gram index by name, e.g. {"text": ("subject", "body", "sender/recipient")}.
+    timestamp_indexes : dict, optional
+        Column of each timestamp index by name, e.g. {"sent_time": "sent_datetime"}.
+    shared_indexes : dict, optional
+        Frozen indexes of the pristine table by name, shared by every table created from it. Missing indexes are built
+        on first use and added to the dict.
+    """
+
+    def __init__(self, pristine, indexed_columns=(), text_indexes=None, timestamp_indexes=None, shared_indexes=None):
+        self.pristine = pristine
+        self.indexed_columns = tuple(indexed_columns)
+        self.text_indexes = dict(text_indexes or {})
+        self.timestamp_indexes = dict(timestamp_indexes or {})
+        self._shared_indexes = {} if shared_indexes is None else shared_indexes
+        self._working = None
+        self._touched_labels = set()
+        self._restructured = False
+        self._fingerprint = FingerprintTracker(pristine)
+        self._start_from(pristine, self._shared_indexes)
+
+    def _clear_pending(self):
+        # Frames of rows appended to the working copy but not yet concatenated to it
+        self._pending_rows = []
+        self._num_pending_rows = 0
+        self._pending_ignore_index = False
+
+    def _start_from(self, base, frozen_indexes):
+        # Rows of the base frame are keyed by their position in it, and added rows get the next free key
+        self._base = base
+        self._frozen_indexes = frozen_indexes
+        self._indexes = {}
+        self._row_keys = None  # Key of each row of the working copy, or None while every key equals its position
+        self._pending_keys = []  # Keys of appended rows that are not yet part of _row_keys
+        self._key_positions = None  # Position of each key, or -1 if its row was removed
+        self._next_key = len(base)
+        self._deleted = set()  # Positions of the rows of the working copy that are deleted but not yet removed
+        self._sorted_deleted = None
+        self._clear_pending()
+
+    @property
+    def frame(self):
+        """
+        Current state of the table. Callers must not modify it in place; use the methods below instead.
+        """
+        if self._working is None:
+            return self.pristine
+        self._materialize()
+        return self._working
+
+    def _index_names(self):
+        return self.indexed_columns + tuple(self.text_indexes) + tuple(self.timestamp_indexes)
+
+    def _index_columns(self, name):
+        if name in self.text_indexes:
+            return self.text_indexes[name]
+        if name in self.timestamp_indexes:
+            return (self.timestamp_indexes[name],)
+        return (name,)
+
+    def _index(self, name):
+        if name not in self._indexes:
+            if name not in self._frozen_indexes:
+                if name in self.text_indexes:
+                    columns = [self._base[column].to_numpy() for column in self.text_indexes[name]]
+                    frozen = FrozenNgramIndex([document(values) for values in zip(*columns)])
+                elif name in self.timestamp_indexes:
+                    frozen = FrozenTimestampIndex(self._base[self.timestamp_indexes[name]].to_numpy())
+                else:
+                    frozen = FrozenColumnIndex(self._base[name].to_numpy())
+                self._frozen_indexes[name] = frozen
+            frozen = self._frozen_indexes[name]
+            if name in self.text_indexes:
+                self._indexes[name] = NgramIndex(frozen)
+            elif name in self.timestamp_indexes:
+                self._indexes[name] = TimestampIndex(frozen)
+            else:
+                self._indexes[name] = ColumnIndex(frozen)
+        return self._indexes[name]
+
+    def _writable(self, merge=True):
+        # Every index must be created before the first write, as the indexes only record changes from then on
+        for name in self._index_names():
+            self._index(name)
+        if self._working is None:
+            self._working = self.pristine.copy()
+        if merge:
+            self._materialize()
+        return self._working
+
+    def _materialize(self):
+        # Rows are always deleted before the pending rows are appended, as deleting rows first appends the pending rows
+        if self._deleted:
+            self._merge_row_keys()
+            keep = np.ones(len(self._row_keys), dtype=bool)
+            keep[self._deleted_positions()] = False
+            self._working = self._working.take(np.flatnonzero(keep[: len(self._working)]))
+            self._row_keys = self._row_keys[keep]
+            self._key_positions = None
+            self._deleted = set()
+            self._sorted_deleted = None
+        if self._pending_rows:
+            self._working = pd.concat([self._working, *self._pending_rows], ignore_index=self._pending_ignore_index)
+            self._clear_pending()
+
+    def _deleted_positions(self):
+        if self._sorted_deleted is None:
+            self._sorted_deleted = np.array(sorted(self._deleted), dtype=np.intp)
+        return self._sorted_deleted
+
+    def _physical(self, positions):
+        # Position in the working copy, deleted rows included, of the rows at the given positions of the table
+        positions = np.asarray(positions, dtype=np.intp)
+        if not self._deleted:
+            return positions
+        deleted = self._deleted_positions()
+        return positions + np.searchsorted(deleted - np.arange(len(deleted)), positions, side="right")
+
+    def _logical(self, positions):
+        # Inverse of _physical()
+        if not self._deleted:
+            return positions
+        return positions - np.searchsorted(self._deleted_positions(), positions)
+
+    def _last_row_value(self, column):
+        if self._pending_rows:
+            return self._pending_rows[-1][column].iat[-1]
+        return self._working[column].iat[int(self._physical(len(self._working) - len(self._deleted) - 1))]
+
+    def _append_pending(self, rows, ignore_index):
+        # Concatenating the buffered frames at once gives the same frame as concatenating them one at a time as long as
+        # every column is of object dtype, as the result is then of object dtype whatever the values
+        frame = self._working
+        if self._pending_rows:
+            # The working copy is not modified while rows are pending, so it was already checked
+            if ignore_index != self._pending_ignore_index:
+                return False
+        elif not len(frame.columns) or not all(dtype == object for dtype in frame.dtypes.to_numpy()):
+            return False
+        if not frame.columns.equals(rows.columns) or not all(dtype == object for dtype in rows.dtypes.to_numpy()):
+            return False
+        self._pending_rows.append(rows)
+        self._num_pending_rows += len(rows)
+        self._pending_ignore_index = ignore_index
+        return True
+
+    def _converted_row(self, frame, label, values):
+        # Returns the row frame.loc[label] = values would append, as a frame of object columns, or None if its values
+        # may be converted differently. Like pandas, the values are put in a Series and their types inferred per column.
+        if not isinstance(values, list) or len(values) != len(frame.columns):
+            return None
+        row = pd.Series(values, index=frame.columns, name=label).to_frame().T.infer_objects()
+        inferred = [column for column, dtype in zip(row.columns, row.dtypes.to_numpy()) if dtype != object]
+        if inferred:
+            # Concatenating an inferred column to an object column gives an object column, unless every value of the
+            # object column is missing. The previous row having a value rules that out.
+            if any(pd.isna(self._last_row_value(column)) for column in inferred):
+                return None
+            row = pd.DataFrame(row.to_numpy(dtype=object), index=row.index, columns=row.columns, dtype=object)
+        return row
+
+    def _merge_row_keys(self):
+        if self._pending_keys:
+            self._row_keys = np.concatenate([self._row_keys, *self._pending_keys])
+            self._pending_keys = []
+
+    def _keys(self, positions):
+        if self._row_keys is None:
+            return np.asarray(positions, dtype=np.int64)
+        self._merge_row_keys()
+        return self._row_keys[self._physical(positions)]
+
+    def _positions(self, keys):
+        if self._row_keys is None:
+            return keys
+        self._merge_row_keys()
+        if self._key_positions is None:
+            self._key_positions = np.full(self._next_key, -1, dtype=np.intp)
+            self._key_positions[self._row_keys] = np.arange(len(self._row_keys))
+        return self._logical(self._key_positions[keys])
+
+    def _row_values(self, frame, position, columns):
+        return tuple(frame[column].iat[position] for column in columns)
+
+    def _discard_from_indexes(self, frame, positions, columns=None, keys=None):
+        keys = self._keys(positions) if keys is None else keys
+        for name, index in self._indexes.items():
+            index_columns = self._index_columns(name)
+            if columns is None or set(columns) & set(index_columns):
+                for key, position in zip(keys, positions):
+                    index.discard(key, self._row_values(frame, position, index_columns))
+
+    def _add_to_indexes(self, frame, positions, columns=None, keys=None):
+        keys = self._keys(positions) if keys is None else keys
+        for name, index in self._indexes.items():
+            index_columns = self._index_columns(name)
+            if columns is None or set(columns) & set(index_columns):
+                for key, position in zip(keys, positions):
+                    index.add(key, self._row_values(frame, position, index_columns))
+
+    def _add_row_keys(self, num_rows):
+        keys = np.arange(self._next_key, self._next_key + num_rows, dtype=np.int64)
+        self._next_key += num_rows
+        if self._row_keys is not None:
+            self._pending_keys.append(keys)
+            self._key_positions = None
+        return keys
+
+    def rows(self, column, value):
+        """
+        Returns the positions of the rows where column equals value, in ascending order.
+
+        This is equivalent to np.flatnonzero(frame[column] == value), but takes constant time for indexed columns.
+        """
+        if column in self.indexed_columns:
+            try:
+                return self._positions(self._index(column).keys(value))
+            except TypeError:
+                # Unhashable values cannot be looked up, so they are compared with every row as before
+                pass
+        return np.flatnonzero(self.frame[column] == value)
+
+    def records(self, column, values, fields):
+        """
+        Returns the fields of the first row holding each value of the column, as a dict per value, or None for values no
+        row holds.
+
+        Every value is looked up in the column's index and the rows found are read from the table at once, so this is
+        equivalent to, but much faster than, calling frame.iloc[rows(column, value)].to_dict(orient="records") for each
+        value.
+
+        Parameters
+        ----------
+        column : str
+            Column to look the values up in, e.g. "email_id".
+        values : list
+            Values to look up.
+        fields : list
+            Columns to return.
+        """
+        rows = [self.rows(column, value) for value in values]
+        found = self.frame.iloc[[row[0] for row in rows if len(row)]][list(fields)].to_dict(orient="records")
+        found = iter(found)
+        return [next(found) if len(row) else None for row in rows]
+
+    def next_id(self, column, width=None):
+        """
+        Returns the ID after the largest one in the column, str(int(frame[column].max()) + 1).zfill(width).
+
+        The largest ID is kept up to date by the column's index as rows are added and removed, so allocating an ID does
+        not parse the whole column.
+
+        Parameters
+        ----------
+        column : str
+            Indexed column of string IDs.
+        width : int, optional
+            Number of digits the ID is zero-padded to. By default it is not padded.
+        """
+        maximum = self._index(column).maximum() if column in self.indexed_columns else None
+        if maximum is None:
+            maximum = self.frame[column].max()
+        new_id = str(int(maximum) + 1)
+        return new_id if width is None else new_id.zfill(width)
+
+    def search_text(self, name, words, rows=None):
+        """
+        Returns the positions of the rows whose text contains every word as a substring, in ascending order.
+
+        This is equivalent to checking all(word in text for word in words) for every row, where text is the lowercased
+        values of the index's columns joined by spaces.
+
+        Parameters
+        ----------
+        name : str
+            Name of the text index.
+        words : list
+            Lowercased words to search for.
+        rows : np.ndarray, optional
+            Positions of the rows to search, in ascending order. By default all rows are searched.
+        """
+        if rows is None:
+            return self._positions(self._index(name).search(words))
+        return self._positions(self._index(name).filter(self._keys(rows), words))
+
+    def rows_between(self, name, minimum, maximum):
+        """
+        Returns the positions of the rows whose timestamp is between minimum and maximum, inclusive, in ascending order.
+
+        Timestamps are compared as pd.Timestamp(value).value. If some rows do not hold a timezone-naive timestamp string,
+        None is returned, so that callers can fall back to comparing every row.
+
+        Parameters
+        ----------
+        name : str
+            Name of the timestamp index.
+        minimum : int
+            Lower bound in nanoseconds since the epoch.
+        maximum : int
+            Upper bound in nanoseconds since the epoch.
+        """
+        index = self._index(name)
+        if index.num_unindexed:
+            return None
+        return self._positions(index.keys_between(minimum, maximum))
+
+    def estimate_rows_between(self, name, minimum, maximum):
+        """
+        Returns an upper bound on the number of rows rows_between(name, minimum, maximum) returns, or None if it would
+        return None. This only takes a binary search, so it is cheap enough to plan a search with.
+        """
+        index = self._index(name)
+        if index.num_unindexed:
+            return None
+        return index.estimate_between(minimum, maximum)
+
+    def estimate_text_matches(self, name, words):
+        """
+        Returns an upper bound on the number of rows search_text(name, words) returns, from the length of the shortest
+        posting list of the words' n-grams.
+        """
+        return self._index(name).estimate(words)
+
+    def num_distinct(self, column):
+        """
+        Returns an upper bound on the number of distinct values of the indexed column.
+        """
+        return self._index(column).num_distinct()
+
+    def estimate_rows_in_range(self, column, minimum=None, maximum=None):
+        """
+        Returns an estimate of the number of rows rows_in_range(column, minimum, maximum) returns.
+        """
+        return self._index(column).estimate_between(minimum, maximum)
+
+    def text_is_ascii(self, name):
+        """
+        Returns whether every text of the n-gram index is ASCII. A case-insensitive regular expression of ASCII
+        characters then only matches rows whose lowercased text contains the lowercased literal parts of the expression.
+        """
+        return self._index(name).is_ascii()
+
+    def holds_only_strings(self, column):
+        """
+        Returns whether the indexed column is of object dtype and every value in it is a string.
+        """
+        return self.frame[column].dtype == object and not self._index(column).num_non_strings()
+
+    def rows_where(self, column, predicate):
+        """
+        Returns the positions of the rows whose value in the indexed column satisfies the predicate, in ascending order.
+
+        This is equivalent to np.flatnonzero(frame[column].map(predicate)) for the rows that are not missing, but calls
+        the predicate once per distinct value instead of once per row.
+        """
+        return self._positions(self._index(column).keys_where(predicate))
+
+    def rows_in_range(self, column, minimum=None, maximum=None):
+        """
+        Returns the positions of the rows whose value in the indexed column is a string between minimum and maximum,
+        inclusive, in ascending order.
+
+        This is equivalent to np.flatnonzero((frame[column] >= minimum) & (frame[column] <= maximum)) for a column of
+        strings and missing values. Either bound may be None to leave the range open on that side.
+        """
+        return self._positions(self._index(column).keys_between(minimum, maximum))
+
+    def replace(self, frame):
+        """
+        Replaces the whole table. The indexes are rebuilt from the new frame when they are next used.
+        """
+        self._working = frame.copy() if frame is self.pristine else frame
+        self._restructured = True
+        self._fingerprint.invalidate()
+        self._start_from(self._working, {})
+
+    def set_values(self, rows, field, value):
+        """
+        Sets field to value for the rows at the given positions.
+        """
+        frame = self._writable(merge=False)
+        if field not in frame.columns or self._pending_rows:
+            frame = self._writable()
+        if field not in frame.columns:
+            # Adding a column changes the shape of the table, so it cannot be restored row by row
+            self._restructured = True
+            self._fingerprint.invalidate()
+            mask = np.zeros(len(frame), dtype=bool)
+            mask[rows] = True
+            frame.loc[mask, field] = value
+            return
+        # Deleted rows that are not removed yet are skipped over, so updates do not remove them
+        keys = self._keys(rows)
+        rows = self._physical(rows)
+        self._discard_from_indexes(frame, rows, [field], keys)
+        self._touched_labels.update(frame.index[rows])
+        frame.iloc[rows, frame.columns.get_loc(field)] = value
+        self._add_to_indexes(frame, rows, [field], keys)
+        self._fingerprint.update_rows(frame, rows, keys)
+
+    def append_row(self, values):
+        """
+        Appends a row with frame.loc[len(frame)] = values.
+        """
+        frame = self._writable(merge=False)
+        self._restructured = True
+        num_rows = len(frame) - len(self._deleted) + self._num_pending_rows
+        label = num_rows
+        # If a deleted row that is not removed yet has the label, the row is appended after removing it
+        if num_rows and label not in frame.index:
+            row = self._converted_row(frame, label, values)
+            if row is not None and self._append_pending(row, ignore_index=False):
+                keys = self._add_row_keys(1)
+                self._add_to_indexes(row, [0], keys=keys)
+                self._fingerprint.append_rows(row, keys)
+                return
+        frame = self._writable()
+        overwritten = np.flatnonzero(frame.index == label)
+        if len(overwritten):
+            # The rows with this label are overwritten instead of a row being added
+            self._discard_from_indexes(frame, overwritten)
+            frame.loc[label] = values
+            self._add_to_indexes(frame, overwritten)
+            self._fingerprint.update_rows(frame, overwritten, self._keys(overwritten))
+        else:
+            frame.loc[label] = values
+            keys = self._add_row_keys(1)
+            self._add_to_indexes(frame, [len(frame) - 1])
+            self._fingerprint.append_rows(frame.iloc[-1:], keys)
+
+    def append_rows(self, rows, ignore_index=False):
+        """
+        Appends the rows of a frame with pd.concat([frame, rows], ignore_index=ignore_index).
+        """
+        frame = self._writable(merge=False)
+        self._restructured = True
+        num_rows = len(frame) - len(self._deleted) + self._num_pending_rows
+        labels = None
+        if ignore_index:
+            if self._fingerprint.labels_are_positions:
+                # The rows are labelled with their positions, so only the appended rows' labels are new
+                labels = np.arange(num_rows, num_rows + len(rows))
+            else:
+                self._fingerprint.invalidate()
+        elif not rows.index.equals(pd.RangeIndex(num_rows, num_rows + len(rows))):
+            self._fingerprint.labels_are_positions = False
+        if self._append_pending(rows, ignore_index):
+            keys = self._add_row_keys(len(rows))
+            self._add_to_indexes(rows, np.arange(len(rows)), keys=keys)
+            self._fingerprint.append_rows(rows, keys, labels)
+            return
+        frame = self._writable()
+        self._working = pd.concat([frame, rows], ignore_index=ignore_index)
+        if not self._working.columns.equals(frame.columns):
+            # Concatenating added the missing columns to the other rows
+            self._fingerprint.invalidate()
+        keys = self._add_row_keys(len(rows))
+        self._add_to_indexes(self._working, np.arange(len(frame), len(self._working)))
+        self._fingerprint.append_rows(self._working.iloc[len(frame) :], keys)
+        if ignore_index:
+            self._fingerprint.labels_are_positions = True
+
+    def delete_rows(self, rows):
+        """
+        Removes the rows at the given positions, keeping the order and labels of the remaining rows.
+        """
+        # Pending rows are appended first, so that rows are always deleted before the pending rows are appended
+        frame = self._writable(merge=False)
+        if self._pending_rows:
+            frame = self._writable()
+        if self._row_keys is None:
+            self._row_keys = np.arange(len(frame), dtype=np.int64)
+        keys = self._keys(rows)
+        rows = self._physical(rows)
+        self._discard_from_indexes(frame, rows, keys=keys)
+        self._fingerprint.delete_rows(keys)
+        # The rows stay in the working copy, so the positions of the keys in it do not change
+        self._deleted.update(rows.tolist())
+        self._sorted_deleted = None
+        self._restructured = True
+
+    def reset(self):
+        """
+        Restores the pristine state by reverting only the rows that were touched since the last reset.
+        """
+        if self._working is not None:
+            if self._restructured or not self._working.index.equals(self.pristine.index):
+                # Dropping the working copy is O(1); it is recreated on the next write
+                self._working = None
+            elif self._touched_labels:
+                labels = list(self._touched_labels)
+                self._working.loc[labels] = self.pristine.loc[labels]
+        self._touched_labels = set()
+        self._restructured = False
+        self._fingerprint.reset()
+        self._start_from(self.pristine, self._shared_indexes)
+
+    def fingerprint(self, lowercase=False):
+        """
+        Returns a fingerprint of the current state of the table, which is equal for two tables when DataFrame.equals is
+        true for their frames, or None if the table holds values that frame_fingerprint cannot hash.
+
+        Only the rows written since the last reset are hashed, so this is much cheaper than copying the frame.
+
+        Parameters
+        ----------
+        lowercase : bool, optional
+            Whether to fingerprint the frame converted to lowercase, except in the fields where the case matters, as
+            is_correct() compares states.
+        """
+        if not self._holds_objects():
+            return None
+        return self._fingerprint.fingerprint(lambda: self.frame, lowercase)
+
+    def change_set(self, lowercase=False):
+        """
+        Returns the ChangeSet of the rows inserted, updated and deleted since the last reset, which is equal for two
+        tables when DataFrame.equals is true for their frames and empty when the frame equals the pristine one, or None
+        if the table must be compared as a whole.
+
+        Only the rows written since the last reset are looked at, so this takes time proportional to the number of
+        writes rather than to the size of the table.
+
+        Parameters
+        ----------
+        lowercase : bool, optional
+            Whether to compare the rows converted to lowercase, except in the fields where the case matters, as
+            is_correct() compares states.
+        """
+        if not self._holds_objects():
+            return None
+        return self._fingerprint.change_set(lowercase)
+
+    def _holds_objects(self):
+        return self._working is None or all(dtype == object for dtype in self._working.dtypes.to_numpy())
+
+
+def adopt_assigned_frame(table, module_globals, attribute):
+    """
+    Makes a table pick up a frame that was assigned directly to a module attribute, e.g. email.EMAILS = df.
+
+    The module attributes are served by the module's __getattr__, so an assignment shadows them. The assigned frame
+    replaces the working copy and the attribute is removed again so that later reads see the table's current state.
+
+    Parameters
+    ----------
+    table : DomainTable
+        Table backing the attribute.
+    module_globals : dict
+        globals() of the domain module.
+    attribute : str
+        Name of the module attribute, e.g. "EMAILS".
+
+    Returns
+    -------
+    table : DomainTable
+        The same table, for chaining.
+    """
+    frame = module_globals.pop(attribute, None)
+    if frame is not None:
+        table.replace(frame)
+    return table
+
+
+def id_list(ids):
+    """
+    Returns the distinct IDs of a list, or of a single ID, in the order they are first given.
+
+    Parameters
+    ----------
+    ids : str or list of str
+        ID or IDs, as passed to the bulk tools.
+
+    Returns
+    -------
+    ids : list of str
+        Distinct IDs.
+    """
+    return list(dict.fromkeys([ids] if isinstance(ids, str) else ids))
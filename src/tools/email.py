@@ -1,19 +1,114 @@
+import datetime
+import heapq
+
+import numpy as np
 import pandas as pd
 from langchain.tools import tool
 
 from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME
+from src.tools.data_loading import data_path, read_csv_cached
+from src.tools.domain_table import adopt_assigned_frame, id_list
+from src.tools.query_planner import TextContains, TimestampBetween, find_rows
+from src.tools.workspace import current_workspace, register_table
+
+
+def _load_emails():
+    return read_csv_cached(data_path("processed", "emails.csv"), dtype=str)
 
-# Data is hard-coded so that the agent can call them without passing the dataframe as an argument.
+
+# Tables are registered per module so that the agent can call the tools without passing the dataframe as an argument.
 # We cannot use a class because LangChain does not support tools inside classes.
-EMAILS = pd.read_csv("data/processed/emails.csv", dtype=str)
+# Tables are loaded on first use rather than on import
+register_table(
+    "emails",
+    _load_emails,
+    indexed_columns=("email_id",),
+    text_indexes={"search_text": ("subject", "body", "sender/recipient")},
+    timestamp_indexes={"sent_time": "sent_datetime"},
+)
+
+
+def __getattr__(name):
+    # EMAILS is served from the current workspace so that it always reflects its state
+    if name == "EMAILS":
+        return current_workspace().table("emails").frame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _emails_table():
+    return adopt_assigned_frame(current_workspace().table("emails"), globals(), "EMAILS")
 
 
 def reset_state():
     """
     Resets the emails to the original state.
     """
-    global EMAILS
-    EMAILS = pd.read_csv("data/processed/emails.csv", dtype=str)
+    _emails_table().reset()
+
+
+def _newest_first(emails, k=None):
+    """
+    Sorts emails by sent_datetime, newest first, as emails.sort_values("sent_datetime", ascending=False) does.
+
+    If k is given and the sent times are distinct strings, their order is unambiguous, so only the k newest emails
+    are selected instead of sorting all of them. Otherwise the emails are sorted with sort_values, so that ties and
+    mixed types are handled exactly as before.
+    """
+    if k is not None and len(emails) > k:
+        newest = _distinct_newest(emails, k)
+        if newest is not None:
+            return emails.iloc[newest]
+    return emails.sort_values("sent_datetime", ascending=False)
+
+
+def _distinct_newest(emails, k):
+    # Returns the positions of the k newest emails if they and the next newest have distinct sent times, which makes
+    # them and their order the same for any sort, and None otherwise
+    sent_datetimes = emails["sent_datetime"].to_numpy()
+    if len(emails) and pd.api.types.infer_dtype(sent_datetimes, skipna=False) != "string":
+        return None
+    newest = heapq.nlargest(k + 1, range(len(emails)), key=sent_datetimes.__getitem__)
+    if len(set(sent_datetimes[newest])) < len(newest):
+        return None
+    return newest[:k]
+
+
+def _day_bounds(date_min, date_max):
+    # Returns the first and last nanosecond of the dates, matching pd.Timestamp(date).date() comparisons, or None if
+    # they cannot be computed that way
+    try:
+        minimum = pd.Timestamp(date_min).date() if date_min else datetime.date.min
+        maximum = pd.Timestamp(date_max).date() if date_max else datetime.date.max
+        if not isinstance(minimum, datetime.date) or not isinstance(maximum, datetime.date):
+            return None
+        first = pd.Timestamp.min.value if not date_min else pd.Timestamp(minimum).value
+        last = pd.Timestamp.max.value if not date_max else pd.Timestamp(maximum + datetime.timedelta(days=1)).value - 1
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return first, last
+
+
+def _search_sent_between(table, query_words, date_min, date_max, k):
+    """
+    Returns the k newest emails matching the query that were sent between the dates, or None if that cannot be done
+    without sorting every email matching the query.
+
+    Emails in the date range are found with a binary search over their pre-parsed sent times, and only those are
+    checked against the query. The result is the same as sorting every match and then filtering it by date, as long as
+    every sent time is a timestamp string, so that filtering cannot fail, and the k + 1 newest emails in the range have
+    distinct sent times, so that ties cannot be broken differently.
+    """
+    bounds = _day_bounds(date_min, date_max)
+    if bounds is None:
+        return None
+    rows = find_rows(table, [TimestampBetween("sent_time", *bounds), TextContains("search_text", query_words)])
+    if rows is None:
+        return None
+    matches = table.frame.iloc[rows]
+    newest = _distinct_newest(matches, k)
+    if newest is None:
+        return None
+    return matches.iloc[newest].to_dict(orient="records")
 
 
 @tool("email.get_email_information_by_id", return_direct=False)
@@ -45,7 +140,8 @@ def get_email_information_by_id(email_id=None, field=None):
         return "Email ID not provided."
     if not field:
         return "Field not provided."
-    email = EMAILS[EMAILS["email_id"] == email_id].to_dict(orient="records")
+    table = _emails_table()
+    email = table.frame.iloc[table.rows("email_id", email_id)].to_dict(orient="records")
     if email:
         if field in email[0]:
             return {field: email[0][field]}
@@ -55,6 +151,44 @@ def get_email_information_by_id(email_id=None, field=None):
         return "Email not found."
 
 
+@tool("email.get_email_information_by_ids", return_direct=False)
+def get_email_information_by_ids(email_ids=None, fields=None):
+    """
+    Returns fields of several emails by their IDs in one call.
+
+    Parameters
+    ----------
+    email_ids : list, optional
+        IDs of the emails.
+    fields : list, optional
+        Fields to return for each email. Available fields are: "email_id", "inbox/outbox", "sender/recipient", "subject", "sent_datetime", "body"
+
+    Returns
+    -------
+    emails : dict
+        Information of each email for the given fields, by ID.
+
+    Examples
+    --------
+    >>> email.get_email_information_by_ids(["12345678", "12345679"], ["subject"])
+    {{"12345678": {{"subject": "Project Update"}}, "12345679": {{"subject": "Meeting Reminder"}}}}
+    """
+    if not email_ids:
+        return "Email IDs not provided."
+    if not fields:
+        return "Fields not provided."
+    email_ids = [email_ids] if isinstance(email_ids, str) else list(email_ids)
+    fields = [fields] if isinstance(fields, str) else list(fields)
+    table = _emails_table()
+    if any(field not in table.frame.columns for field in fields):
+        return "Field not found."
+    records = table.records("email_id", email_ids, fields)
+    return {
+        email_id: record if record is not None else "Email not found."
+        for email_id, record in zip(email_ids, records)
+    }
+
+
 @tool("email.search_emails", return_direct=False)
 def search_emails(query="", date_min=None, date_max=None):
     """
@@ -81,16 +215,18 @@ def search_emails(query="", date_min=None, date_max=None):
     [{{"email_id": "12345678", "inbox/outbox": "inbox", "subject": "Project Update", "sender/recipient": "jane@example.com", "sent_datetime": "2024-01-10 09:30:00", "body": "Please find the project update attached."}}]
     """
 
+    table = _emails_table()
     query_words = query.lower().split()
 
-    # Filter function to check if all query words are in any of the specified fields
-    def filter_emails(row):
-        combined_fields = f"{row['subject']} {row['body']} {row['sender/recipient']}".lower()
-        return all(word in combined_fields for word in query_words)
+    if date_min or date_max:
+        emails = _search_sent_between(table, query_words, date_min, date_max, 5)
+        if emails is not None:
+            return emails if len(emails) else "No emails found."
 
-    # Apply filter function across all rows
-    filtered_emails = EMAILS.apply(filter_emails, axis=1)
-    emails = EMAILS[filtered_emails].sort_values("sent_datetime", ascending=False).to_dict(orient="records")
+    # The index matches an email if all query words are substrings of its subject, body and sender combined
+    matches = table.frame.iloc[find_rows(table, [TextContains("search_text", query_words)])]
+    newest = _newest_first(matches, 5 if not date_min and not date_max else None)
+    emails = newest.to_dict(orient="records")
     if date_min:
         emails = [
             email for email in emails if pd.Timestamp(email["sent_datetime"]).date() >= pd.Timestamp(date_min).date()
@@ -130,23 +266,25 @@ def send_email(recipient=None, subject=None, body=None):
     >>> email.send_email("jane@example.com", "Meeting Reminder", "Don't forget our meeting at 10am tomorrow.")
     "Email sent successfully."
     """
-    global EMAILS
     if not recipient or not subject or not body:
         return "Recipient, subject, or body not provided."
     if "@" not in recipient or "." not in recipient:
         return "Invalid recipient email address."
     recipient = recipient.lower()
 
-    email_id = str(int(EMAILS["email_id"].max()) + 1)
+    table = _emails_table()
+    email_id = table.next_id("email_id")
     sent_datetime = HARDCODED_CURRENT_TIME
-    EMAILS.loc[len(EMAILS)] = [
-        email_id,
-        "outbox",
-        recipient,
-        subject,
-        sent_datetime,
-        body,
-    ]
+    table.append_row(
+        [
+            email_id,
+            "outbox",
+            recipient,
+            subject,
+            sent_datetime,
+            body,
+        ]
+    )
 
     return "Email sent successfully."
 
@@ -171,18 +309,51 @@ def delete_email(email_id=None):
     >>> email.delete_email("12345678")
     "Email deleted successfully."
     """
-    global EMAILS
-
     if not email_id:
         return "Email ID not provided."
 
-    if email_id in EMAILS["email_id"].values:
-        EMAILS = EMAILS[EMAILS["email_id"] != email_id]
+    table = _emails_table()
+    rows = table.rows("email_id", email_id)
+    if len(rows):
+        table.delete_rows(rows)
         return "Email deleted successfully."
     else:
         return "Email not found."
 
 
+@tool("email.delete_emails", return_direct=False)
+def delete_emails(email_ids=None):
+    """
+    Deletes several emails by their IDs in one call, as calling delete_email once for each distinct ID would.
+
+    Parameters
+    ----------
+    email_ids : list, optional
+        IDs of the emails to be deleted.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating whether the deletion was successful, by ID.
+
+    Examples
+    --------
+    >>> email.delete_emails(["00000000", "00000001"])
+    {{"00000000": "Email deleted successfully.", "00000001": "Email not found."}}
+    """
+    if not email_ids:
+        return "Email IDs not provided."
+    table = _emails_table()
+    rows = {email_id: table.rows("email_id", email_id) for email_id in id_list(email_ids)}
+    found = [email_rows for email_rows in rows.values() if len(email_rows)]
+    if found:
+        table.delete_rows(np.unique(np.concatenate(found)))
+    return {
+        email_id: "Email deleted successfully." if len(email_rows) else "Email not found."
+        for email_id, email_rows in rows.items()
+    }
+
+
 @tool("email.forward_email", return_direct=False)
 def forward_email(email_id=None, recipient=None):
     """
@@ -205,15 +376,16 @@ def forward_email(email_id=None, recipient=None):
     >>> email.forward_email("12345678", "jane@example.com")
     "Email forwarded successfully."
     """
-    global EMAILS
     if not email_id or not recipient:
         return "Email ID or recipient not provided."
-    if email_id not in EMAILS["email_id"].values:
+    table = _emails_table()
+    rows = table.rows("email_id", email_id)
+    if not len(rows):
         return "Email not found."
     if "@" not in recipient or "." not in recipient:
         return "Invalid recipient email address."
     recipient = recipient.lower()
-    email = EMAILS[EMAILS["email_id"] == email_id].to_dict(orient="records")[0]
+    email = table.frame.iloc[rows[:1]].to_dict(orient="records")[0]
     result = send_email.func(recipient, f"FW: {email['subject']}", email["body"])
     return "Email forwarded successfully." if result == "Email sent successfully." else result
 
@@ -240,11 +412,12 @@ def reply_email(email_id=None, body=None):
     >>> email.reply_email("12345678", "Thank you for the update.")
     "Email replied successfully."
     """
-    global EMAILS
     if not email_id or not body:
         return "Email ID or body not provided."
-    if email_id not in EMAILS["email_id"].values:
+    table = _emails_table()
+    rows = table.rows("email_id", email_id)
+    if not len(rows):
         return "Email not found."
-    email = EMAILS[EMAILS["email_id"] == email_id].to_dict(orient="records")[0]
+    email = table.frame.iloc[rows[:1]].to_dict(orient="records")[0]
     result = send_email.func(email["sender/recipient"], f"{email['subject']}", body)
     return "Email replied successfully." if result == "Email sent successfully." else result
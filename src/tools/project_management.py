@@ -1,17 +1,45 @@
+import numpy as np
 import pandas as pd
 from langchain.tools import tool
 
-# Data is hard-coded so that the agent can call them without passing the dataframe as an argument.
+from src.tools.data_loading import data_path, read_csv_cached
+from src.tools.domain_table import adopt_assigned_frame, id_list
+from src.tools.query_planner import Contains, find_rows
+from src.tools.workspace import current_workspace, register_table
+
+
+def _load_project_tasks():
+    return read_csv_cached(data_path("processed", "project_tasks.csv"), dtype=str)
+
+
+# Tables are registered per module so that the agent can call the tools without passing the dataframe as an argument.
 # We cannot use a class because LangChain does not support tools inside classes.
-PROJECT_TASKS = pd.read_csv("data/processed/project_tasks.csv", dtype=str)
+# Tables are loaded on first use rather than on import. Tasks are searched through the indexes: every searchable column
+# by its distinct values and task names also by their n-grams.
+register_table(
+    "project_tasks",
+    _load_project_tasks,
+    indexed_columns=("task_id", "task_name", "assigned_to_email", "list_name", "due_date", "board"),
+    text_indexes={"name_text": ("task_name",)},
+)
+
+
+def __getattr__(name):
+    # PROJECT_TASKS is served from the current workspace so that it always reflects its state
+    if name == "PROJECT_TASKS":
+        return current_workspace().table("project_tasks").frame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _project_tasks_table():
+    return adopt_assigned_frame(current_workspace().table("project_tasks"), globals(), "PROJECT_TASKS")
 
 
 def reset_state():
     """
     Resets the project tasks to the original state.
     """
-    global PROJECT_TASKS
-    PROJECT_TASKS = pd.read_csv("data/processed/project_tasks.csv", dtype=str)
+    _project_tasks_table().reset()
 
 
 @tool("project_management.get_task_information_by_id", return_direct=False)
@@ -40,7 +68,8 @@ def get_task_information_by_id(task_id=None, field=None):
         return "Task ID not provided."
     if not field:
         return "Field not provided."
-    task = PROJECT_TASKS[PROJECT_TASKS["task_id"] == task_id].to_dict(orient="records")
+    table = _project_tasks_table()
+    task = table.frame.iloc[table.rows("task_id", task_id)].to_dict(orient="records")
     if task:
         if field in task[0]:
             return {field: task[0][field]}
@@ -50,11 +79,61 @@ def get_task_information_by_id(task_id=None, field=None):
         return "Task not found."
 
 
+@tool("project_management.get_task_information_by_ids", return_direct=False)
+def get_task_information_by_ids(task_ids=None, fields=None):
+    """
+    Returns fields of several tasks by their IDs in one call.
+
+    Parameters
+    ----------
+    task_ids : list, optional
+        IDs of the tasks.
+    fields : list, optional
+        Fields to return for each task. Available fields are: "task_id", "task_name", "assigned_to_email", "list_name", "due_date", "board"
+
+    Returns
+    -------
+    tasks : dict
+        Information of each task for the given fields, by ID.
+
+    Examples
+    --------
+    >>> project_management.get_task_information_by_ids(["00000000", "00000001"], ["task_name"])
+    {{"00000000": {{"task_name": "Refactor code"}}, "00000001": {{"task_name": "Fix bug"}}}}
+    """
+    if not task_ids:
+        return "Task IDs not provided."
+    if not fields:
+        return "Fields not provided."
+    task_ids = [task_ids] if isinstance(task_ids, str) else list(task_ids)
+    fields = [fields] if isinstance(fields, str) else list(fields)
+    table = _project_tasks_table()
+    if any(field not in table.frame.columns for field in fields):
+        return "Field not found."
+    records = table.records("task_id", task_ids, fields)
+    return {
+        task_id: record if record is not None else "Task not found."
+        for task_id, record in zip(task_ids, records)
+    }
+
+
 @tool("project_management.search_tasks", return_direct=False)
-def search_tasks(task_name=None, assigned_to_email=None, list_name=None, due_date=None, board=None):
+def search_tasks(
+    task_name=None,
+    assigned_to_email=None,
+    list_name=None,
+    due_date=None,
+    board=None,
+    limit=None,
+    cursor=None,
+    fields=None,
+):
     """
     Searches for tasks based on the given parameters.
 
+    By default every matching task is returned. If limit or cursor is given, at most limit tasks are returned per page,
+    in task ID order, along with the cursor of the next page.
+
     Parameters
     ----------
     task_name : str, optional
@@ -67,20 +146,85 @@ def search_tasks(task_name=None, assigned_to_email=None, list_name=None, due_dat
         Due date of the task in "YYYY-MM-DD" format.
     board : str, optional
         Name of the board the task belongs to.
+    limit : int, optional
+        Maximum number of tasks to return, as an integer or a string of one.
+    cursor : str, optional
+        Cursor returned with the previous page. Tasks are returned from the one after it.
+    fields : list, optional
+        Fields to return for each task, e.g. ["task_id", "task_name"]. By default every field is returned.
 
     Returns
     -------
     tasks : dict
-        Task information for the given parameters.
+        Task information for the given parameters. If limit or cursor is given, {{"tasks": [...], "next_cursor": ...}},
+        where next_cursor is None on the last page.
 
     Examples
     --------
     >>> project_management.search_tasks("Refactor code", "tishtrya@example.com" "In progress", "2023-06-01", "Front end")
     {{"task_id": "00000000", "task_name": "Refactor code", "assigned_to_email": "tishtrya@example.com", "list_name": "In Progress", "due_date": "2023-06-01", "board": "Front End"}}
+
+    >>> project_management.search_tasks(board="Front end", limit=2, fields=["task_id", "task_name"])
+    {{"tasks": [{{"task_id": "00000000", "task_name": "Refactor code"}}, {{"task_id": "00000003", "task_name": "Fix bug"}}], "next_cursor": "00000003"}}
     """
     if not any([task_name, assigned_to_email, list_name, due_date, board]):
         return "No search parameters provided."
-    tasks = PROJECT_TASKS.copy()
+    paginated = limit is not None or cursor is not None
+    if isinstance(limit, str):
+        # Agents pass every argument as a string
+        try:
+            limit = int(limit)
+        except ValueError:
+            return "Limit must be a positive integer."
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        return "Limit must be a positive integer."
+    if cursor is not None and not isinstance(cursor, str):
+        return "Cursor not valid."
+    if isinstance(fields, str):
+        fields = [fields]
+    table = _project_tasks_table()
+    if fields is not None and (not fields or any(field not in table.frame.columns for field in fields)):
+        return "Field not valid."
+
+    tasks = _matching_tasks(table, task_name, assigned_to_email, list_name, due_date, board)
+    if paginated:
+        return _page_of_tasks(tasks, limit, cursor, fields)
+    return (tasks if fields is None else tasks[fields]).to_dict(orient="records")
+
+
+def _page_of_tasks(tasks, limit, cursor, fields):
+    """
+    Returns the tasks after the cursor in task ID order, at most limit of them, and the cursor of the next page.
+
+    Task IDs are unique and never reused, so a page starts after the last task of the previous one even if tasks were
+    created, updated or deleted in between.
+    """
+    if cursor is not None:
+        tasks = tasks[tasks["task_id"] > cursor]
+    tasks = tasks.sort_values("task_id", kind="stable")
+    page = tasks if limit is None else tasks.iloc[:limit]
+    next_cursor = page["task_id"].iat[-1] if len(page) < len(tasks) else None
+    return {"tasks": page[fields or list(page.columns)].to_dict(orient="records"), "next_cursor": next_cursor}
+
+
+def _matching_tasks(table, task_name, assigned_to_email, list_name, due_date, board):
+    # Returns every task matching the parameters, in table order
+    predicates = [
+        Contains(column, pattern, "name_text" if column == "task_name" else None)
+        for column, pattern in [
+            ("task_name", task_name),
+            ("assigned_to_email", assigned_to_email),
+            ("list_name", list_name),
+            ("due_date", due_date),
+            ("board", board),
+        ]
+        if pattern
+    ]
+    rows = find_rows(table, predicates)
+    if rows is not None:
+        return table.frame.iloc[rows]
+
+    tasks = table.frame
     if task_name:
         tasks = tasks[tasks["task_name"].str.contains(task_name, case=False)]
     if assigned_to_email:
@@ -91,7 +235,7 @@ def search_tasks(task_name=None, assigned_to_email=None, list_name=None, due_dat
         tasks = tasks[tasks["due_date"].str.contains(due_date, case=False)]
     if board:
         tasks = tasks[tasks["board"].str.contains(board, case=False)]
-    return tasks.to_dict(orient="records")
+    return tasks
 
 
 @tool("project_management.create_task", return_direct=False)
@@ -122,20 +266,19 @@ def create_task(task_name=None, assigned_to_email=None, list_name=None, due_date
     >>> project_management.create_task("Integrate API service with frontend", "sam@example.com", "In progress", "2023-06-01", "Front end")
     "00000001"
     """
-    global PROJECT_TASKS
-
     if not all([task_name, assigned_to_email, list_name, due_date, board]):
         return "Missing task details."
 
+    table = _project_tasks_table()
     assigned_to_email = assigned_to_email.lower()
-    if assigned_to_email not in PROJECT_TASKS["assigned_to_email"].str.lower().values:
+    if assigned_to_email not in table.frame["assigned_to_email"].str.lower().values:
         return "Assignee email not valid. Please choose from the list of team members."
     if list_name not in ["Backlog", "In Progress", "In Review", "Completed"]:
         return "List not valid. Please choose from: 'Backlog', 'In Progress', 'In Review', 'Completed'."
     if board not in ["Back end", "Front end", "Design"]:
         return "Board not valid. Please choose from: 'Back end', 'Front end', 'Design'."
 
-    task_id = str(int(PROJECT_TASKS["task_id"].max()) + 1).zfill(8)
+    task_id = table.next_id("task_id", 8)
     new_task = pd.DataFrame(
         {
             "task_id": [task_id],
@@ -146,7 +289,7 @@ def create_task(task_name=None, assigned_to_email=None, list_name=None, due_date
             "board": [board],
         }
     )
-    PROJECT_TASKS = pd.concat([PROJECT_TASKS, new_task], ignore_index=True)
+    table.append_rows(new_task, ignore_index=True)
     return task_id
 
 
@@ -170,18 +313,51 @@ def delete_task(task_id=None):
     >>> project_management.delete_task("00000000")
     "Task deleted successfully."
     """
-    global PROJECT_TASKS
-
     if not task_id:
         return "Task ID not provided."
 
-    if task_id in PROJECT_TASKS["task_id"].values:
-        PROJECT_TASKS = PROJECT_TASKS[PROJECT_TASKS["task_id"] != task_id]
+    table = _project_tasks_table()
+    rows = table.rows("task_id", task_id)
+    if len(rows):
+        table.delete_rows(rows)
         return "Task deleted successfully."
     else:
         return "Task not found."
 
 
+@tool("project_management.delete_tasks", return_direct=False)
+def delete_tasks(task_ids=None):
+    """
+    Deletes several tasks by their IDs in one call, as calling delete_task once for each distinct ID would.
+
+    Parameters
+    ----------
+    task_ids : list
+        IDs of the tasks.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating the status of the deletion, by ID.
+
+    Examples
+    --------
+    >>> project_management.delete_tasks(["00000000", "00000001"])
+    {{"00000000": "Task deleted successfully.", "00000001": "Task not found."}}
+    """
+    if not task_ids:
+        return "Task IDs not provided."
+    table = _project_tasks_table()
+    rows = {task_id: table.rows("task_id", task_id) for task_id in id_list(task_ids)}
+    found = [task_rows for task_rows in rows.values() if len(task_rows)]
+    if found:
+        table.delete_rows(np.unique(np.concatenate(found)))
+    return {
+        task_id: "Task deleted successfully." if len(task_rows) else "Task not found."
+        for task_id, task_rows in rows.items()
+    }
+
+
 @tool("project_management.update_task", return_direct=False)
 def update_task(task_id=None, field=None, new_value=None):
     """
@@ -206,26 +382,84 @@ def update_task(task_id=None, field=None, new_value=None):
     >>> project_management.update_task("00000000", "task_name", "New Task Name")
     "Task updated successfully."
     """
-    global PROJECT_TASKS
-
     if not task_id or not field or not new_value:
         return "Task ID, field, or new value not provided."
 
-    if field == "assigned_to_email":
-        new_value = new_value.lower()
+    table = _project_tasks_table()
+    tasks = table.frame
 
-    if field == "board" and new_value not in ["Back end", "Front end", "Design"]:
-        return "Board not valid. Please choose from: 'Back end', 'Front end', 'Design'."
-    if field == "list_name" and new_value not in ["Backlog", "In Progress", "In Review", "Completed"]:
-        return "List not valid. Please choose from: 'Backlog', 'In Progress', 'In Review', 'Completed'."
-    if field == "assigned_to_email" and new_value not in PROJECT_TASKS["assigned_to_email"].str.lower().values:
-        return "Assignee email not valid. Please choose from the list of team members."
+    new_value, error = _checked_task_update(tasks, field, new_value)
+    if error:
+        return error
 
-    if task_id in PROJECT_TASKS["task_id"].values:
-        if field in PROJECT_TASKS.columns:
-            PROJECT_TASKS.loc[PROJECT_TASKS["task_id"] == task_id, field] = new_value
+    rows = table.rows("task_id", task_id)
+    if len(rows):
+        if field in tasks.columns:
+            table.set_values(rows, field, new_value)
             return "Task updated successfully."
         else:
             return "Field not valid."
     else:
         return "Task not found."
+
+
+def _checked_task_update(tasks, field, new_value):
+    # Returns the value a task field is set to and None, or None and the message explaining why it is not valid
+    if field == "assigned_to_email":
+        new_value = new_value.lower()
+
+    if field == "board" and new_value not in ["Back end", "Front end", "Design"]:
+        return None, "Board not valid. Please choose from: 'Back end', 'Front end', 'Design'."
+    if field == "list_name" and new_value not in ["Backlog", "In Progress", "In Review", "Completed"]:
+        return None, "List not valid. Please choose from: 'Backlog', 'In Progress', 'In Review', 'Completed'."
+    if field == "assigned_to_email" and new_value not in tasks["assigned_to_email"].str.lower().values:
+        return None, "Assignee email not valid. Please choose from the list of team members."
+    return new_value, None
+
+
+@tool("project_management.update_tasks", return_direct=False)
+def update_tasks(task_ids=None, field=None, new_value=None):
+    """
+    Updates a field of several tasks in one call, as calling update_task once for each distinct ID would.
+
+    Parameters
+    ----------
+    task_ids : list
+        8-digit IDs of the tasks.
+    field : str
+        Field to update. Available fields are: "task_name", "assigned_to_email", "list_name", "due_date", "board"
+    new_value : str
+        New value for the field.
+
+    Returns
+    -------
+    messages : dict
+        Message indicating the status of the update, by ID.
+
+    Examples
+    --------
+    >>> project_management.update_tasks(["00000000", "00000001"], "list_name", "Completed")
+    {{"00000000": "Task updated successfully.", "00000001": "Task updated successfully."}}
+    """
+    if not task_ids or not field or not new_value:
+        return "Task IDs, field, or new value not provided."
+
+    table = _project_tasks_table()
+    tasks = table.frame
+
+    new_value, error = _checked_task_update(tasks, field, new_value)
+    if error:
+        return error
+
+    rows = {task_id: table.rows("task_id", task_id) for task_id in id_list(task_ids)}
+    if field not in tasks.columns:
+        return {
+            task_id: "Field not valid." if len(task_rows) else "Task not found." for task_id, task_rows in rows.items()
+        }
+    found = [task_rows for task_rows in rows.values() if len(task_rows)]
+    if found:
+        table.set_values(np.unique(np.concatenate(found)), field, new_value)
+    return {
+        task_id: "Task updated successfully." if len(task_rows) else "Task not found."
+        for task_id, task_rows in rows.items()
+    }
@@ -0,0 +1,322 @@
+import re
+
+import numpy as np
+
+from src.tools.text_index import document
+from src.tools.timestamp_index import timestamp_value
+
+# Characters with a special meaning in regular expressions, apart from "." which matches any character
+_SPECIAL_CHARACTERS = set("^$*+?{}[]\\|()")
+
+
+def literal_words(pattern):
+    """
+    Returns the lowercased parts of a regular expression between its "." wildcards, which every match contains, or
+    None if the pattern uses other special characters or is not ASCII.
+    """
+    if not isinstance(pattern, str) or not pattern.isascii() or _SPECIAL_CHARACTERS & set(pattern):
+        return None
+    return [word.lower() for word in pattern.split(".") if word]
+
+
+class Predicate:
+    """
+    Condition on the rows of a DomainTable that find_rows() plans a search with.
+
+    A predicate is evaluated either by looking up the rows matching it in an index, or by checking candidate rows one
+    at a time. The default implementation can only be checked.
+    """
+
+    # Whether lookup() only returns rows that match, so that they do not need to be checked
+    exact = True
+
+    def prepare(self, table):
+        """
+        Returns whether the predicate can be evaluated exactly as the tool's own filter evaluates it. The other methods
+        are only called if it can.
+        """
+        return True
+
+    def estimate(self, table):
+        """
+        Returns an estimate of the number of rows matching the predicate, from the statistics of the indexes.
+        """
+        return len(table.frame)
+
+    def lookup_cost(self, table):
+        """
+        Returns an estimate of the number of steps lookup() takes, or None if the predicate cannot be looked up.
+        """
+        return None
+
+    def lookup(self, table, rows=None):
+        """
+        Returns the positions of the rows that may match, out of the given positions or all rows, in ascending order.
+        """
+        raise NotImplementedError
+
+    def checker(self, table):
+        """
+        Returns a function telling whether the row at a position matches.
+        """
+        raise NotImplementedError
+
+
+def _intersect(rows, matches):
+    return matches if rows is None else np.intersect1d(rows, matches, assume_unique=True)
+
+
+class Contains(Predicate):
+    """
+    Rows whose value contains a regular expression, ignoring case, as Series.str.contains(pattern, case=False) finds
+    them.
+
+    Distinct values of the column are matched once each through its hash index. If the column also has an n-gram index
+    and the pattern has literal parts, the rows containing them are looked up instead and then checked.
+
+    Parameters
+    ----------
+    column : str
+        Indexed column holding strings.
+    pattern : str
+        Regular expression.
+    text_index : str, optional
+        Name of an n-gram index of the column alone.
+    """
+
+    def __init__(self, column, pattern, text_index=None):
+        self.column = column
+        self.pattern = pattern
+        self.text_index = text_index
+
+    def prepare(self, table):
+        # str.contains fails on columns holding other values, which only the tool's own filter reproduces
+        if not table.holds_only_strings(self.column):
+            return False
+        try:
+            self._regex = re.compile(self.pattern, re.IGNORECASE)
+        except (re.error, TypeError):
+            return False
+        self._words = literal_words(self.pattern) if self.text_index else None
+        if self._words is not None and not table.text_is_ascii(self.text_index):
+            # Some non-ASCII characters match ASCII letters when ignoring case, without lowercasing to them
+            self._words = None
+        self.exact = self._words is None
+        return True
+
+    def _matches(self, value):
+        return self._regex.search(value) is not None
+
+    def estimate(self, table):
+        if self._words is not None:
+            return table.estimate_text_matches(self.text_index, self._words)
+        # As if the pattern named one of the distinct values
+        return len(table.frame) / max(table.num_distinct(self.column), 1)
+
+    def lookup_cost(self, table):
+        if self._words is not None:
+            return self.estimate(table)
+        return table.num_distinct(self.column)
+
+    def lookup(self, table, rows=None):
+        if self._words is not None:
+            return table.search_text(self.text_index, self._words, rows=rows)
+        return _intersect(rows, table.rows_where(self.column, self._matches))
+
+    def checker(self, table):
+        values = table.frame[self.column].to_numpy()
+        return lambda row: self._matches(values[row])
+
+
+class AnyContains(Predicate):
+    """
+    Rows where any of the columns contains a regular expression, ignoring case, as combining
+    Series.str.contains(pattern, case=False) over the columns with | finds them. Missing values never match.
+
+    Parameters
+    ----------
+    columns : tuple
+        Columns of strings.
+    pattern : str
+        Regular expression.
+    """
+
+    def __init__(self, columns, pattern):
+        self.columns = tuple(columns)
+        self.pattern = pattern
+
+    def prepare(self, table):
+        # The str accessor is only available for columns that hold strings
+        frame = table.frame
+        for column in self.columns:
+            if frame[column].dtype != object or (len(frame) and not isinstance(frame[column].iat[0], str)):
+                return False
+        try:
+            self._regex = re.compile(self.pattern, flags=re.IGNORECASE)
+        except (re.error, TypeError, ValueError):
+            return False
+        return True
+
+    def checker(self, table):
+        values = [table.frame[column].to_numpy() for column in self.columns]
+        regex = self._regex
+        return lambda row: any(isinstance(value[row], str) and regex.search(value[row]) for value in values)
+
+
+class Between(Predicate):
+    """
+    Rows whose value is between minimum and maximum, inclusive, as comparing a column of strings with string bounds
+    finds them.
+
+    Parameters
+    ----------
+    column : str
+        Indexed column holding strings.
+    minimum : str, optional
+        Lower bound, or None for no lower bound.
+    maximum : str, optional
+        Upper bound, or None for no upper bound.
+    """
+
+    def __init__(self, column, minimum=None, maximum=None):
+        self.column = column
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def prepare(self, table):
+        # Comparing strings with other values fails, which only the tool's own filter reproduces
+        bounds = [bound for bound in (self.minimum, self.maximum) if bound is not None]
+        return all(isinstance(bound, str) for bound in bounds) and table.holds_only_strings(self.column)
+
+    def estimate(self, table):
+        return table.estimate_rows_in_range(self.column, self.minimum, self.maximum)
+
+    def lookup_cost(self, table):
+        return self.estimate(table)
+
+    def lookup(self, table, rows=None):
+        return _intersect(rows, table.rows_in_range(self.column, self.minimum, self.maximum))
+
+    def checker(self, table):
+        values = table.frame[self.column].to_numpy()
+        minimum, maximum = self.minimum, self.maximum
+        return lambda row: (minimum is None or values[row] >= minimum) and (maximum is None or values[row] <= maximum)
+
+
+class TimestampBetween(Predicate):
+    """
+    Rows whose timestamp is between minimum and maximum, inclusive, comparing pd.Timestamp(value).value.
+
+    Parameters
+    ----------
+    name : str
+        Name of the timestamp index.
+    minimum : int
+        Lower bound in nanoseconds since the epoch.
+    maximum : int
+        Upper bound in nanoseconds since the epoch.
+    """
+
+    def __init__(self, name, minimum, maximum):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def prepare(self, table):
+        # Rows without a timestamp string would be compared differently, so every row must be indexed
+        self._estimate = table.estimate_rows_between(self.name, self.minimum, self.maximum)
+        return self._estimate is not None
+
+    def estimate(self, table):
+        return self._estimate
+
+    def lookup_cost(self, table):
+        return self._estimate
+
+    def lookup(self, table, rows=None):
+        return _intersect(rows, table.rows_between(self.name, self.minimum, self.maximum))
+
+    def checker(self, table):
+        values = table.frame[table.timestamp_indexes[self.name]].to_numpy()
+        minimum, maximum = self.minimum, self.maximum
+        return lambda row: minimum <= timestamp_value(values[row]) <= maximum
+
+
+class TextContains(Predicate):
+    """
+    Rows whose text contains every word, as DomainTable.search_text() finds them.
+
+    Parameters
+    ----------
+    name : str
+        Name of the n-gram index.
+    words : list
+        Lowercased words.
+    """
+
+    def __init__(self, name, words):
+        self.name = name
+        self.words = list(words)
+
+    def estimate(self, table):
+        return table.estimate_text_matches(self.name, self.words)
+
+    def lookup_cost(self, table):
+        return self.estimate(table)
+
+    def lookup(self, table, rows=None):
+        return table.search_text(self.name, self.words, rows=rows)
+
+    def checker(self, table):
+        values = [table.frame[column].to_numpy() for column in table.text_indexes[self.name]]
+        words = self.words
+        return lambda row: all(word in document(value[row] for value in values) for word in words)
+
+
+def find_rows(table, predicates, limit=None):
+    """
+    Returns the positions of the rows matching every predicate, in ascending order and at most limit of them, or None
+    if a predicate cannot be evaluated exactly as the tool's own filter, which the tool then falls back to.
+
+    Predicates are evaluated from the most to the least selective, as estimated from the statistics of the indexes. A
+    predicate is looked up in its index while that is cheaper than checking the rows found so far, and the remaining
+    predicates are checked on those rows in table order until limit of them match. The search stops as soon as no row
+    is left.
+
+    Parameters
+    ----------
+    table : DomainTable
+        Table to search.
+    predicates : list
+        Predicates the rows must match. If empty, every row matches.
+    limit : int, optional
+        Maximum number of rows to return.
+    """
+    if not all(predicate.prepare(table) for predicate in predicates):
+        return None
+    plan = sorted(predicates, key=lambda predicate: predicate.estimate(table))
+    rows = None
+    checked = []
+    for predicate in plan:
+        cost = predicate.lookup_cost(table)
+        if cost is None or (rows is not None and len(rows) <= cost):
+            checked.append(predicate)
+            continue
+        rows = predicate.lookup(table, rows)
+        if not predicate.exact:
+            checked.append(predicate)
+        if not len(rows):
+            return rows
+    if rows is None:
+        rows = np.arange(len(table.frame))
+    if not checked:
+        return rows[:limit]
+
+    checkers = [predicate.checker(table) for predicate in checked]
+    matches = []
+    for row in rows.tolist():
+        if all(check(row) for check in checkers):
+            matches.append(row)
+            if len(matches) == limit:
+                break
+    return np.array(matches, dtype=np.intp)
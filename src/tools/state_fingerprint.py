@@ -0,0 +1,460 @@
+import datetime
+import threading
+import weakref
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Fields where the case matters, so they are not converted to lowercase when states are compared
+CASE_SENSITIVE_COLUMNS = ("status", "list_name", "board")
+# Stand-in for missing values, as DataFrame.equals treats None and NaN as equal
+_MISSING = "\x1fmissing"
+# Hashes of the rows before the first row and after the last row
+_START = np.uint64(0x6A09E667F3BCC908)
+_END = np.uint64(0xBB67AE8584CAA73B)
+_PAIR_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_MODES = (False, True)
+# Columns with more rows are first checked to only hold strings at once
+_NUM_ROWS_CHECKED_ONE_BY_ONE = 64
+
+# Rows of a table that differ from its pristine frame, as row hashes: the deleted pristine rows, the updated pristine
+# rows and the inserted rows. Rows are identified by their position in the pristine frame and sorted.
+ChangeSet = namedtuple("ChangeSet", ["deleted", "updated", "inserted"])
+
+_FROZEN_FINGERPRINTS = {}
+_FROZEN_FINGERPRINTS_LOCK = threading.Lock()
+
+
+def _stand_in(value):
+    # Returns the string hashed for a value that is not a string, which is equal for values that compare equal, or None
+    # if DataFrame.equals may compare the value differently
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return _MISSING
+    if isinstance(value, (bool, int, np.bool_, np.integer)):
+        return f"\x1fnumber:{int(value)}"
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return f"\x1fnumber:{int(value)}" if value.is_integer() else f"\x1fnumber:{value!r}"
+    if isinstance(value, datetime.datetime) and value.tzinfo is None:
+        return f"\x1ftimestamp:{pd.Timestamp(value).value}"
+    return None
+
+
+def _normalized_column(array, lowercase):
+    # Returns the values to hash, whether each one is a string, and whether each one is neither a string nor missing,
+    # or None if DataFrame.equals may compare some value differently than its stand-in. Like Series.str.lower(),
+    # lowercasing turns every value that is not a string into a missing value.
+    # The array may be the frame's own, which must not be modified
+    array = array.copy()
+    if len(array) > _NUM_ROWS_CHECKED_ONE_BY_ONE and pd.api.types.infer_dtype(array, skipna=True) in ("string", "empty"):
+        is_string = ~pd.isna(array)
+        if not is_string.all():
+            if not all(value is None or isinstance(value, float) for value in array[~is_string]):
+                return None
+            array[~is_string] = _MISSING
+        is_other = np.zeros(len(array), dtype=bool)
+    else:
+        is_string = np.fromiter((isinstance(value, str) for value in array), dtype=bool, count=len(array))
+        is_other = ~is_string
+        for position in np.flatnonzero(~is_string):
+            value = array[position]
+            if isinstance(value, bytes):
+                return None
+            stand_in = _MISSING if lowercase else _stand_in(value)
+            if stand_in is None:
+                return None
+            array[position] = stand_in
+            is_other[position] = _stand_in(value) != _MISSING
+    if lowercase:
+        array[is_string] = [value.lower() for value in array[is_string]]
+    return array, is_string, is_other
+
+
+def _normalized_rows(frame, lowercase, labels=None):
+    # Returns the values to hash of each column, the labels, and whether each value is a string and whether it is
+    # neither a string nor missing, or None if some value or label cannot be hashed
+    labels = frame.index if labels is None else pd.Index(labels)
+    if not pd.api.types.is_integer_dtype(labels.dtype):
+        return None
+    if any(dtype != object for dtype in frame.dtypes.to_numpy()):
+        return None
+    values = frame.to_numpy()
+    columns = []
+    is_string = np.zeros(frame.shape, dtype=bool)
+    is_other = np.zeros(frame.shape, dtype=bool)
+    for position, column in enumerate(frame.columns):
+        normalized = _normalized_column(values[:, position], lowercase and column not in CASE_SENSITIVE_COLUMNS)
+        if normalized is None:
+            return None
+        array, is_string[:, position], is_other[:, position] = normalized
+        columns.append(array)
+    return columns, labels.to_numpy(dtype=np.int64), is_string, is_other
+
+
+def _hash_rows(columns, labels):
+    # Factorizing the values first, as hash_pandas_object does by default, treats strings as ending at their first
+    # null character
+    hashes = pd.util.hash_array(labels)
+    with np.errstate(over="ignore"):
+        for values in columns:
+            hashes = _mix(hashes * _PAIR_MULTIPLIER + pd.util.hash_array(values, categorize=False))
+    return hashes
+
+
+def _lowercased_columns(columns):
+    return np.array([column not in CASE_SENSITIVE_COLUMNS for column in columns], dtype=bool)
+
+
+def row_hashes(frame, lowercase, labels=None):
+    """
+    Returns a 64-bit hash of each row of a frame, covering its label and its values, or None if the frame holds values
+    that DataFrame.equals may compare differently than their hashes, or its labels are not integers.
+
+    Values are hashed as strings. Missing values have the same hash, and so do numbers that compare equal.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Rows to hash.
+    lowercase : bool
+        Whether to hash the values converted to lowercase, except in CASE_SENSITIVE_COLUMNS.
+    labels : array-like, optional
+        Labels to hash the rows with, instead of the frame's.
+    """
+    normalized = _normalized_rows(frame, lowercase, labels)
+    if normalized is None:
+        return None
+    columns, labels, is_string, is_other = normalized
+    if lowercase and is_other[:, _lowercased_columns(frame.columns)].any():
+        # Series.str.lower() raises an error for columns without strings, e.g. of timestamps, unless they are empty,
+        # and returns a column of floats for the other columns without strings
+        for position in np.flatnonzero(_lowercased_columns(frame.columns)):
+            values = frame.iloc[:, position].to_numpy()
+            if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty", "mixed", "mixed-integer"):
+                return None
+            if is_other[:, position].any() and not is_string[:, position].any():
+                return None
+    return _hash_rows(columns, labels)
+
+
+def _mix(values):
+    # Finalizer of SplitMix64, so that hashes of similar pairs are unrelated
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def pair_hash_sum(first, second):
+    """
+    Returns the sum, modulo 2**64, of the hashes of the pairs of consecutive rows with the given row hashes. A pair's
+    hash depends on the order of its rows.
+    """
+    first = np.asarray(first, dtype=np.uint64)
+    second = np.asarray(second, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        return int(np.sum(_mix(first * _PAIR_MULTIPLIER + second), dtype=np.uint64))
+
+
+def _sequence_hash_sum(hashes):
+    return pair_hash_sum(np.concatenate([[_START], hashes]), np.concatenate([hashes, [_END]]))
+
+
+def frame_fingerprint(frame, lowercase=False):
+    """
+    Returns the fingerprint of a frame, or None if it holds values other than strings, numbers, timestamps and missing
+    values.
+
+    Two frames have the same fingerprint when DataFrame.equals is true for them, after converting them to lowercase
+    except in CASE_SENSITIVE_COLUMNS if lowercase is True. The fingerprint covers the columns, the number of rows and
+    the sum of the hashes of every pair of consecutive rows, so it depends on the order of the rows, and it can be
+    updated when rows change by only rehashing the pairs they are part of.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Frame to fingerprint.
+    lowercase : bool, optional
+        Whether to fingerprint the frame converted to lowercase, as is_correct() compares states.
+    """
+    hashes = row_hashes(frame, lowercase)
+    if hashes is None:
+        return None
+    return (tuple(frame.columns), len(frame), _sequence_hash_sum(hashes))
+
+
+class FrozenFingerprint:
+    """
+    Row hashes of a pristine frame, in both modes, computed on first use and shared by every table created from it.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Pristine frame.
+    """
+
+    def __init__(self, frame):
+        self.columns = tuple(frame.columns)
+        self.num_rows = len(frame)
+        self.row_hashes = {}
+        self.hash_sums = {}
+        for lowercase in _MODES:
+            hashes = row_hashes(frame, lowercase)
+            self.row_hashes[lowercase] = hashes
+            self.hash_sums[lowercase] = None if hashes is None else _sequence_hash_sum(hashes)
+
+    def fingerprint(self, lowercase):
+        """
+        Returns the pristine frame's fingerprint, the same as frame_fingerprint(frame, lowercase).
+        """
+        if self.row_hashes[lowercase] is None:
+            return None
+        return (self.columns, self.num_rows, self.hash_sums[lowercase])
+
+
+def frozen_fingerprint(frame):
+    """
+    Returns the FrozenFingerprint of a pristine frame, computing it on first use. The frame must not be modified in
+    place.
+    """
+    key = id(frame)
+    with _FROZEN_FINGERPRINTS_LOCK:
+        if key in _FROZEN_FINGERPRINTS and _FROZEN_FINGERPRINTS[key][0]() is frame:
+            return _FROZEN_FINGERPRINTS[key][1]
+    fingerprint = FrozenFingerprint(frame)
+    with _FROZEN_FINGERPRINTS_LOCK:
+        reference = weakref.ref(frame, lambda _: _FROZEN_FINGERPRINTS.pop(key, None))
+        _FROZEN_FINGERPRINTS[key] = (reference, fingerprint)
+    return fingerprint
+
+
+class FingerprintTracker:
+    """
+    Keeps the fingerprint of a table up to date as rows are updated, appended and deleted.
+
+    Rows are identified by the keys of DomainTable, which follow the order of the rows: the rows of the pristine frame
+    have keys 0 to n - 1 and appended rows get the next keys. The tracker stores the hashes of the rows written since
+    the last reset, and the fingerprint is the pristine one with the pairs of consecutive rows that changed swapped,
+    so computing it takes time proportional to the number of rows written rather than to the size of the table.
+
+    Writes the tracker cannot follow, like replacing the whole table or adding a column, make it fingerprint the whole
+    table instead, until the next reset.
+
+    Parameters
+    ----------
+    pristine : pd.DataFrame
+        Pristine frame of the table.
+    """
+
+    def __init__(self, pristine):
+        self.pristine = pristine
+        self.num_pristine_rows = len(pristine)
+        self._labels_are_positions_initially = pristine.index.equals(pd.RangeIndex(len(pristine)))
+        self._labels_are_unique = pristine.index.is_unique
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets every write, as the table is back in its pristine state.
+        """
+        self._written = {}  # Hashes of the rows written since the last reset, in both modes, by key
+        self._labels = {}  # Labels of the rows written since the last reset, by key
+        self._string_columns = {}  # Positions of the columns holding strings in each written row, by key
+        self._other_columns = {}  # Positions of the lowercased columns holding other values than strings, by key
+        self._deleted = set()  # Keys of the deleted rows
+        self._num_keys = self.num_pristine_rows
+        self._unhashable = {lowercase: False for lowercase in _MODES}
+        self._whole_table = False
+        self.labels_are_positions = self._labels_are_positions_initially
+
+    def invalidate(self):
+        """
+        Makes the tracker fingerprint the whole table until the next reset.
+        """
+        self._whole_table = True
+
+    def _store(self, rows, keys, labels=None):
+        if self._whole_table:
+            return
+        keys = np.asarray(keys).tolist()
+        for lowercase in _MODES:
+            normalized = _normalized_rows(rows, lowercase, labels)
+            if normalized is None:
+                self._unhashable[lowercase] = True
+                continue
+            columns, row_labels, is_string, is_other = normalized
+            for key, label, row_hash in zip(keys, row_labels.tolist(), _hash_rows(columns, row_labels)):
+                self._written.setdefault(key, {})[lowercase] = row_hash
+                self._labels[key] = label
+            if lowercase:
+                is_other &= _lowercased_columns(rows.columns)
+                for key, strings, others in zip(keys, is_string, is_other):
+                    self._string_columns[key] = frozenset(np.flatnonzero(strings).tolist())
+                    self._other_columns[key] = frozenset(np.flatnonzero(others).tolist())
+
+    def update_rows(self, frame, positions, keys):
+        """
+        Records that the rows at the given positions of a frame, with the given keys, were modified.
+        """
+        self._store(frame.iloc[np.asarray(positions, dtype=np.intp)], keys)
+
+    def append_rows(self, rows, keys, labels=None):
+        """
+        Records that rows were appended with the given keys, and labels if they are not the rows' own.
+        """
+        keys = np.asarray(keys).tolist()
+        self._num_keys = max([self._num_keys] + [key + 1 for key in keys])
+        self._store(rows, keys, labels)
+
+    def delete_rows(self, keys):
+        """
+        Records that the rows with the given keys were deleted.
+        """
+        for key in np.asarray(keys).tolist():
+            self._deleted.add(key)
+            self._written.pop(key, None)
+            self._labels.pop(key, None)
+            self._string_columns.pop(key, None)
+            self._other_columns.pop(key, None)
+        self.labels_are_positions = False
+
+    def _has_string(self, position):
+        # Returns whether a column of the table holds a string
+        if any(position in columns for columns in self._string_columns.values()):
+            return True
+        values = self.pristine.iloc[:, position].to_numpy()
+        for key in range(self.num_pristine_rows):
+            if isinstance(values[key], str) and key not in self._written and key not in self._deleted:
+                return True
+        return False
+
+    def _lowercase_is_hashable(self):
+        # Returns whether every column with values other than strings also holds a string, so that Series.str.lower()
+        # neither raises an error for it nor returns a column of floats
+        other_columns = set().union(*self._other_columns.values())
+        return all(self._has_string(position) for position in other_columns)
+
+    def fingerprint(self, frame, lowercase):
+        """
+        Returns the table's fingerprint, the same as frame_fingerprint(frame, lowercase).
+
+        Parameters
+        ----------
+        frame : callable
+            Function returning the current state of the table, which is only called if the whole table must be
+            fingerprinted.
+        lowercase : bool
+            Whether to fingerprint the table converted to lowercase.
+        """
+        if self._whole_table:
+            return frame_fingerprint(frame(), lowercase)
+        frozen = frozen_fingerprint(self.pristine)
+        if frozen.row_hashes[lowercase] is None or self._unhashable[lowercase]:
+            return None
+        if lowercase and not self._lowercase_is_hashable():
+            # Series.str.lower() may raise an error for a column, which only the whole column tells
+            return frame_fingerprint(frame(), lowercase)
+        changed = sorted(set(self._written) | self._deleted)
+        if not changed:
+            return frozen.fingerprint(lowercase)
+        num_pristine_rows = self.num_pristine_rows
+        pristine_hashes = frozen.row_hashes[lowercase]
+        # Keys -1 and _num_keys stand for the start and the end of the table. The end moves when rows are appended.
+        end = self._num_keys
+        end_moved = end > num_pristine_rows
+
+        def row_hash(key):
+            if key == -1:
+                return _START
+            if key == end:
+                return _END
+            if key in self._written:
+                return self._written[key][lowercase]
+            return pristine_hashes[key]
+
+        # Pairs of consecutive pristine rows, identified by the key of their first row, that include a changed row
+        changed_pristine = [key for key in changed if key < num_pristine_rows]
+        removed = {first for key in changed_pristine for first in (key - 1, key)}
+        if end_moved:
+            removed.add(num_pristine_rows - 1)
+        removed = np.array(sorted(removed), dtype=np.int64)
+        padded_hashes = np.concatenate([[_START], pristine_hashes, [_END]])
+        hash_sum = frozen.hash_sums[lowercase] - pair_hash_sum(padded_hashes[removed + 1], padded_hashes[removed + 2])
+
+        def previous_row(key):
+            key -= 1
+            while key in self._deleted:
+                key -= 1
+            return key
+
+        def next_row(key):
+            key += 1
+            while key in self._deleted:
+                key += 1
+            return key
+
+        # Pairs of consecutive rows of the current table that include a changed row or skip deleted rows
+        added = set()
+        for key in changed + ([end] if end_moved else []):
+            previous_key = previous_row(key)
+            if key in self._deleted:
+                added.add((previous_key, next_row(key)))
+            else:
+                added.add((previous_key, key))
+                if key != end:
+                    added.add((key, next_row(key)))
+        added = sorted(added)
+        hash_sum += pair_hash_sum([row_hash(first) for first, _ in added], [row_hash(second) for _, second in added])
+        num_rows = self._num_keys - len(self._deleted)
+        return (frozen.columns, num_rows, hash_sum % 2**64)
+
+    def change_set(self, lowercase):
+        """
+        Returns the ChangeSet of the rows written since the last reset, or None if the table must be compared as a
+        whole.
+
+        Rows are appended after the pristine rows, so two tables created from the same pristine frame have equal frames
+        exactly when their change sets are equal. Updates that leave a row as it was are not changes, and inserted rows
+        that restore deleted pristine rows, label included, count as those rows instead.
+
+        Parameters
+        ----------
+        lowercase : bool
+            Whether to compare the rows converted to lowercase, except in CASE_SENSITIVE_COLUMNS.
+        """
+        frozen = frozen_fingerprint(self.pristine)
+        if self._whole_table or frozen.row_hashes[lowercase] is None or self._unhashable[lowercase]:
+            return None
+        if not self._labels_are_unique or (lowercase and not self._lowercase_is_hashable()):
+            return None
+        pristine_hashes = frozen.row_hashes[lowercase]
+        num_pristine_rows = self.num_pristine_rows
+        deleted = {key for key in self._deleted if key < num_pristine_rows}
+        updated = {
+            key: hashes[lowercase]
+            for key, hashes in self._written.items()
+            if key < num_pristine_rows and hashes[lowercase] != pristine_hashes[key]
+        }
+        inserted = sorted(key for key in self._written if key >= num_pristine_rows)
+        # Every pristine row after the last remaining one is deleted, so an inserted row with the label of one of them
+        # takes its place
+        last = num_pristine_rows - 1
+        while last in deleted:
+            last -= 1
+        num_restored = 0
+        for key in inserted:
+            restored = self.pristine.index.get_indexer([self._labels[key]])[0]
+            if restored <= last:
+                break
+            deleted.discard(restored)
+            if self._written[key][lowercase] != pristine_hashes[restored]:
+                updated[restored] = self._written[key][lowercase]
+            last = restored
+            num_restored += 1
+        return ChangeSet(
+            tuple(sorted(deleted)),
+            tuple((key, int(updated[key])) for key in sorted(updated)),
+            tuple(int(self._written[key][lowercase]) for key in inserted[num_restored:]),
+        )
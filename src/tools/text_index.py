@@ -0,0 +1,224 @@
+import numpy as np
+
+# Length of the n-grams in the index. Words shorter than this are only matched by checking the documents directly.
+NGRAM_LENGTH = 3
+_NO_KEYS = np.array([], dtype=np.int64)
+
+
+def document(values):
+    """
+    Returns the searchable text of a row, e.g. f"{subject} {body} {sender}".lower() for an email.
+    """
+    return " ".join(f"{value}" for value in values).lower()
+
+
+def _code_points(text):
+    return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.int64)
+
+
+def _ngram_codes(characters, bits_per_character):
+    # Each n-gram is packed into one integer
+    codes = characters[: len(characters) - NGRAM_LENGTH + 1].copy()
+    for offset in range(1, NGRAM_LENGTH):
+        codes <<= bits_per_character
+        codes |= characters[offset : len(characters) - NGRAM_LENGTH + 1 + offset]
+    return codes
+
+
+def _intersect_sorted(keys, other_keys):
+    # Intersects two sorted arrays of distinct keys with a binary search of the shorter in the longer, which is much
+    # faster than np.intersect1d when a posting list is much shorter than the other
+    positions = np.searchsorted(other_keys, keys)
+    found = positions < len(other_keys)
+    found[found] = other_keys[positions[found]] == keys[found]
+    return keys[found]
+
+
+class FrozenNgramIndex:
+    """
+    Inverted index from the n-grams of a list of documents to the keys of the documents containing them.
+
+    A word is a substring of a document only if every n-gram of the word occurs in the document, so intersecting the
+    posting lists of a word's n-grams gives a small set of candidates that are then checked with the in operator. The
+    results are therefore exactly the documents the in operator matches. The index is never modified, so one instance
+    can be shared by every table with the same pristine frame.
+
+    Parameters
+    ----------
+    documents : list
+        Lowercased text of each row. The key of a document is its position in the list.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+        lengths = np.fromiter((len(text) for text in documents), dtype=np.int64, count=len(documents))
+        # Documents are joined with a separator that is not part of any n-gram
+        code_points = _code_points("\0".join(documents))
+        self.is_ascii = bool(code_points.max(initial=0) < 128)
+        document_keys = np.repeat(np.arange(len(documents), dtype=np.int64), lengths + 1)[: len(code_points)]
+        document_keys[np.cumsum(lengths + 1)[:-1] - 1] = -1
+
+        # Characters are renumbered from 1 so that n-grams take as few bits as the documents' alphabet allows
+        used = np.bincount(code_points, minlength=1) > 0
+        self._characters = np.zeros(len(used), dtype=np.int64)
+        self._characters[used] = np.arange(1, np.count_nonzero(used) + 1)
+        self._bits_per_character = int(np.count_nonzero(used)).bit_length()
+
+        if len(code_points) >= NGRAM_LENGTH:
+            ngrams = _ngram_codes(self._characters[code_points], self._bits_per_character)
+            keys = document_keys[: len(ngrams)]
+            within_document = (keys >= 0) & (keys == document_keys[NGRAM_LENGTH - 1 :])
+            ngrams, keys = ngrams[within_document], keys[within_document]
+        else:
+            ngrams, keys = _NO_KEYS, _NO_KEYS
+
+        key_bits = max(len(documents) - 1, 1).bit_length()
+        if NGRAM_LENGTH * self._bits_per_character + key_bits < 64:
+            # Sorting (n-gram, key) pairs packed into one integer is much faster than sorting them as pairs
+            pairs = np.unique((ngrams << key_bits) | keys)
+            ngrams, self._keys = pairs >> key_bits, pairs & ((1 << key_bits) - 1)
+        else:
+            # The keys are already in ascending order, so a stable sort by n-gram keeps them sorted within each n-gram
+            order = np.argsort(ngrams, kind="stable")
+            ngrams, keys = ngrams[order], keys[order]
+            distinct = np.ones(len(ngrams), dtype=bool)
+            distinct[1:] = (ngrams[1:] != ngrams[:-1]) | (keys[1:] != keys[:-1])
+            ngrams, self._keys = ngrams[distinct], keys[distinct]
+        starts = np.flatnonzero(np.r_[True, ngrams[1:] != ngrams[:-1]]) if len(ngrams) else _NO_KEYS
+        self._ngrams = ngrams[starts]
+        self._offsets = np.r_[starts, len(ngrams)]
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _word_ngrams(self, word):
+        # Returns None if the word contains a character that no document contains
+        code_points = _code_points(word)
+        if code_points.max(initial=0) >= len(self._characters):
+            return None
+        characters = self._characters[code_points]
+        if not characters.all():
+            return None
+        if len(word) < NGRAM_LENGTH:
+            return _NO_KEYS
+        return np.unique(_ngram_codes(characters, self._bits_per_character))
+
+    def _posting_list(self, ngram):
+        position = np.searchsorted(self._ngrams, ngram)
+        if position == len(self._ngrams) or self._ngrams[position] != ngram:
+            return _NO_KEYS
+        return self._keys[self._offsets[position] : self._offsets[position + 1]]
+
+    def estimate(self, words):
+        """
+        Returns the length of the shortest posting list of the words' n-grams, an upper bound on the number of documents
+        containing the words, or the number of documents if the words have no n-grams.
+        """
+        shortest = len(self.documents)
+        for word in words:
+            ngrams = self._word_ngrams(word)
+            if ngrams is None:
+                return 0
+            for ngram in ngrams:
+                shortest = min(shortest, len(self._posting_list(ngram)))
+        return shortest
+
+    def candidates(self, words):
+        """
+        Returns the keys of the documents containing every n-gram of the words, in ascending order, or None if the
+        words have no n-grams.
+        """
+        posting_lists = []
+        for word in words:
+            ngrams = self._word_ngrams(word)
+            if ngrams is None:
+                return _NO_KEYS
+            posting_lists += [self._posting_list(ngram) for ngram in ngrams]
+        if not posting_lists:
+            return None
+        posting_lists.sort(key=len)
+        keys = posting_lists[0]
+        for posting_list in posting_lists[1:]:
+            if not len(keys):
+                break
+            keys = _intersect_sorted(keys, posting_list)
+        return keys
+
+
+class NgramIndex:
+    """
+    N-gram index that is kept up to date as rows are added, modified and removed.
+
+    Changed documents are stored next to a frozen index and checked directly, so the cost of creating, updating and
+    discarding it only depends on the number of rows that changed.
+
+    Parameters
+    ----------
+    base : FrozenNgramIndex
+        Index of the documents before any change.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        # New text of each added or modified document, or None if it was removed
+        self.changes = {}
+        self._non_ascii_keys = set()
+
+    def add(self, key, values):
+        self.changes[key] = document(values)
+        if not self.changes[key].isascii():
+            self._non_ascii_keys.add(key)
+
+    def discard(self, key, values):
+        self.changes[key] = None
+        self._non_ascii_keys.discard(key)
+
+    def is_ascii(self):
+        """
+        Returns whether every document is ASCII text, as far as can be told without checking each document.
+        """
+        return self.base.is_ascii and not self._non_ascii_keys
+
+    def estimate(self, words):
+        """
+        Returns an upper bound on the number of documents containing every word.
+        """
+        return self.base.estimate(words) + len(self.changes)
+
+    def text(self, key):
+        """
+        Returns the current text of a document.
+        """
+        return self.changes[key] if key in self.changes else self.base.documents[key]
+
+    def filter(self, keys, words):
+        """
+        Returns the keys, out of the given ones, of the documents that contain every word as a substring.
+        """
+        candidates = self.base.candidates(words)
+        if candidates is not None:
+            keys = keys[np.isin(keys, candidates) | np.isin(keys, np.fromiter(self.changes, dtype=np.int64))]
+        matches = [key for key in keys.tolist() if all(word in self.text(key) for word in words)]
+        return np.array(matches, dtype=np.int64)
+
+    def search(self, words):
+        """
+        Returns the keys of the documents that contain every word as a substring, in ascending order.
+
+        Parameters
+        ----------
+        words : list
+            Lowercased words. If empty, every document matches.
+        """
+        keys = self.base.candidates(words)
+        if keys is None:
+            keys = np.arange(len(self.base), dtype=np.int64)
+        if self.changes:
+            keys = keys[~np.isin(keys, np.fromiter(self.changes, dtype=np.int64, count=len(self.changes)))]
+        documents = self.base.documents
+        if words:
+            matches = [key for key in keys.tolist() if all(word in documents[key] for word in words)]
+        else:
+            matches = keys.tolist()
+        matches += [key for key, text in self.changes.items() if text is not None and all(word in text for word in words)]
+        return np.array(sorted(matches), dtype=np.int64)
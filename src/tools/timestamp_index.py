@@ -0,0 +1,134 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+_NO_KEYS = np.array([], dtype=np.int64)
+
+
+def timestamp_value(value):
+    """
+    Returns pd.Timestamp(value).value for a string holding a timezone-naive timestamp, or None for any other value.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        timestamp = pd.Timestamp(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if timestamp is pd.NaT or timestamp.tzinfo is not None:
+        return None
+    return timestamp.value
+
+
+def _timestamp_values(values):
+    # Vectorised timestamp_value(); if the strings are not all timezone-naive, every value is None
+    result = np.full(len(values), None, dtype=object)
+    is_string = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    try:
+        with warnings.catch_warnings():
+            # Mixed time zones give an object Series, or an error in later versions of pandas, and are not indexed
+            warnings.simplefilter("ignore", FutureWarning)
+            timestamps = pd.to_datetime(pd.Series(values[is_string], dtype=object), format="ISO8601", errors="coerce")
+    except (ValueError, TypeError, OverflowError):
+        return result
+    if not pd.api.types.is_datetime64_dtype(timestamps.dtype):
+        return result
+    parsed = timestamps.notna().to_numpy()
+    strings = np.flatnonzero(is_string)
+    result[strings[parsed]] = timestamps[parsed].to_numpy().astype(np.int64)
+    return result
+
+
+class FrozenTimestampIndex:
+    """
+    Index of the rows sorted by the timestamp in a string column, for finding the rows in a time range with a binary
+    search. The index is never modified, so one instance can be shared by every table with the same pristine frame.
+
+    Values that are not timezone-naive timestamp strings are not indexed, but counted, so callers can tell when the
+    index does not cover every row.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values of the column.
+    """
+
+    def __init__(self, values):
+        timestamps = _timestamp_values(values)
+        indexed = np.fromiter((timestamp is not None for timestamp in timestamps), dtype=bool, count=len(values))
+        keys = np.flatnonzero(indexed)
+        timestamps = timestamps[indexed].astype(np.int64)
+        order = np.argsort(timestamps, kind="stable")
+        self._keys = keys[order]
+        self._timestamps = timestamps[order]
+        self.num_unindexed = len(values) - len(keys)
+
+    def keys_between(self, minimum, maximum):
+        """
+        Returns the keys of the rows with minimum <= timestamp <= maximum, in ascending order.
+        """
+        start = np.searchsorted(self._timestamps, minimum, side="left")
+        end = np.searchsorted(self._timestamps, maximum, side="right")
+        return np.sort(self._keys[start:end])
+
+    def count_between(self, minimum, maximum):
+        """
+        Returns the number of rows with minimum <= timestamp <= maximum.
+        """
+        start = np.searchsorted(self._timestamps, minimum, side="left")
+        end = np.searchsorted(self._timestamps, maximum, side="right")
+        return int(end - start)
+
+
+class TimestampIndex:
+    """
+    Timestamp index that is kept up to date as rows are added, modified and removed.
+
+    Changed rows are stored next to a frozen index and checked directly, so the cost of creating, updating and
+    discarding it only depends on the number of rows that changed.
+
+    Parameters
+    ----------
+    base : FrozenTimestampIndex
+        Index of the column before any change.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        # New timestamp of each added or modified row, or None if it was removed or cannot be indexed
+        self.changes = {}
+        self.num_unindexed = base.num_unindexed
+
+    def add(self, key, values):
+        (value,) = values
+        self.changes[key] = timestamp_value(value)
+        if self.changes[key] is None:
+            self.num_unindexed += 1
+
+    def discard(self, key, values):
+        (value,) = values
+        if timestamp_value(value) is None:
+            self.num_unindexed -= 1
+        self.changes[key] = None
+
+    def estimate_between(self, minimum, maximum):
+        """
+        Returns an upper bound on the number of rows with minimum <= timestamp <= maximum.
+        """
+        return self.base.count_between(minimum, maximum) + len(self.changes)
+
+    def keys_between(self, minimum, maximum):
+        """
+        Returns the keys of the rows with minimum <= timestamp <= maximum, in ascending order.
+        """
+        keys = self.base.keys_between(minimum, maximum)
+        if not self.changes:
+            return keys
+        keys = keys[~np.isin(keys, np.fromiter(self.changes, dtype=np.int64, count=len(self.changes)))]
+        changed = [
+            key
+            for key, timestamp in self.changes.items()
+            if timestamp is not None and minimum <= timestamp <= maximum
+        ]
+        return np.union1d(keys, np.array(changed, dtype=np.int64)) if changed else keys
@@ -1,26 +1,38 @@
+import functools
+
 from src.tools import calendar, email, analytics, project_management, customer_relationship_manager, company_directory
+from src.tools.workspace import use_workspace
 
 tools_with_side_effects = [
     calendar.create_event,
     calendar.delete_event,
+    calendar.delete_events,
     calendar.update_event,
+    calendar.update_events,
     email.send_email,
     email.delete_email,
+    email.delete_emails,
     email.forward_email,
     email.reply_email,
     analytics.create_plot,
     project_management.create_task,
     project_management.delete_task,
+    project_management.delete_tasks,
     project_management.update_task,
+    project_management.update_tasks,
     customer_relationship_manager.update_customer,
+    customer_relationship_manager.update_customers,
     customer_relationship_manager.add_customer,
     customer_relationship_manager.delete_customer,
+    customer_relationship_manager.delete_customers,
 ]
 
 tools_without_side_effects = [
     calendar.get_event_information_by_id,
+    calendar.get_event_information_by_ids,
     calendar.search_events,
     email.get_email_information_by_id,
+    email.get_email_information_by_ids,
     email.search_emails,
     analytics.engaged_users_count,
     analytics.get_visitor_information_by_id,
@@ -28,9 +40,11 @@ tools_without_side_effects = [
     analytics.total_visits_count,
     analytics.get_average_session_duration,
     project_management.get_task_information_by_id,
+    project_management.get_task_information_by_ids,
     project_management.search_tasks,
     customer_relationship_manager.search_customers,
     company_directory.find_email_address,
+    company_directory.find_email_addresses,
 ]
 
 all_tools = tools_with_side_effects + tools_without_side_effects
@@ -52,3 +66,34 @@ customer_relationship_manager_toolkit = [
     t["tool"] for t in tool_information if t["name"].split(".")[0] == "customer_relationship_manager"
 ]
 company_directory_toolkit = [t["tool"] for t in tool_information if t["name"].split(".")[0] == "company_directory"]
+
+
+def _run_in_workspace(func, workspace):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_workspace(workspace):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def bind_tools_to_workspace(tools, workspace):
+    """
+    Returns copies of the tools that always read and modify the given workspace.
+
+    The copies keep the names, descriptions and arguments of the original tools, so agents see the same tools and
+    the recorded function calls can still be replayed with the module-level tools.
+
+    Parameters
+    ----------
+    tools : list
+        Tools to bind, e.g. email_toolkit.
+    workspace : Workspace
+        Workspace the tools should use.
+
+    Returns
+    -------
+    bound_tools : list
+        Copies of the tools bound to the workspace.
+    """
+    return [tool.copy(update={"func": _run_in_workspace(tool.func, workspace)}) for tool in tools]
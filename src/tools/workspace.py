@@ -0,0 +1,124 @@
+import contextlib
+import contextvars
+import threading
+
+from src.tools.domain_table import DomainTable
+
+# Functions that load the pristine tables, keyed by table name. Each domain module registers its tables on import.
+TABLE_LOADERS = {}
+# Columns with hash indexes, keyed by table name
+TABLE_INDEXED_COLUMNS = {}
+# Columns of each n-gram index, keyed by table name and index name
+TABLE_TEXT_INDEXES = {}
+# Column of each timestamp index, keyed by table name and index name
+TABLE_TIMESTAMP_INDEXES = {}
+# Pristine frames shared by every workspace, keyed by table name. Tables are only loaded on first use.
+PRISTINE_TABLES = {}
+# Indexes of the pristine frames shared by every workspace, keyed by table name and column
+PRISTINE_INDEXES = {}
+_LOAD_LOCK = threading.Lock()
+
+_CURRENT_WORKSPACE = contextvars.ContextVar("workspace", default=None)
+
+
+def register_table(name, load, indexed_columns=(), text_indexes=None, timestamp_indexes=None):
+    """
+    Registers the function that loads the pristine state of a domain table.
+
+    Parameters
+    ----------
+    name : str
+        Name of the table, e.g. "emails".
+    load : callable
+        Function without arguments that returns the original state of the table. It is called once, on first use, and
+        the frame it returns is shared by all workspaces, so it must not be modified in place.
+    indexed_columns : tuple, optional
+        Columns the tools look rows up by, e.g. ("email_id",). They get hash indexes.
+    text_indexes : dict, optional
+        Columns the tools search for substrings in, by index name, e.g. {"text": ("subject", "body")}. They get
+        n-gram indexes.
+    timestamp_indexes : dict, optional
+        Timestamp columns the tools filter by time range, by index name, e.g. {"sent_time": "sent_datetime"}. They
+        get sorted indexes.
+    """
+    TABLE_LOADERS[name] = load
+    TABLE_INDEXED_COLUMNS[name] = tuple(indexed_columns)
+    TABLE_TEXT_INDEXES[name] = dict(text_indexes or {})
+    TABLE_TIMESTAMP_INDEXES[name] = dict(timestamp_indexes or {})
+
+
+def pristine_table(name):
+    """
+    Returns the pristine state of a domain table, loading it on first use.
+    """
+    if name not in PRISTINE_TABLES:
+        with _LOAD_LOCK:
+            if name not in PRISTINE_TABLES:
+                PRISTINE_TABLES[name] = TABLE_LOADERS[name]()
+    return PRISTINE_TABLES[name]
+
+
+class Workspace:
+    """
+    Sandbox that owns its own copy of the domain tables.
+
+    Tools called while a workspace is in use read and modify that workspace's tables, so episodes running on
+    different threads or asyncio tasks do not see each other's changes. The copies are copy-on-write views of the
+    shared pristine tables, so creating a workspace is cheap.
+
+    Examples
+    --------
+    >>> with use_workspace(Workspace()):
+    ...     email.send_email.func("jane@example.com", "Meeting Reminder", "Don't forget our meeting.")
+    """
+
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, name):
+        """
+        Returns the workspace's copy of a table, creating it on first use.
+        """
+        if name not in self.tables:
+            self.tables[name] = DomainTable(
+                pristine_table(name),
+                TABLE_INDEXED_COLUMNS[name],
+                TABLE_TEXT_INDEXES[name],
+                TABLE_TIMESTAMP_INDEXES[name],
+                PRISTINE_INDEXES.setdefault(name, {}),
+            )
+        return self.tables[name]
+
+    def reset(self):
+        """
+        Resets all tables in the workspace to their original state.
+        """
+        for table in self.tables.values():
+            table.reset()
+
+
+# Used when no other workspace is in use, so single episode scripts can keep calling the tools directly.
+DEFAULT_WORKSPACE = Workspace()
+
+
+def current_workspace():
+    """
+    Returns the workspace in use in the current thread or asyncio task.
+    """
+    workspace = _CURRENT_WORKSPACE.get()
+    return DEFAULT_WORKSPACE if workspace is None else workspace
+
+
+@contextlib.contextmanager
+def use_workspace(workspace):
+    """
+    Context manager that makes the tools read and modify the given workspace.
+
+    The workspace is stored in a context variable, so it applies to the current thread and to asyncio tasks created
+    inside the block, but not to other threads.
+    """
+    token = _CURRENT_WORKSPACE.set(workspace)
+    try:
+        yield workspace
+    finally:
+        _CURRENT_WORKSPACE.reset(token)
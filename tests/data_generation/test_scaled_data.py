@@ -0,0 +1,112 @@
+import filecmp
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+project_root = os.path.abspath(os.path.curdir)
+sys.path.append(project_root)
+import scripts.data_generation.mocked_data.generate_analytics_data as analytics
+import scripts.data_generation.mocked_data.generate_calendar_data as calendar
+import scripts.data_generation.mocked_data.generate_customer_relationship_manager_data as crm
+import scripts.data_generation.mocked_data.generate_email_data as email
+import scripts.data_generation.mocked_data.generate_project_management_data as project_management
+from src.data_generation.data_generation_utils import HARDCODED_CURRENT_TIME
+
+domains = [calendar, analytics, crm, email, project_management]
+scale_factor = 2.5
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("scaled")
+    for domain in domains:
+        domain.generate_scaled_data(scale_factor, str(data_dir))
+    return data_dir
+
+
+def read(data_dir, name):
+    return pd.read_csv(os.path.join(data_dir, "processed", name), dtype=str)
+
+
+def test_scaled_data_is_deterministic(data_dir, tmp_path):
+    """
+    Tests that generating the scaled data again with the same seed writes the same files.
+    """
+    for domain in domains:
+        domain.generate_scaled_data(scale_factor, str(tmp_path))
+    names = sorted(os.listdir(os.path.join(data_dir, "processed")))
+    _, mismatch, errors = filecmp.cmpfiles(data_dir / "processed", tmp_path / "processed", names, shallow=False)
+    assert len(names) == 5 and not mismatch and not errors
+
+
+def test_scaled_row_counts(data_dir):
+    """
+    Tests that every table has scale_factor times as many rows as the base data, with distinct IDs.
+    """
+    for name, id_column in [
+        ("calendar_events.csv", "event_id"),
+        ("emails.csv", "email_id"),
+        ("project_tasks.csv", "task_id"),
+        ("customer_relationship_manager_data.csv", "customer_id"),
+        ("analytics_data.csv", None),
+    ]:
+        data = read(data_dir, name)
+        assert len(data) == round(len(read("data", name)) * scale_factor)
+        if id_column:
+            assert data[id_column].is_unique
+
+
+def test_scaled_calendar_events(data_dir):
+    """
+    Tests that scaled events are on weekdays within working hours, never overlap and never share a name on a day.
+    """
+    events = read(data_dir, "calendar_events.csv")
+    start = pd.to_datetime(events["event_start"])
+    end = start + pd.to_timedelta(events["duration"].astype(int), unit="m")
+    assert start.is_monotonic_increasing
+    assert (start.iloc[1:].to_numpy() >= end.iloc[:-1].to_numpy()).all()
+    assert (start.dt.weekday < 5).all() and (start.dt.hour >= 9).all()
+    assert ((end - end.dt.normalize()) <= pd.Timedelta(hours=18)).all()
+    assert not events.assign(day=start.dt.date).duplicated(["day", "event_name"]).any()
+
+
+def test_scaled_emails_and_visits(data_dir):
+    """
+    Tests that no subject is received twice on a day and no visitor visits twice on a day.
+    """
+    emails = read(data_dir, "emails.csv")
+    assert emails["sent_datetime"].is_monotonic_increasing
+    assert emails["sent_datetime"].str[:10].max() <= str(HARDCODED_CURRENT_TIME.date())
+    assert not emails.assign(day=emails["sent_datetime"].str[:10]).duplicated(["day", "subject"]).any()
+    visits = read(data_dir, "analytics_data.csv")
+    assert not visits.duplicated(["date_of_visit", "visitor_id"]).any()
+    engaged = (visits["session_duration_seconds"].astype(int) > 10) & (visits["page_views"].astype(int) > 1)
+    assert (visits["user_engaged"] == engaged.astype(str)).all()
+
+
+def test_scaled_tasks_and_customers(data_dir):
+    """
+    Tests that tasks are assigned to their board's team, members with no overdue tasks have none, and customers are
+    followed up after they were last contacted.
+    """
+    tasks = read(data_dir, "project_tasks.csv")
+    for board, team in [
+        ("Back end", project_management.backend_team_emails),
+        ("Front end", project_management.frontend_team_emails),
+        ("Design", project_management.design_team_emails),
+    ]:
+        assert tasks.loc[tasks["board"] == board, "assigned_to_email"].isin(team).all()
+    overdue = tasks["due_date"] < str(HARDCODED_CURRENT_TIME.date())
+    no_overdue_team = tasks["assigned_to_email"].isin(project_management.team_with_no_overdue_tasks)
+    assert (tasks.loc[overdue & no_overdue_team, "list_name"] == "Completed").all()
+
+    customers = read(data_dir, "customer_relationship_manager_data.csv")
+    assert customers["assigned_to_email"].isin(project_management.sales_team_emails).all()
+    assert (customers["follow_up_by"] > customers["last_contact_date"]).all()
+    assert customers["last_contact_date"].is_monotonic_decreasing
+    names = customers["customer_name"].str.lower().str.replace(" ", ".")
+    assert (customers["customer_email"].str.split("@").str[0] == names).all()
+    assert np.isin(customers["status"].unique(), crm.statuses).all()
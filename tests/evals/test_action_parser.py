@@ -0,0 +1,211 @@
+import pytest
+from langchain_core.agents import AgentAction
+
+from src.evals import utils
+from src.evals.action_parser import ActionError, execute_action, parse_action
+from src.tools import calendar, company_directory, email, project_management
+
+
+def test_parse_action():
+    """
+    Tests that an action is parsed into its tool and literal arguments, once per action string.
+    """
+    action = 'email.delete_emails.func(["00000001", "00000002"], email_id=None)'
+    parsed = parse_action(action)
+    assert parsed.tool is email.delete_emails
+    assert parsed.args == (["00000001", "00000002"],)
+    assert parsed.kwargs == (("email_id", None),)
+    assert parse_action(action) is parsed
+
+
+@pytest.mark.parametrize(
+    "action, reason",
+    [
+        ("not a python function", "Invalid syntax"),
+        ('calendar.search_events.func(query="a"', "Invalid syntax"),
+        ("42", "Not a call of a tool"),
+        ('reply_email.func(email_id="00000001")', "Not a call of <domain>.<tool>.func"),
+        ('calendar.search_events.run(query="a")', "Not a call of <domain>.<tool>.func"),
+        ('calendar.search_event.func(query="a")', "Unknown tool calendar.search_event"),
+        ('os.system.func("ls")', "Unknown tool os.system"),
+        ('calendar.search_events.func(query=__import__("os").getcwd())', "Arguments must be literals"),
+        ('calendar.search_events.func(query="a" + "b")', "Arguments must be literals"),
+        ('calendar.search_events.func(**{"query": "a"})', "Unpacked arguments are not supported"),
+        ('calendar.search_events.func(query="a", query="b")', "Repeated keyword argument"),
+    ],
+)
+def test_parse_action_errors(action, reason):
+    """
+    Tests that actions which are not calls of a tool with literal arguments are rejected with the reason.
+    """
+    with pytest.raises(ActionError) as error:
+        parse_action(action)
+    assert error.value.action == action
+    assert error.value.reason.startswith(reason)
+
+
+def test_execute_action_matches_eval():
+    """
+    Tests that executing actions changes the state and returns what evaluating them does.
+    """
+    actions = [
+        'calendar.create_event.func(event_name="Sync", participant_email="sam@example.com", '
+        'event_start="2023-12-01 10:00:00", duration="30")',
+        'calendar.update_event.func(event_id="00000013", field="duration", new_value="60")',
+        "calendar.delete_event.func('00000275')",
+        'calendar.search_events.func(query="sync")',
+    ]
+    calendar.reset_state()
+    expected = [eval(action, vars(utils)) for action in actions]
+    expected_events = calendar.CALENDAR_EVENTS.copy()
+    calendar.reset_state()
+    assert [execute_action(action) for action in actions] == expected
+    assert calendar.CALENDAR_EVENTS.equals(expected_events)
+    calendar.reset_state()
+
+
+def test_execute_action_tool_error():
+    """
+    Tests that an exception raised by a tool is chained to the ActionError.
+    """
+    with pytest.raises(ActionError) as error:
+        execute_action('calendar.search_events.func(place="office")')
+    assert isinstance(error.value.__cause__, TypeError)
+    assert error.value.reason.startswith("calendar.search_events raised TypeError")
+
+
+def test_execute_actions_and_reset_state_reports_errors():
+    """
+    Tests that actions that cannot be executed are skipped and reported, while the others are executed.
+    """
+    errors = []
+    actions = [
+        "not a python function",
+        'calendar.delete_event.func(event_id="00000013")',
+        'calendar.delete_event.func(event_id=open("secrets.txt").read())',
+    ]
+    _, calendar_state, *_ = utils.execute_actions_and_reset_state(actions, errors=errors)
+    assert "00000013" not in calendar_state["event_id"].values
+    assert [error.action for error in errors] == [actions[0], actions[2]]
+    assert "00000013" in calendar.CALENDAR_EVENTS["event_id"].values
+
+
+def record_and_replay(tool, tool_input):
+    """
+    Records a tool call as an agent run does and replays it, returning the recorded action and what the call returns.
+    """
+    action = utils.convert_agent_action_to_function_call(AgentAction(tool=tool, tool_input=tool_input, log=""))
+    for domain in utils.DOMAINS:
+        domain.reset_state()
+    try:
+        return action, execute_action(action)
+    finally:
+        for domain in utils.DOMAINS:
+            domain.reset_state()
+
+
+def test_recorded_bulk_calls_replay_with_lists():
+    """
+    Tests that the lists of IDs of the bulk tools are recorded as lists, so that replaying them changes the same rows as
+    the single ID tools.
+    """
+    action, result = record_and_replay("email.delete_emails", {"email_ids": ["00000000", "00000001"]})
+    assert action == "email.delete_emails.func(email_ids=['00000000', '00000001'])"
+    assert result == {"00000000": "Email deleted successfully.", "00000001": "Email deleted successfully."}
+    _, *bulk_state = utils.execute_actions_and_reset_state([action])
+    _, *single_state = utils.execute_actions_and_reset_state(
+        ['email.delete_email.func(email_id="00000000")', 'email.delete_email.func(email_id="00000001")']
+    )
+    assert all(bulk.equals(single) for bulk, single in zip(bulk_state, single_state))
+    assert len(bulk_state[1]) == len(email.EMAILS) - 2
+
+    action = record_and_replay(
+        "calendar.update_events", {"event_ids": ["00000013", "00000014"], "field": "duration", "new_value": "60"}
+    )[0]
+    _, calendar_state, *_ = utils.execute_actions_and_reset_state([action])
+    assert calendar_state.set_index("event_id").loc[["00000013", "00000014"], "duration"].tolist() == ["60", "60"]
+
+
+def test_recorded_strings_keep_ground_truth_format():
+    """
+    Tests that string arguments are recorded in double quotes, as the ground truth answers are, with their quotes and
+    newlines escaped.
+    """
+    action, _ = record_and_replay("calendar.delete_event", {"event_id": "00000013"})
+    assert action == 'calendar.delete_event.func(event_id="00000013")'
+    tool_input = {"recipient": "sam@example.com", "body": 'Say "hi"\nBye'}
+    action = utils.convert_agent_action_to_function_call(
+        AgentAction(tool="email.send_email", tool_input=tool_input, log="")
+    )
+    assert parse_action(action).kwargs == (("recipient", "sam@example.com"), ("body", 'Say "hi"\nBye'))
+
+
+
+def test_recorded_scalars_keep_string_format():
+    """
+    Tests that numbers and None are recorded as strings, as they were before lists were recorded as literals, so that
+    they match the ground truth answers and are stored as strings on replay.
+    """
+    tool_input = {
+        "event_name": "Sync",
+        "participant_email": "sam@example.com",
+        "event_start": "2023-12-01 10:00:00",
+        "duration": 60,
+    }
+    action = utils.convert_agent_action_to_function_call(
+        AgentAction(tool="calendar.create_event", tool_input=tool_input, log="")
+    )
+    assert action == (
+        'calendar.create_event.func(event_name="Sync", participant_email="sam@example.com", '
+        'event_start="2023-12-01 10:00:00", duration="60")'
+    )
+    _, calendar_state, *_ = utils.execute_actions_and_reset_state([action])
+    assert calendar_state["duration"].iloc[-1] == "60"
+    tool_input = {"task_name": "Fix bug", "assigned_to_email": None, "limit": 5}
+    action = utils.convert_agent_action_to_function_call(
+        AgentAction(tool="project_management.search_tasks", tool_input=tool_input, log="")
+    )
+    assert action == 'project_management.search_tasks.func(task_name="Fix bug", assigned_to_email="None", limit="5")'
+
+
+@pytest.mark.parametrize(
+    "tool, tool_input",
+    [
+        (email.get_email_information_by_ids, {"email_ids": ["00000000", "00000001"], "fields": ["subject", "body"]}),
+        (calendar.get_event_information_by_ids, {"event_ids": ["00000000"], "fields": ["event_name", "duration"]}),
+        (
+            project_management.get_task_information_by_ids,
+            {"task_ids": ["00000000", "00000001"], "fields": ["task_name"]},
+        ),
+    ],
+)
+def test_recorded_batch_reads_replay_with_lists(tool, tool_input):
+    """
+    Tests that the lists of IDs and fields of the batch read tools are recorded as lists, so that replaying a call
+    returns what calling the tool does.
+    """
+    _, result = record_and_replay(tool.name, tool_input)
+    assert result == tool.func(**tool_input)
+    assert sorted(result) == sorted(tool_input[next(iter(tool_input))])
+    assert all(isinstance(record, dict) for record in result.values())
+
+
+def test_recorded_directory_lookup_replays_with_list_of_names():
+    """
+    Tests that the names of find_email_addresses are recorded as a list, so that each name is looked up on replay.
+    """
+    tool_input = {"names": ["Sam", "Raj"]}
+    action, result = record_and_replay("company_directory.find_email_addresses", tool_input)
+    assert action == "company_directory.find_email_addresses.func(names=['Sam', 'Raj'])"
+    assert list(result) == ["Sam", "Raj"]
+    assert result == company_directory.find_email_addresses.func(**tool_input)
+
+
+def test_recorded_paginated_search_replays_with_list_of_fields():
+    """
+    Tests that a paginated search_tasks call replays with its limit, recorded as a string, and its list of fields.
+    """
+    tool_input = {"board": "Front end", "limit": "5", "fields": ["task_id", "task_name"]}
+    _, result = record_and_replay("project_management.search_tasks", tool_input)
+    assert len(result["tasks"]) == 5
+    assert all(list(task) == ["task_id", "task_name"] for task in result["tasks"])
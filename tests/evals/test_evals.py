@@ -1,4 +1,10 @@
-from src.evals.utils import has_side_effects, is_correct
+import pandas as pd
+from langchain.agents import AgentType, initialize_agent
+from langchain.llms.fake import FakeListLLM
+
+from src.evals import utils
+from src.evals.utils import has_side_effects, is_correct, state_differences
+from src.tools.toolkits import all_tools
 
 
 def test_is_correct_single_action():
@@ -146,3 +152,78 @@ def test_has_side_effects_complex_scenario():
         "calendar.create_event.func(event_name='Team Meeting', participant_email='alex@company.com', event_start='2023-10-05 09:00:00', duration=60)"
     ]
     assert has_side_effects(predicted_actions, ground_truth_actions)
+
+
+def test_is_correct_matches_comparing_frames():
+    """
+    Tests that comparing change sets gives the same result as comparing the whole frames, including for states holding
+    timestamps, which sent emails do.
+    """
+    answers = [
+        [],
+        ["calendar.create_event.func(event_name='Sync', participant_email='Sam@Company.com', event_start='2023-10-02 12:00:00', duration=60)"],
+        ["calendar.create_event.func(event_name='sync', participant_email='sam@company.com', event_start='2023-10-02 12:00:00', duration=60)"],
+        ["email.send_email.func(recipient='sam@company.com', subject='Update', body='Done')"],
+        ["email.send_email.func(recipient='Sam@Company.com', subject='UPDATE', body='done')"],
+        ["email.delete_email.func(email_id='00000057')", "email.send_email.func(recipient='sam@company.com', subject='Update', body='Done')"],
+        ["project_management.update_task.func(task_id='00000149', field='list_name', new_value='Done')"],
+        ["project_management.update_task.func(task_id='00000149', field='list_name', new_value='done')"],
+    ]
+    for predicted_actions in answers:
+        for ground_truth_actions in answers:
+            expected = utils._states_are_equal(predicted_actions, ground_truth_actions)
+            assert is_correct(predicted_actions, ground_truth_actions, "") == expected
+
+
+def test_state_differences():
+    """
+    Tests that state_differences returns the rows that differ, by domain, and nothing for equal states.
+    """
+    predicted_actions = ["calendar.delete_event.func(event_id='00000013')"]
+    ground_truth_actions = [
+        "calendar.create_event.func(event_name='Sync', participant_email='sam@company.com', event_start='2023-10-02 12:00:00', duration=60)"
+    ]
+    assert state_differences(ground_truth_actions, ground_truth_actions) == {}
+    differences = state_differences(predicted_actions, ground_truth_actions)
+    assert list(differences) == ["calendar"]
+    rows = differences["calendar"]
+    # The event deleted by the prediction and the one created by the ground truth are only in the ground truth
+    assert rows["state"].tolist() == ["ground truth", "ground truth"]
+    assert sorted(rows["event_id"])[0] == "00000013"
+    assert "sync" in rows["event_name"].tolist()
+
+
+def test_calculate_metrics_in_parallel_matches_serial():
+    """
+    Tests that evaluating the predictions in worker processes gives the same metrics, in the same order, as evaluating
+    them in the current process.
+    """
+    create_event = "calendar.create_event.func(event_name='Sync', participant_email='sam@company.com', event_start='2023-10-02 12:00:00', duration=60)"
+    delete_event = "calendar.delete_event.func(event_id='00000013')"
+    answers = [[create_event], [delete_event], [], [create_event, delete_event], [delete_event]]
+    predictions = [[create_event], [], [delete_event], [create_event, delete_event], ["not a python function"]]
+    queries = [f"query {number}" for number in range(len(answers))]
+    ground_truth = pd.DataFrame({"query": queries, "answer": answers})
+    predictions = pd.DataFrame(
+        {"query": queries, "function_calls": predictions, "error": ["", "", "", "Context window exceeded", ""]}
+    )
+    serial = utils.calculate_metrics(ground_truth, predictions, print_errors=False)
+    parallel = utils.calculate_metrics(ground_truth, predictions, print_errors=False, num_workers=2)
+    assert serial["correct"].tolist() == [True, False, False, False, False]
+    assert serial["unwanted_side_effects"].tolist() == [False, False, True, False, False]
+    assert parallel.equals(serial)
+
+
+def test_agent_prompt_builds_from_all_tools():
+    """
+    Tests that the agent prompt builds from the descriptions of all tools, which are templates where braces must be
+    escaped.
+    """
+    agent = initialize_agent(
+        llm=FakeListLLM(responses=[""]),
+        agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
+        tools=all_tools,
+    )
+    prompt = agent.agent.llm_chain.prompt.format(input="Query", agent_scratchpad="")
+    assert all(tool.name in prompt for tool in all_tools)
+    assert '{"tasks": [...], "next_cursor": ...}' in prompt
@@ -0,0 +1,69 @@
+import pytest
+
+from src.evals import utils
+from src.evals.ground_truth_cache import GroundTruthStateCache
+
+ground_truth_actions = [
+    "calendar.create_event.func(event_name='My event', participant_email='Sam@Company.com', "
+    "event_start='2023-10-02 12:00:00', duration='60')",
+    'email.delete_email.func(email_id="00000057")',
+]
+
+
+@pytest.fixture
+def executions(monkeypatch, tmp_path):
+    """
+    Uses an empty cache persisted to a temporary file and records the actions of every execution.
+    """
+    monkeypatch.setattr(utils, "GROUND_TRUTH_STATES", GroundTruthStateCache(path=str(tmp_path / "states.sqlite")))
+    executions = []
+    execute = utils.execute_actions_and_record_changes
+
+    def recording_execute(actions):
+        executions.append(list(actions))
+        return execute(actions)
+
+    monkeypatch.setattr(utils, "execute_actions_and_record_changes", recording_execute)
+    return executions
+
+
+def test_ground_truth_is_executed_once(executions):
+    """
+    Tests that a ground truth answer is only executed once, however many predictions it is compared with.
+    """
+    predictions = [ground_truth_actions, ground_truth_actions[:1], [], [" " + ground_truth_actions[0]]]
+    results = [utils.is_correct(prediction, ground_truth_actions, "") for prediction in predictions]
+    results += [utils.has_side_effects(prediction, ground_truth_actions) for prediction in predictions]
+    assert results == [True, False, False, False, False, True, False, True]
+    # Predictions are executed every time
+    assert executions.count([]) == 2
+    assert executions.count(ground_truth_actions) == 1 + 2
+
+
+def test_ground_truth_states_persist_across_runs(executions, tmp_path):
+    """
+    Tests that the states are read back from disk by a new cache instead of executing the answer again.
+    """
+    states = utils.GROUND_TRUTH_STATES.get(ground_truth_actions, utils._ground_truth_change_sets)
+    num_executions = len(executions)
+    cache = GroundTruthStateCache(path=str(tmp_path / "states.sqlite"))
+    cached_states = cache.get(ground_truth_actions, utils._ground_truth_change_sets)
+    assert len(executions) == num_executions
+    assert cache.hits == 1 and cache.misses == 0
+    assert cached_states == states
+
+
+def test_ground_truth_cache_matches_execution(executions):
+    """
+    Tests that the cached change sets are those of the states the answer results in, converted to lowercase.
+    """
+    utils.GROUND_TRUTH_STATES.persist = False
+    _, expected = utils.execute_actions_and_record_changes(ground_truth_actions)
+    for _ in range(2):
+        states = utils.GROUND_TRUTH_STATES.get(ground_truth_actions, utils._ground_truth_change_sets)
+        assert len(states) == 5 and None not in states
+        assert states == expected
+    calendar_changes, email_changes, *other_changes = states
+    assert len(calendar_changes.inserted) == 1 and not calendar_changes.deleted and not calendar_changes.updated
+    assert len(email_changes.deleted) == 1 and not email_changes.inserted and not email_changes.updated
+    assert not any(any(changes) for changes in other_changes)
@@ -167,3 +167,18 @@ def test_average_session_duration():
     assert analytics.get_average_session_duration.func() == {"2023-10-01": 10.0, "2023-10-02": 12.5}
     # Test with a date range that includes no visits
     assert analytics.get_average_session_duration.func("2023-10-03", "2023-10-04") == {}
+
+
+def test_aggregates_do_not_modify_data():
+    """
+    Tests that the aggregate tools read the analytics data without modifying it or assigning into a copy of it.
+    """
+    analytics.ANALYTICS_DATA = pd.DataFrame(test_analytics_data)
+    expected = pd.DataFrame(test_analytics_data)
+    with pd.option_context("mode.chained_assignment", "raise"):
+        for time_min, time_max in [(None, None), ("2023-10-02", None), ("2023-10-01", "2023-10-01")]:
+            analytics.total_visits_count.func(time_min, time_max)
+            analytics.engaged_users_count.func(time_min, time_max)
+            analytics.traffic_source_count.func(time_min, time_max, "direct")
+            analytics.get_average_session_duration.func(time_min, time_max)
+    pd.testing.assert_frame_equal(analytics.ANALYTICS_DATA, expected)
@@ -52,6 +52,22 @@ def test_get_event_information_by_id_field_not_found():
     calendar.reset_state()
 
 
+def test_get_event_information_by_ids():
+    """
+    Tests that get_event_information_by_ids returns what get_event_information_by_id returns for each ID and field.
+    """
+    calendar.CALENDAR_EVENTS = pd.DataFrame(test_events)
+    calendar.delete_event.func("70838584")
+    assert calendar.get_event_information_by_ids.func(["70838585", "70838584"], ["event_name", "duration"]) == {
+        "70838585": {"event_name": "Meeting with Sam", "duration": "60"},
+        "70838584": "Event not found.",
+    }
+    assert calendar.get_event_information_by_ids.func() == "Event IDs not provided."
+    assert calendar.get_event_information_by_ids.func(["70838585"]) == "Fields not provided."
+    assert calendar.get_event_information_by_ids.func(["70838585"], ["field_does_not_exist"]) == "Field not found."
+    calendar.reset_state()
+
+
 def test_search_events():
     """
     Tests search_events.
@@ -117,6 +133,50 @@ def test_search_for_event_time_during_meeting():
     calendar.reset_state()
 
 
+def search_events_by_filtering_matches(query, time_min, time_max):
+    # Reference implementation that matches every event and then filters them by time
+    events = calendar.CALENDAR_EVENTS
+    events = events[
+        (events["event_name"].str.contains(query, case=False))
+        | (events["participant_email"].str.contains(query, case=False))
+    ].to_dict(orient="records")
+    if time_min:
+        events = [event for event in events if pd.Timestamp(event["event_start"]) >= pd.Timestamp(time_min)]
+    if time_max:
+        events = [event for event in events if pd.Timestamp(event["event_start"]) <= pd.Timestamp(time_max)]
+    return events[:5] if events else "No events found."
+
+
+def test_search_events_time_range():
+    """
+    Tests that search_events returns the same events as matching every event and then filtering them by time, before
+    and after events are created, updated and deleted.
+    """
+    queries = ["", "meeting", "FATIMA", "sync|review", "email_does_not_exist"]
+    time_ranges = [
+        (None, None),
+        ("2023-11-01 00:00:00", None),
+        (None, "2023-09-01 09:00:00"),
+        ("2023-11-10", "2023-11-20 12:00:00"),
+        ("2023-08-01 11:30:00", "2023-08-01 11:30:00"),
+        ("2030-01-01", None),
+    ]
+
+    def check():
+        for query in queries:
+            for time_min, time_max in time_ranges:
+                expected = search_events_by_filtering_matches(query, time_min, time_max)
+                assert calendar.search_events.func(query, time_min, time_max) == expected
+
+    check()
+    first_event_id = calendar.search_events.func("", "2023-11-01")[0]["event_id"]
+    calendar.delete_event.func(first_event_id)
+    calendar.create_event.func("Review meeting", "sam@example.com", "2023-11-15 10:00:00", "30")
+    calendar.update_event.func(calendar.CALENDAR_EVENTS["event_id"].values[1], "event_start", "2023-11-12 09:00:00")
+    check()
+    calendar.reset_state()
+
+
 def test_create_event():
     """
     Tests create_event.
@@ -208,3 +268,42 @@ def test_update_event_not_found():
     calendar.CALENDAR_EVENTS = pd.DataFrame(test_events)
     assert calendar.update_event.func("99999999", "event_name", "New Event Name") == "Event not found."
     calendar.reset_state()
+
+
+def test_delete_events_matches_deleting_one_at_a_time():
+    """
+    Tests that delete_events leaves the events as calling delete_event for each distinct ID does.
+    """
+    calendar.reset_state()
+    event_ids = calendar.CALENDAR_EVENTS["event_id"].iloc[[4, 1, 60, 4]].tolist() + ["99999999"]
+    messages = {}
+    for event_id in event_ids:
+        messages.setdefault(event_id, calendar.delete_event.func(event_id))
+    expected = calendar.CALENDAR_EVENTS.copy()
+
+    calendar.reset_state()
+    assert calendar.delete_events.func(event_ids) == messages
+    pd.testing.assert_frame_equal(calendar.CALENDAR_EVENTS, expected)
+    assert calendar.delete_events.func() == "Event IDs not provided."
+    calendar.reset_state()
+
+
+def test_update_events_matches_updating_one_at_a_time():
+    """
+    Tests that update_events leaves the events as calling update_event for each distinct ID does, including for a new
+    field.
+    """
+    calendar.reset_state()
+    event_ids = calendar.CALENDAR_EVENTS["event_id"].iloc[[8, 2, 8, 50]].tolist() + ["99999999"]
+    for field, new_value in [("participant_email", "Sam.Smith@example.com"), ("duration", "45"), ("location", "Room 1")]:
+        calendar.reset_state()
+        messages = {}
+        for event_id in event_ids:
+            messages.setdefault(event_id, calendar.update_event.func(event_id, field, new_value))
+        expected = calendar.CALENDAR_EVENTS.copy()
+
+        calendar.reset_state()
+        assert calendar.update_events.func(event_ids, field, new_value) == messages
+        pd.testing.assert_frame_equal(calendar.CALENDAR_EVENTS, expected)
+    assert calendar.update_events.func(event_ids, "duration") == "Event IDs, field, or new value not provided."
+    calendar.reset_state()
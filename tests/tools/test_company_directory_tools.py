@@ -0,0 +1,79 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src.tools import company_directory
+
+test_email_addresses = [
+    "aisha.chen@atlas.com",
+    "carlos.rodriguez@atlas.com",
+    "fatima.khan@atlas.com",
+    "Kofi.Mensah@atlas.com",
+    "amir.ali@atlas.com",
+]
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    company_directory.EMAILS = pd.DataFrame({"email_address": test_email_addresses})
+    yield
+    del company_directory.EMAILS
+
+
+def find_email_address_by_scanning(name):
+    # Reference implementation that matches every address with str.contains
+    email_addresses = company_directory.EMAILS
+    return email_addresses[email_addresses["email_address"].str.contains(name.lower())]["email_address"].values
+
+
+def test_find_email_address():
+    """
+    Tests find_email_address.
+    """
+    assert company_directory.find_email_address.func("Aisha").tolist() == ["aisha.chen@atlas.com"]
+    assert company_directory.find_email_address.func("") == "Name not provided."
+
+
+def test_find_email_address_matches_scanning():
+    """
+    Tests that find_email_address returns the same addresses as matching every address, including for names with
+    wildcards, other special characters and upper case addresses, and for a large directory.
+    """
+    names = ["a", "Chen", "a.c", "kofi", "ats.com", ".", "^a", "a|k", "missing", "é"]
+    for name in names:
+        expected = find_email_address_by_scanning(name)
+        actual = company_directory.find_email_address.func(name)
+        assert actual.dtype == expected.dtype
+        assert actual.tolist() == expected.tolist()
+
+    random.seed(0)
+    first_names = ["aisha", "carlos", "fatima", "kofi", "amir", "nia", "raj", "lena"]
+    company_directory.EMAILS = pd.DataFrame(
+        {"email_address": [f"{random.choice(first_names)}.{i}@atlas.com" for i in range(10_000)]}
+    )
+    for name in ["Nia.12", "raj", "lena.99", "x"]:
+        assert company_directory.find_email_address.func(name).tolist() == find_email_address_by_scanning(name).tolist()
+
+
+def test_find_email_address_cache_returns_copies():
+    """
+    Tests that modifying a returned array does not change later results of the cached lookup.
+    """
+    addresses = company_directory.find_email_address.func("aisha")
+    addresses[0] = "modified"
+    assert company_directory.find_email_address.func("aisha").tolist() == ["aisha.chen@atlas.com"]
+
+
+def test_find_email_addresses():
+    """
+    Tests that find_email_addresses returns the addresses find_email_address returns for each name.
+    """
+    assert company_directory.find_email_addresses.func(["Aisha", "khan", "missing", ""]) == {
+        "Aisha": ["aisha.chen@atlas.com"],
+        "khan": ["fatima.khan@atlas.com"],
+        "missing": [],
+        "": "Name not provided.",
+    }
+    assert company_directory.find_email_addresses.func("carlos") == {"carlos": ["carlos.rodriguez@atlas.com"]}
+    assert company_directory.find_email_addresses.func() == "Names not provided."
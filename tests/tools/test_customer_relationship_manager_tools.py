@@ -65,6 +65,52 @@ def test_search_customers_no_parameters():
     assert crm.search_customers.func() == "No search parameters provided. Please provide at least one parameter."
 
 
+def search_customers_by_scanning(**parameters):
+    # Reference implementation that filters every customer with str.contains and string comparisons
+    customers = crm.CRM_DATA
+    for column in ["customer_name", "customer_email", "product_interest", "status", "assigned_to_email"]:
+        if parameters.get(column):
+            customers = customers[customers[column].str.contains(parameters[column], case=False)]
+    for column, key in [("last_contact_date", "last_contact_date"), ("follow_up_by", "follow_up_by")]:
+        if parameters.get(f"{key}_min"):
+            customers = customers[customers[column] >= parameters[f"{key}_min"]]
+        if parameters.get(f"{key}_max"):
+            customers = customers[customers[column] <= parameters[f"{key}_max"]]
+    return customers.to_dict(orient="records")[:5]
+
+
+def test_search_customers_matches_scanning():
+    """
+    Tests that search_customers returns the same customers as filtering every customer, including for patterns with
+    wildcards and other special characters, and after customers are added, updated and deleted.
+    """
+    crm.reset_state()
+    searches = [
+        {"customer_name": "smith"},
+        {"customer_name": "J.hn", "status": "lead"},
+        {"customer_email": "example.com", "product_interest": "soft"},
+        {"customer_email": "^[a-c]"},
+        {"customer_name": "e", "assigned_to_email": "SAM"},
+        {"status": "Qualified|Won", "last_contact_date_min": "2023-06-01"},
+        {"product_interest": "ware", "follow_up_by_min": "2023-11-01", "follow_up_by_max": "2023-12-31"},
+        {"last_contact_date_max": "2023-03-01"},
+        {"customer_name": "does not exist"},
+        {"status": "o"},
+    ]
+    for parameters in searches:
+        assert crm.search_customers.func(**parameters) == search_customers_by_scanning(**parameters)
+
+    first_id = crm.CRM_DATA["customer_id"].iloc[0]
+    crm.update_customer.func(first_id, "status", "Lead")
+    crm.update_customer.func(first_id, "customer_name", "Jhon Smithers")
+    crm.delete_customer.func(crm.CRM_DATA["customer_id"].iloc[1])
+    crm.add_customer.func(
+        "Jo Smith", "sam@example.com", "Lead", "jo.smith@example.com", None, "2023-06-15", "Software", "", "2023-12-01"
+    )
+    for parameters in searches:
+        assert crm.search_customers.func(**parameters) == search_customers_by_scanning(**parameters)
+
+
 def test_update_customer():
     """
     Tests update_customer.
@@ -146,3 +192,46 @@ def test_delete_customer_not_found():
     """
     message = crm.delete_customer.func("00000003")
     assert message == "Customer not found."
+
+
+def test_delete_customers_matches_deleting_one_at_a_time():
+    """
+    Tests that delete_customers leaves the customers as calling delete_customer for each distinct ID does.
+    """
+    crm.reset_state()
+    customer_ids = crm.CRM_DATA["customer_id"].iloc[[3, 0, 90, 3]].tolist() + ["99999999"]
+    messages = {}
+    for customer_id in customer_ids:
+        messages.setdefault(customer_id, crm.delete_customer.func(customer_id))
+    expected = crm.CRM_DATA.copy()
+
+    crm.reset_state()
+    assert crm.delete_customers.func(customer_ids) == messages
+    pd.testing.assert_frame_equal(crm.CRM_DATA, expected)
+    assert crm.delete_customers.func() == "Customer IDs not provided."
+
+
+def test_update_customers_matches_updating_one_at_a_time():
+    """
+    Tests that update_customers leaves the customers as calling update_customer for each distinct ID does, and
+    validates the new value once.
+    """
+    crm.reset_state()
+    customer_ids = crm.CRM_DATA["customer_id"].iloc[[6, 1, 6, 70]].tolist() + ["99999999"]
+    for field, new_value in [("status", "Won"), ("customer_email", "Sam.Smith@Example.com"), ("notes", "Call back")]:
+        crm.reset_state()
+        messages = {}
+        for customer_id in customer_ids:
+            messages.setdefault(customer_id, crm.update_customer.func(customer_id, field, new_value))
+        expected = crm.CRM_DATA.copy()
+
+        crm.reset_state()
+        assert crm.update_customers.func(customer_ids, field, new_value) == messages
+        pd.testing.assert_frame_equal(crm.CRM_DATA, expected)
+
+    crm.reset_state()
+    assert crm.update_customers.func(customer_ids, "status", "Open").startswith("Status not valid.")
+    assert crm.update_customers.func(customer_ids[:1], "priority", "High")[customer_ids[0]].startswith(
+        "Field not valid."
+    )
+    assert crm.update_customers.func([], "status", "Won") == "Customer IDs, field, or new value not provided."
@@ -0,0 +1,66 @@
+import pandas as pd
+
+# Importing the analytics tools registers the analytics tables
+from src.tools import analytics
+from src.tools.daily_metrics import daily_metrics
+from src.tools.workspace import pristine_table
+
+date_ranges = [
+    (None, None),
+    ("2023-10-01", "2023-10-31"),
+    ("2023-11-15", None),
+    (None, "2023-09-10"),
+    ("2023-11-30", "2023-11-01"),
+]
+
+
+def filter_dates(data, time_min, time_max):
+    if time_min:
+        data = data[data["date_of_visit"] >= time_min]
+    if time_max:
+        data = data[data["date_of_visit"] <= time_max]
+    return data.copy()
+
+
+def test_daily_metrics_match_grouping_the_visits():
+    """
+    Tests that the daily metrics of a date range equal grouping the visits in the date range by day, values and types
+    included.
+    """
+    analytics_data = pristine_table("analytics_data")
+    metrics = daily_metrics(analytics_data)
+    assert daily_metrics(analytics_data) is metrics
+    for time_min, time_max in date_ranges:
+        data = filter_dates(analytics_data, time_min, time_max)
+        assert metrics.per_day(metrics.visits, time_min, time_max) == data.groupby("date_of_visit").size().to_dict()
+
+        data["user_engaged"] = data["user_engaged"].astype(bool).astype(int)
+        expected = data.groupby("date_of_visit")["user_engaged"].sum().to_dict()
+        assert metrics.per_day(metrics.engaged_users, time_min, time_max) == expected
+
+        for traffic_source in ["direct", "referral", "search engine", "social media", "unknown"]:
+            data["visits_from_source"] = (data["traffic_source"] == traffic_source).astype(int)
+            expected = data.groupby("date_of_visit")["visits_from_source"].sum().to_dict()
+            assert metrics.per_day(metrics.source_visits(traffic_source), time_min, time_max) == expected
+
+        data["session_duration_seconds"] = data["session_duration_seconds"].astype(float)
+        expected = data[["date_of_visit", "session_duration_seconds"]].groupby("date_of_visit").mean()
+        actual = metrics.per_day(metrics.average_session_duration, time_min, time_max)
+        assert actual == expected["session_duration_seconds"].to_dict()
+        assert all(type(value) is float for value in actual.values())
+
+
+def test_daily_metrics_are_not_computed_for_other_values():
+    """
+    Tests that frames with values the tools would handle differently have no daily metrics.
+    """
+    data = pd.DataFrame(
+        {
+            "date_of_visit": ["2023-10-01", None],
+            "visitor_id": ["000", "001"],
+            "session_duration_seconds": ["10.0", "5.0"],
+            "traffic_source": ["direct", "direct"],
+            "user_engaged": [True, False],
+        }
+    )
+    assert daily_metrics(data) is None
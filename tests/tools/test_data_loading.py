@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.tools import data_loading
+from src.tools.data_loading import DATA_DIR_ENV_VAR, DEFAULT_DATA_DIR, data_path, read_csv_cached, _cache_path
+
+test_rows = [
+    {"customer_id": "00000000", "customer_name": "Jane", "product_interest": "Software"},
+    {"customer_id": "00000001", "customer_name": "Mark", "product_interest": np.nan},
+]
+
+
+def test_cached_read_matches_read_csv(tmp_path):
+    """
+    Tests that reading from the sidecar cache returns the same frame as pd.read_csv, including missing values.
+    """
+    csv_path = os.path.join(tmp_path, "customers.csv")
+    pd.DataFrame(test_rows).to_csv(csv_path, index=False)
+    expected = pd.read_csv(csv_path, dtype=str)
+    assert read_csv_cached(csv_path, dtype=str).equals(expected)
+    assert os.path.exists(_cache_path(csv_path))
+    cached = read_csv_cached(csv_path, dtype=str)
+    assert cached.equals(expected)
+    assert list(cached.dtypes) == list(expected.dtypes)
+    assert isinstance(cached.loc[1, "product_interest"], float)
+
+
+def test_cache_is_rebuilt_when_csv_changes(tmp_path):
+    """
+    Tests that the sidecar cache is not used once the CSV has been modified.
+    """
+    csv_path = os.path.join(tmp_path, "customers.csv")
+    pd.DataFrame(test_rows).to_csv(csv_path, index=False)
+    read_csv_cached(csv_path, dtype=str)
+    pd.DataFrame(test_rows[:1]).to_csv(csv_path, index=False)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(read_csv_cached(csv_path, dtype=str)) == 1
+
+
+def test_data_dir_configuration(tmp_path, monkeypatch):
+    """
+    Tests that set_data_dir() takes precedence over the environment variable, which takes precedence over the default.
+    """
+    monkeypatch.delenv(DATA_DIR_ENV_VAR, raising=False)
+    assert data_path("processed", "emails.csv") == os.path.join(DEFAULT_DATA_DIR, "processed", "emails.csv")
+    monkeypatch.setenv(DATA_DIR_ENV_VAR, str(tmp_path / "from_env"))
+    assert data_loading.get_data_dir() == str(tmp_path / "from_env")
+    data_loading.set_data_dir(str(tmp_path / "from_api"))
+    try:
+        assert data_loading.get_data_dir() == str(tmp_path / "from_api")
+    finally:
+        data_loading.set_data_dir(None)
+    assert data_loading.get_data_dir() == str(tmp_path / "from_env")
+
+
+def test_tables_are_not_loaded_on_import(tmp_path):
+    """
+    Tests that importing the tools from another directory does not load any table until a tool uses it.
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    script = (
+        "import src.evals.utils\n"
+        "from src.tools import company_directory, email\n"
+        "from src.tools.workspace import PRISTINE_TABLES\n"
+        "assert PRISTINE_TABLES == {} and 'EMAILS' not in vars(company_directory)\n"
+        "assert len(email.EMAILS) > 0 and list(PRISTINE_TABLES) == ['emails']\n"
+    )
+    environment = {**os.environ, "PYTHONPATH": project_root}
+    environment.pop(DATA_DIR_ENV_VAR, None)
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=environment, check=True)
@@ -0,0 +1,204 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from src.tools import email
+from src.tools.domain_table import DomainTable, id_list
+from src.tools.workspace import pristine_table
+
+test_rows = [
+    {"row_id": "00000000", "name": "First"},
+    {"row_id": "00000001", "name": "Second"},
+]
+
+
+def test_frame_is_pristine_until_written():
+    """
+    Tests that reading a table does not copy the pristine frame.
+    """
+    pristine = pd.DataFrame(test_rows)
+    table = DomainTable(pristine)
+    assert table.frame is pristine
+
+
+def test_reset_reverts_touched_rows():
+    """
+    Tests that reset restores updated rows without touching the pristine frame.
+    """
+    pristine = pd.DataFrame(test_rows)
+    table = DomainTable(pristine)
+    table.set_values(table.rows("row_id", "00000001"), "name", "Updated")
+    assert table.frame.loc[1, "name"] == "Updated"
+    assert pristine.loc[1, "name"] == "Second"
+    working = table.frame
+    table.reset()
+    assert table.frame is working
+    assert table.frame.equals(pristine)
+
+
+def test_reset_after_append_and_replace():
+    """
+    Tests that reset restores the pristine state after rows are appended or removed.
+    """
+    pristine = pd.DataFrame(test_rows)
+    table = DomainTable(pristine)
+    table.append_row(["00000002", "Third"])
+    assert len(table.frame) == 3
+    table.reset()
+    assert table.frame.equals(pristine)
+    table.replace(pristine[pristine["row_id"] != "00000000"])
+    assert len(table.frame) == 1
+    table.reset()
+    assert table.frame.equals(pristine)
+    assert len(pristine) == 2
+
+
+def test_index_stays_correct_through_writes():
+    """
+    Tests that index lookups and text searches match a full scan after random updates, appends, deletes and resets.
+    """
+    random.seed(0)
+    pristine = pd.DataFrame({"row_id": [str(i % 7).zfill(8) for i in range(20)], "name": ["Name"] * 20})
+    table = DomainTable(pristine, indexed_columns=("row_id",), text_indexes={"text": ("row_id", "name")})
+    row_ids = [str(i).zfill(8) for i in range(10)]
+    for _ in range(200):
+        operation = random.choice(["update", "append", "delete", "reset"])
+        row_id = random.choice(row_ids)
+        if operation == "update":
+            table.set_values(table.rows("row_id", row_id), "row_id", random.choice(row_ids))
+        elif operation == "append":
+            table.append_row([row_id, "Appended"])
+        elif operation == "delete":
+            table.delete_rows(table.rows("row_id", row_id))
+        else:
+            table.reset()
+        for row_id in row_ids:
+            expected = np.flatnonzero(table.frame["row_id"] == row_id)
+            assert table.rows("row_id", row_id).tolist() == expected.tolist()
+            texts = (table.frame["row_id"] + " " + table.frame["name"]).str.lower()
+            expected = np.flatnonzero(texts.str.contains(row_id[-3:], regex=False) & texts.str.contains("app"))
+            assert table.search_text("text", [row_id[-3:], "app"]).tolist() == expected.tolist()
+    assert pristine["row_id"].tolist() == [str(i % 7).zfill(8) for i in range(20)]
+
+
+def test_buffered_appends_match_appending_one_at_a_time():
+    """
+    Tests that the frame after buffered appends, interleaved with updates, deletes and reads, is identical to the one
+    built by appending every row to the frame directly.
+    """
+    random.seed(0)
+    pristine = pd.DataFrame({"row_id": [str(i).zfill(8) for i in range(10)], "name": ["Name"] * 10})
+    table = DomainTable(pristine, indexed_columns=("row_id",))
+    expected = pristine.copy()
+    for i in range(300):
+        operation = random.choice(["append_row", "append_rows", "append_rows_ignore_index", "update", "delete", "read"])
+        row_id = str(10 + i).zfill(8)
+        value = random.choice(["New", None, 5, pd.Timestamp("2023-11-30")])
+        if operation == "append_row":
+            table.append_row([row_id, value])
+            expected.loc[len(expected)] = [row_id, value]
+        elif operation.startswith("append_rows"):
+            rows = pd.DataFrame({"row_id": [row_id], "name": [value]})
+            ignore_index = operation == "append_rows_ignore_index"
+            table.append_rows(rows, ignore_index=ignore_index)
+            expected = pd.concat([expected, rows], ignore_index=ignore_index)
+        elif operation == "update":
+            position = random.randrange(len(expected))
+            table.set_values([position], "name", "Updated")
+            expected.iloc[position, 1] = "Updated"
+        elif operation == "delete" and len(expected) > 1:
+            position = random.randrange(len(expected))
+            table.delete_rows([position])
+            expected = expected.take([j for j in range(len(expected)) if j != position])
+        elif operation == "read":
+            pd.testing.assert_frame_equal(table.frame, expected)
+        assert table.rows("row_id", row_id).tolist() == np.flatnonzero(expected["row_id"] == row_id).tolist()
+    pd.testing.assert_frame_equal(table.frame, expected)
+    assert table.frame.index.equals(expected.index) and type(table.frame.index) is type(expected.index)
+
+
+def test_deletes_match_removing_rows():
+    """
+    Tests that lookups, updates, appends and text searches are correct while deleted rows are not yet removed from the
+    frame, and that the frame then matches the one the rows were removed from one at a time.
+    """
+    random.seed(0)
+    pristine = pd.DataFrame({"row_id": [str(i % 13).zfill(8) for i in range(40)], "name": ["Name"] * 40})
+    table = DomainTable(pristine, indexed_columns=("row_id",), text_indexes={"text": ("row_id", "name")})
+    expected = pristine.copy()
+    row_ids = [str(i).zfill(8) for i in range(15)]
+    for _ in range(300):
+        operation = random.choice(["delete", "delete", "update", "append", "read"])
+        row_id = random.choice(row_ids)
+        positions = np.flatnonzero(expected["row_id"] == row_id)
+        if operation == "delete":
+            table.delete_rows(table.rows("row_id", row_id))
+            expected = expected.take(np.setdiff1d(np.arange(len(expected)), positions))
+        elif operation == "update":
+            table.set_values(table.rows("row_id", row_id), "name", "Updated")
+            expected.iloc[positions, 1] = "Updated"
+        elif operation == "append":
+            table.append_rows(pd.DataFrame({"row_id": [row_id], "name": ["New"]}), ignore_index=True)
+            expected = pd.concat([expected, pd.DataFrame({"row_id": [row_id], "name": ["New"]})], ignore_index=True)
+        else:
+            pd.testing.assert_frame_equal(table.frame, expected)
+        for row_id in row_ids[:5]:
+            assert table.rows("row_id", row_id).tolist() == np.flatnonzero(expected["row_id"] == row_id).tolist()
+        texts = (expected["row_id"] + " " + expected["name"]).str.lower()
+        assert table.search_text("text", ["upd"]).tolist() == np.flatnonzero(texts.str.contains("upd")).tolist()
+    pd.testing.assert_frame_equal(table.frame, expected)
+
+
+def test_next_id_matches_column_maximum():
+    """
+    Tests that next_id gives the ID after the column's maximum after random inserts, updates, deletes and resets,
+    including deletes of the largest ID.
+    """
+    random.seed(0)
+    pristine = pd.DataFrame({"row_id": [str(i).zfill(8) for i in range(10)], "name": ["Name"] * 10})
+    table = DomainTable(pristine, indexed_columns=("row_id",))
+    for _ in range(200):
+        operation = random.choice(["insert", "update", "delete", "delete", "reset"])
+        if operation == "insert":
+            table.append_rows(pd.DataFrame({"row_id": [table.next_id("row_id", 8)], "name": ["New"]}))
+        elif operation == "update":
+            table.set_values([random.randrange(len(table.frame))], "row_id", str(random.randrange(30)).zfill(8))
+        elif operation == "delete" and len(table.frame) > 1:
+            largest = random.random() < 0.5
+            table.delete_rows(table.rows("row_id", table.frame["row_id"].max()) if largest else [0])
+        elif operation == "reset":
+            table.reset()
+        assert table.next_id("row_id", 8) == str(int(table.frame["row_id"].max()) + 1).zfill(8)
+        assert table.next_id("row_id") == str(int(table.frame["row_id"].max()) + 1)
+
+
+def test_assigned_module_attribute_is_adopted():
+    """
+    Tests that a frame assigned to a module attribute is used by the tools and discarded on reset.
+    """
+    email.EMAILS = pd.DataFrame(
+        [
+            {
+                "email_id": "00000001",
+                "inbox/outbox": "inbox",
+                "sender/recipient": "jane@example.com",
+                "subject": "Project Update",
+                "sent_datetime": "2024-01-10 09:30:00",
+                "body": "Please find the project update attached.",
+            }
+        ]
+    )
+    assert email.delete_email.func("00000001") == "Email deleted successfully."
+    assert len(email.EMAILS) == 0
+    email.reset_state()
+    assert email.EMAILS is pristine_table("emails")
+
+
+def test_id_list():
+    """
+    Tests that a single ID and lists of IDs give the distinct IDs in the order they are first given.
+    """
+    assert id_list("00000001") == ["00000001"]
+    assert id_list(["00000002", "00000001", "00000002"]) == ["00000002", "00000001"]
+    assert id_list([]) == []
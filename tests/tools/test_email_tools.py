@@ -53,6 +53,24 @@ def test_get_email_information_by_id_field_not_found():
     email.reset_state()
 
 
+def test_get_email_information_by_ids():
+    """
+    Tests that get_email_information_by_ids returns what get_email_information_by_id returns for each ID and field.
+    """
+    email.EMAILS = pd.DataFrame(test_emails)
+    assert email.get_email_information_by_ids.func(["12345679", "00000000", "12345678"], ["subject", "body"]) == {
+        "12345679": {"subject": "Meeting Request", "body": "Can we schedule a meeting for next week?"},
+        "00000000": "Email not found.",
+        "12345678": {"subject": "Project Update", "body": "Please find the project update attached."},
+    }
+    assert email.get_email_information_by_ids.func("12345678", "subject") == {"12345678": {"subject": "Project Update"}}
+    assert email.get_email_information_by_ids.func() == "Email IDs not provided."
+    assert email.get_email_information_by_ids.func(["12345678"]) == "Fields not provided."
+    result = email.get_email_information_by_ids.func(["12345678"], ["subject", "field_does_not_exist"])
+    assert result == "Field not found."
+    email.reset_state()
+
+
 def test_search_emails():
     """
     Tests search_emails.
@@ -100,6 +118,47 @@ def test_search_emails_no_results():
     assert email.search_emails.func("email_does_not_exist") == "No emails found."
 
 
+def search_emails_by_filtering_sorted_matches(query, date_min, date_max):
+    # Reference implementation that sorts every email matching the query and then filters it by date
+    emails = email.EMAILS
+    words = query.lower().split()
+    text = (emails["subject"] + " " + emails["body"] + " " + emails["sender/recipient"]).str.lower()
+    matches = emails[text.apply(lambda value: all(word in value for word in words))]
+    matches = matches.sort_values("sent_datetime", ascending=False).to_dict(orient="records")
+    if date_min:
+        matches = [e for e in matches if pd.Timestamp(e["sent_datetime"]).date() >= pd.Timestamp(date_min).date()]
+    if date_max:
+        matches = [e for e in matches if pd.Timestamp(e["sent_datetime"]).date() <= pd.Timestamp(date_max).date()]
+    return matches[:5] if len(matches) else "No emails found."
+
+
+def test_search_emails_date_range():
+    """
+    Tests that search_emails with dates returns the same emails as sorting every match and then filtering it by date,
+    before and after an email is deleted.
+    """
+    queries = ["", "meeting", "update", "email_does_not_exist"]
+    date_ranges = [
+        ("2023-11-01", None),
+        (None, "2023-10-01"),
+        ("2023-11-10", "2023-11-20"),
+        ("2023-11-30", "2023-11-30"),
+        ("2030-01-01", None),
+    ]
+    for query in queries:
+        for date_min, date_max in date_ranges:
+            expected = search_emails_by_filtering_sorted_matches(query, date_min, date_max)
+            assert email.search_emails.func(query, date_min, date_max) == expected
+
+    newest_email_id = email.search_emails.func("", "2023-11-01")[0]["email_id"]
+    email.delete_email.func(newest_email_id)
+    for query in queries:
+        for date_min, date_max in date_ranges:
+            expected = search_emails_by_filtering_sorted_matches(query, date_min, date_max)
+            assert email.search_emails.func(query, date_min, date_max) == expected
+    email.reset_state()
+
+
 def test_send_email():
     """
     Tests send_email.
@@ -147,6 +206,24 @@ def test_delete_email_not_found():
     email.reset_state()
 
 
+def test_delete_emails_matches_deleting_one_at_a_time():
+    """
+    Tests that delete_emails leaves the emails as calling delete_email for each distinct ID does.
+    """
+    email.reset_state()
+    email_ids = email.EMAILS["email_id"].iloc[[9, 0, 120, 9]].tolist() + ["99999999"]
+    messages = {}
+    for email_id in email_ids:
+        messages.setdefault(email_id, email.delete_email.func(email_id))
+    expected = email.EMAILS.copy()
+
+    email.reset_state()
+    assert email.delete_emails.func(email_ids) == messages
+    pd.testing.assert_frame_equal(email.EMAILS, expected)
+    assert email.delete_emails.func() == "Email IDs not provided."
+    email.reset_state()
+
+
 def test_forward_email():
     """
     Tests forward_email.
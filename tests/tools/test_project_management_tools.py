@@ -1,3 +1,5 @@
+import re
+
 import pandas as pd
 import pytest
 
@@ -65,6 +67,21 @@ def test_get_task_information_by_id_field_not_found():
     assert task == "Field not found."
 
 
+def test_get_task_information_by_ids():
+    """
+    Tests that get_task_information_by_ids returns what get_task_information_by_id returns for each ID and field.
+    """
+    tasks = project_management.get_task_information_by_ids.func(["00000244", "00000144"], ["task_name", "board"])
+    assert tasks == {
+        "00000244": {"task_name": "Create wireframe for landing page", "board": "Design"},
+        "00000144": {"task_name": "Add animation to modal window", "board": "Front end"},
+    }
+    assert project_management.get_task_information_by_ids.func(["99999999"], "board") == {"99999999": "Task not found."}
+    assert project_management.get_task_information_by_ids.func() == "Task IDs not provided."
+    assert project_management.get_task_information_by_ids.func(["00000144"]) == "Fields not provided."
+    assert project_management.get_task_information_by_ids.func(["00000144"], ["priority"]) == "Field not found."
+
+
 def test_create_task():
     """
     Tests create_task.
@@ -143,6 +160,49 @@ def test_update_task_not_found():
     assert message == "Task not found."
 
 
+def test_delete_tasks_matches_deleting_one_at_a_time():
+    """
+    Tests that delete_tasks leaves the tasks as calling delete_task for each ID does, including repeated and missing
+    IDs.
+    """
+    project_management.reset_state()
+    task_ids = project_management.PROJECT_TASKS["task_id"].iloc[[5, 2, 40, 5]].tolist() + ["99999999"]
+    messages = {}
+    for task_id in task_ids:
+        # A repeated ID is reported as deleted by its first deletion
+        messages.setdefault(task_id, project_management.delete_task.func(task_id))
+    expected = project_management.PROJECT_TASKS.copy()
+
+    project_management.reset_state()
+    assert project_management.delete_tasks.func(task_ids) == messages
+    pd.testing.assert_frame_equal(project_management.PROJECT_TASKS, expected)
+    assert project_management.delete_tasks.func([]) == "Task IDs not provided."
+
+
+def test_update_tasks_matches_updating_one_at_a_time():
+    """
+    Tests that update_tasks leaves the tasks as calling update_task for each ID does, and validates the new value once.
+    """
+    project_management.reset_state()
+    task_ids = project_management.PROJECT_TASKS["task_id"].iloc[[7, 3, 7, 30]].tolist() + ["99999999"]
+    updates = [("assigned_to_email", "Leila.Azizi@atlas.com"), ("list_name", "Completed"), ("task_id", "00009999")]
+    for field, new_value in updates:
+        project_management.reset_state()
+        messages = {}
+        for task_id in task_ids:
+            messages.setdefault(task_id, project_management.update_task.func(task_id, field, new_value))
+        expected = project_management.PROJECT_TASKS.copy()
+
+        project_management.reset_state()
+        assert project_management.update_tasks.func(task_ids, field, new_value) == messages
+        pd.testing.assert_frame_equal(project_management.PROJECT_TASKS, expected)
+
+    project_management.reset_state()
+    assert project_management.update_tasks.func(task_ids, "board", "Mobile").startswith("Board not valid.")
+    assert project_management.update_tasks.func(task_ids[:1], "priority", "High") == {task_ids[0]: "Field not valid."}
+    assert project_management.update_tasks.func(None, "board", "Design") == "Task IDs, field, or new value not provided."
+
+
 def test_search_tasks():
     """
     Tests search_tasks.
@@ -175,3 +235,103 @@ def test_search_tasks_multiple_results():
     """
     tasks = project_management.search_tasks.func(due_date="2023-11-28")
     assert tasks == test_tasks
+
+
+def search_tasks_by_scanning(**parameters):
+    # Reference implementation that filters every task with str.contains
+    tasks = project_management.PROJECT_TASKS
+    for column in ["task_name", "assigned_to_email", "list_name", "due_date", "board"]:
+        if parameters.get(column):
+            tasks = tasks[tasks[column].str.contains(parameters[column], case=False)]
+    return tasks.to_dict(orient="records")
+
+
+def test_search_tasks_matches_scanning():
+    """
+    Tests that search_tasks returns the same tasks as filtering every task, including for patterns with wildcards and
+    other special characters, and after tasks are created, updated and deleted.
+    """
+    project_management.reset_state()
+    searches = [
+        {"task_name": "api"},
+        {"task_name": "add.*page", "board": "design"},
+        {"assigned_to_email": "KHAN", "list_name": "backlog"},
+        {"due_date": "2023-11", "board": "end"},
+        {"list_name": "Progress|Review"},
+        {"task_name": "does not exist"},
+    ]
+    for parameters in searches:
+        assert project_management.search_tasks.func(**parameters) == search_tasks_by_scanning(**parameters)
+
+    first_id = project_management.PROJECT_TASKS["task_id"].iloc[0]
+    project_management.update_task.func(first_id, "board", "Design")
+    project_management.delete_task.func(project_management.PROJECT_TASKS["task_id"].iloc[1])
+    project_management.create_task.func("Add API page", "fatima.khan@company.com", "Backlog", "2023-11-30", "Design")
+    for parameters in searches:
+        assert project_management.search_tasks.func(**parameters) == search_tasks_by_scanning(**parameters)
+
+
+def test_search_tasks_paginated():
+    """
+    Tests that paging through search_tasks returns every matching task once, in task ID order, with only the requested
+    fields, even if a task is deleted between pages.
+    """
+    project_management.reset_state()
+    expected = sorted(project_management.search_tasks.func(board="end"), key=lambda task: task["task_id"])
+    pages = []
+    cursor = None
+    while True:
+        page = project_management.search_tasks.func(board="end", limit=7, cursor=cursor, fields=["task_id", "board"])
+        pages.append(page["tasks"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        if len(pages) == 2:
+            # Deleting a task that was already returned does not shift the next page
+            project_management.delete_task.func(pages[0][0]["task_id"])
+    assert all(len(page) == 7 for page in pages[:-1]) and 0 < len(pages[-1]) <= 7
+    assert [task for page in pages for task in page] == [
+        {"task_id": task["task_id"], "board": task["board"]} for task in expected
+    ]
+
+
+def test_search_tasks_paginated_string_limit():
+    """
+    Tests that a limit given as a string, as agents pass every argument, is the same as the integer.
+    """
+    project_management.reset_state()
+    assert project_management.search_tasks.func(board="end", limit="5") == project_management.search_tasks.func(
+        board="end", limit=5
+    )
+
+
+def test_search_tasks_paginated_invalid_arguments():
+    """
+    Tests search_tasks with an invalid limit, cursor or field.
+    """
+    assert project_management.search_tasks.func(board="end", limit=0) == "Limit must be a positive integer."
+    assert project_management.search_tasks.func(board="end", limit="five") == "Limit must be a positive integer."
+    assert project_management.search_tasks.func(board="end", limit="0") == "Limit must be a positive integer."
+    assert project_management.search_tasks.func(board="end", limit=True) == "Limit must be a positive integer."
+    assert project_management.search_tasks.func(board="end", cursor=5) == "Cursor not valid."
+    assert project_management.search_tasks.func(board="end", fields=["priority"]) == "Field not valid."
+    assert project_management.search_tasks.func(board="end", limit=5, cursor="99999999") == {
+        "tasks": [],
+        "next_cursor": None,
+    }
+
+
+def count_tokens(observation):
+    # Approximates the number of tokens of an observation in the prompt by counting words and punctuation marks
+    return len(re.findall(r"\w+|[^\w\s]", str(observation)))
+
+
+def test_search_tasks_paginated_saves_observation_tokens():
+    """
+    Tests that the first page of a broad search takes less than a tenth of the observation tokens of the default of
+    returning every matching task with every field.
+    """
+    project_management.reset_state()
+    full = count_tokens(project_management.search_tasks.func(list_name="Backlog"))
+    page = project_management.search_tasks.func(list_name="Backlog", limit=5, fields=["task_id", "task_name"])
+    assert count_tokens(page) < full / 10
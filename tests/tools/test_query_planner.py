@@ -0,0 +1,142 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from src.tools.domain_table import DomainTable
+from src.tools.query_planner import Between, Contains, TextContains, TimestampBetween, find_rows, literal_words
+
+statuses = ["Lead", "Qualified", "Won", "Lost"]
+names = ["John Smith", "Jane Doe", "Sam Lee", "Carlos Diaz", "Amy Johnson", "Kai Chen"]
+
+
+def make_table(num_rows):
+    random.seed(0)
+    rows = [
+        {
+            "row_id": str(i).zfill(8),
+            "name": random.choice(names),
+            "status": random.choice(statuses),
+            "date": f"2023-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+            "start": f"2023-11-{random.randint(1, 30):02d} {random.randint(0, 23):02d}:00:00",
+        }
+        for i in range(num_rows)
+    ]
+    return DomainTable(
+        pd.DataFrame(rows),
+        indexed_columns=("row_id", "name", "status", "date"),
+        text_indexes={"name_text": ("name",)},
+        timestamp_indexes={"start_time": "start"},
+    )
+
+
+def filter_rows(frame, name=None, status=None, date_min=None, date_max=None, start_min=None, start_max=None):
+    # Reference implementation that filters every row
+    keep = pd.Series(True, index=frame.index)
+    if name:
+        keep &= frame["name"].str.contains(name, case=False)
+    if status:
+        keep &= frame["status"].str.contains(status, case=False)
+    if date_min:
+        keep &= frame["date"] >= date_min
+    if date_max:
+        keep &= frame["date"] <= date_max
+    if start_min:
+        keep &= pd.to_datetime(frame["start"]) >= pd.Timestamp(start_min)
+    if start_max:
+        keep &= pd.to_datetime(frame["start"]) <= pd.Timestamp(start_max)
+    return np.flatnonzero(keep)
+
+
+def plan_rows(table, name=None, status=None, date_min=None, date_max=None, start_min=None, start_max=None, limit=None):
+    predicates = []
+    if name:
+        predicates.append(Contains("name", name, "name_text"))
+    if status:
+        predicates.append(Contains("status", status))
+    if date_min or date_max:
+        predicates.append(Between("date", date_min, date_max))
+    if start_min or start_max:
+        minimum = pd.Timestamp(start_min).value if start_min else pd.Timestamp.min.value
+        maximum = pd.Timestamp(start_max).value if start_max else pd.Timestamp.max.value
+        predicates.append(TimestampBetween("start_time", minimum, maximum))
+    return find_rows(table, predicates, limit)
+
+
+searches = [
+    {},
+    {"name": "john"},
+    {"name": "J.hn", "status": "l"},
+    {"name": "^sam|kai"},
+    {"status": "WON", "date_min": "2023-06-01"},
+    {"name": "e", "date_min": "2023-03-01", "date_max": "2023-04-15"},
+    {"status": "qualified", "start_min": "2023-11-10", "start_max": "2023-11-12 12:00:00"},
+    {"name": "does not exist", "status": "lead"},
+    {"date_max": "2023-01-31", "start_min": "2023-11-29"},
+]
+
+
+def test_literal_words():
+    """
+    Tests that only the parts between "." wildcards of plain patterns are treated as literal.
+    """
+    assert literal_words("John Smith") == ["john smith"]
+    assert literal_words("j.hn..smith") == ["j", "hn", "smith"]
+    assert literal_words("^john") is None
+    assert literal_words("café") is None
+    assert literal_words(5) is None
+
+
+def test_find_rows_matches_filtering():
+    """
+    Tests that planned searches return the same rows as filtering every row, with and without a limit, before and
+    after rows are modified, added and deleted.
+    """
+    table = make_table(500)
+    for parameters in searches:
+        expected = filter_rows(table.frame, **parameters)
+        assert plan_rows(table, **parameters).tolist() == expected.tolist()
+        assert plan_rows(table, **parameters, limit=5).tolist() == expected[:5].tolist()
+
+    table.set_values(table.rows("status", "Won")[:20], "status", "Lost")
+    table.set_values(table.rows("name", "Sam Lee")[:10], "name", "Johnny Walker")
+    table.delete_rows(np.arange(0, 100, 3))
+    for i in range(20):
+        table.append_row(["x" + str(i), "John Smith", "Won", "2023-06-15", "2023-11-11 08:00:00"])
+    for parameters in searches:
+        expected = filter_rows(table.frame, **parameters)
+        assert plan_rows(table, **parameters).tolist() == expected.tolist()
+        assert plan_rows(table, **parameters, limit=5).tolist() == expected[:5].tolist()
+
+
+def test_find_rows_without_predicates():
+    """
+    Tests that every row matches an empty list of predicates.
+    """
+    table = make_table(10)
+    assert find_rows(table, []).tolist() == list(range(10))
+    assert find_rows(table, [], limit=3).tolist() == [0, 1, 2]
+
+
+def test_find_rows_text_contains():
+    """
+    Tests that rows are found by all the words of an n-gram index, as search_text finds them.
+    """
+    table = make_table(200)
+    for words in [[], ["john"], ["jane", "doe"], ["an"], ["missing"]]:
+        predicate = TextContains("name_text", words)
+        assert find_rows(table, [predicate]).tolist() == table.search_text("name_text", words).tolist()
+
+
+def test_find_rows_falls_back_when_inexact():
+    """
+    Tests that searches which cannot be evaluated exactly as the original filters return None.
+    """
+    table = make_table(10)
+    # Invalid regular expression
+    assert find_rows(table, [Contains("name", "(")]) is None
+    # Comparison of strings with a number
+    assert find_rows(table, [Between("date", 5)]) is None
+    # Column holding a missing value
+    table.set_values([0], "status", None)
+    assert find_rows(table, [Contains("status", "lead")]) is None
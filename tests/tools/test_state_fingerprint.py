@@ -0,0 +1,132 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from src.evals.utils import convert_strs_to_lowercase
+from src.tools.domain_table import DomainTable
+from src.tools.state_fingerprint import frame_fingerprint
+
+values = ["a", "A", "Name", "\x00a", "\x00b", None, np.nan, 5, 5.0, True, 1, pd.Timestamp("2023-11-30")]
+
+
+def random_frame(num_rows):
+    return pd.DataFrame(
+        {
+            "row_id": [str(row).zfill(8) for row in range(num_rows)],
+            "status": [random.choice(["Lead", "lead"]) for _ in range(num_rows)],
+            "name": [random.choice(values) for _ in range(num_rows)],
+        },
+        dtype=object,
+    )
+
+
+def test_fingerprints_match_frame_equality():
+    """
+    Tests that frames have the same fingerprint exactly when they are equal, as they are and converted to lowercase.
+    """
+    random.seed(0)
+    frames = [random_frame(random.randrange(4)) for _ in range(300)]
+    frames += [frame.iloc[::-1] for frame in frames[:20]] + [frame.reset_index(drop=True) for frame in frames[:20]]
+    for lowercase in (False, True):
+        fingerprinted = []
+        for frame in frames:
+            fingerprint = frame_fingerprint(frame, lowercase)
+            try:
+                state = convert_strs_to_lowercase(frame.copy()) if lowercase else frame
+            except AttributeError:
+                # Series.str.lower() raises an error for some columns without strings, e.g. of timestamps
+                assert fingerprint is None
+                continue
+            if fingerprint is not None:
+                fingerprinted.append((fingerprint, state))
+        assert len(fingerprinted) > len(frames) / 2
+        for first, first_state in fingerprinted:
+            for second, second_state in fingerprinted:
+                assert (first == second) == first_state.equals(second_state)
+
+
+def test_fingerprint_is_none_for_other_dtypes():
+    """
+    Tests that frames with columns which are not of object dtype, or bytes, are not fingerprinted.
+    """
+    assert frame_fingerprint(pd.DataFrame({"name": [1, 2]})) is None
+    assert frame_fingerprint(pd.DataFrame({"name": ["a", b"a"]})) is None
+    assert frame_fingerprint(pd.DataFrame({"name": ["a", "b"]}, index=["x", "y"])) is None
+
+
+def test_table_fingerprint_matches_frame_through_writes():
+    """
+    Tests that the fingerprint a table keeps up to date matches the fingerprint of its frame after random updates,
+    appends, deletes and resets.
+    """
+    random.seed(0)
+    table = DomainTable(random_frame(12), indexed_columns=("row_id",))
+    for step in range(500):
+        operation = random.choice(["update", "append_row", "append_rows", "append_rows_ignore_index", "delete", "reset"])
+        if operation == "update" and len(table.frame):
+            field = random.choice(["row_id", "status", "name"])
+            table.set_values([random.randrange(len(table.frame))], field, random.choice(values))
+        elif operation == "append_row":
+            table.append_row([str(100 + step).zfill(8), "Won", random.choice(values)])
+        elif operation.startswith("append_rows"):
+            rows = pd.DataFrame({"row_id": [str(100 + step).zfill(8)], "status": ["Won"], "name": ["New"]})
+            # Concatenating rows with the columns in another order keeps the order of the table's columns
+            rows = rows[random.sample(list(rows.columns), len(rows.columns))]
+            table.append_rows(rows, ignore_index=operation.endswith("ignore_index"))
+        elif operation == "delete" and len(table.frame):
+            table.delete_rows([random.randrange(len(table.frame))])
+        elif operation == "reset":
+            table.reset()
+        for lowercase in (False, True):
+            assert table.fingerprint(lowercase) == frame_fingerprint(table.frame, lowercase)
+
+
+def random_writes(table, num_writes):
+    for _ in range(num_writes):
+        operation = random.choice(["update", "append_row", "delete"])
+        if operation == "update" and len(table.frame):
+            field = random.choice(["status", "name"])
+            table.set_values([random.randrange(len(table.frame))], field, random.choice(["a", "A", "Lead", "lead"]))
+        elif operation == "append_row":
+            table.append_row([str(len(table.frame)).zfill(8), "Lead", random.choice(["a", "A"])])
+        elif operation == "delete" and len(table.frame):
+            table.delete_rows([random.randrange(len(table.frame))])
+
+
+def test_change_sets_match_frame_equality():
+    """
+    Tests that tables created from the same pristine frame have equal change sets exactly when their frames are equal,
+    and empty ones exactly when they equal the pristine frame.
+    """
+    random.seed(0)
+    pristine = pd.DataFrame({"row_id": ["00000000", "00000001", "00000002"], "status": "Lead", "name": "a"})
+    tables = [DomainTable(pristine) for _ in range(2)]
+    for _ in range(500):
+        for table in tables:
+            table.reset()
+            random_writes(table, random.randrange(4))
+        for lowercase in (False, True):
+            first, second = [table.change_set(lowercase) for table in tables]
+            states = [table.frame.copy() for table in tables]
+            if lowercase:
+                states = [convert_strs_to_lowercase(state) for state in states]
+            assert (first == second) == states[0].equals(states[1])
+        assert (not any(tables[0].change_set())) == tables[0].frame.equals(pristine)
+
+
+def test_change_set_of_restored_row():
+    """
+    Tests that deleting the last row and appending it again is not a change, as the frame is then the pristine one.
+    """
+    pristine = pd.DataFrame({"row_id": ["00000000", "00000001"], "name": ["a", "b"]})
+    table = DomainTable(pristine)
+    table.delete_rows([1])
+    assert table.change_set().deleted == (1,)
+    table.append_row(["00000001", "b"])
+    assert table.frame.equals(pristine)
+    assert table.change_set() == ((), (), ())
+    table.delete_rows([1])
+    table.append_row(["00000001", "B"])
+    assert table.change_set(lowercase=True) == ((), (), ())
+    assert len(table.change_set().updated) == 1
@@ -0,0 +1,50 @@
+import random
+
+from src.tools.text_index import FrozenNgramIndex, NgramIndex, document
+
+test_documents = [
+    "project update please find the project update attached. jane@example.com",
+    "meeting request can we schedule a meeting for next week? mark@example.com",
+    "",
+    "fw: café menu ünïcode straße nan",
+    "re: q4 budget numbers look good. sam@example.com",
+]
+
+
+def brute_force_search(documents, words):
+    return [key for key, text in enumerate(documents) if text is not None and all(word in text for word in words)]
+
+
+def test_search_matches_substring_semantics():
+    """
+    Tests that the index returns exactly the documents that contain every word as a substring.
+    """
+    index = NgramIndex(FrozenNgramIndex(test_documents))
+    queries = [[], ["project"], ["meet", "week?"], ["e"], ["ex", "com"], ["straße"], ["nan"], ["missing"], ["q4"], ["€"]]
+    for words in queries:
+        assert index.search(words).tolist() == brute_force_search(test_documents, words)
+
+
+def test_search_after_changes():
+    """
+    Tests that added, modified and removed documents are searched correctly.
+    """
+    random.seed(0)
+    documents = list(test_documents)
+    index = NgramIndex(FrozenNgramIndex(list(documents)))
+    words = ["project", "meeting", "example", "ca", "budget", "update"]
+    for _ in range(100):
+        key = random.randrange(len(documents) + 1)
+        values = (random.choice(words), random.choice(["Project", "Budget", "Other"]))
+        if key == len(documents):
+            documents.append(document(values))
+            index.add(key, values)
+        elif random.random() < 0.5:
+            index.discard(key, ())
+            documents[key] = None
+        else:
+            index.discard(key, ())
+            index.add(key, values)
+            documents[key] = document(values)
+        query = random.sample(words, 2)
+        assert index.search(query).tolist() == brute_force_search(documents, query)
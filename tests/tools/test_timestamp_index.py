@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from src.tools.timestamp_index import FrozenTimestampIndex, TimestampIndex, timestamp_value
+
+test_values = np.array(
+    [
+        "2023-11-10 09:30:00",
+        "2023-11-01 00:00:00",
+        "2023-11-10 09:30:00",
+        "2023-11-30 23:59:59",
+        "2023-10-15",
+    ],
+    dtype=object,
+)
+
+
+def brute_force_between(values, minimum, maximum):
+    return [
+        key
+        for key, value in enumerate(values)
+        if timestamp_value(value) is not None and minimum <= timestamp_value(value) <= maximum
+    ]
+
+
+def test_keys_between_matches_comparisons():
+    """
+    Tests that the index returns exactly the keys of the timestamps in the range, in ascending order.
+    """
+    index = TimestampIndex(FrozenTimestampIndex(test_values))
+    assert index.num_unindexed == 0
+    ranges = [
+        ("2023-11-01", "2023-11-10 09:30:00"),
+        ("2023-11-10 09:30:00", "2023-11-10 09:30:00"),
+        ("2023-12-01", "2024-01-01"),
+        ("2000-01-01", "2030-01-01"),
+    ]
+    for minimum, maximum in ranges:
+        minimum, maximum = pd.Timestamp(minimum).value, pd.Timestamp(maximum).value
+        assert index.keys_between(minimum, maximum).tolist() == brute_force_between(test_values, minimum, maximum)
+
+
+def test_values_that_are_not_timestamp_strings_are_counted():
+    """
+    Tests that values that are not timezone-naive timestamp strings are not indexed but counted.
+    """
+    values = np.array(["2023-11-10 09:30:00", None, "not a date", pd.Timestamp("2023-11-10")], dtype=object)
+    assert FrozenTimestampIndex(values).num_unindexed == 3
+    values = np.array(["2023-11-10 09:30:00", "2023-11-10T09:30:00+01:00"], dtype=object)
+    assert FrozenTimestampIndex(values).num_unindexed == 2
+    index = TimestampIndex(FrozenTimestampIndex(test_values))
+    index.add(len(test_values), (pd.Timestamp("2023-11-10"),))
+    assert index.num_unindexed == 1
+    index.discard(len(test_values), (pd.Timestamp("2023-11-10"),))
+    assert index.num_unindexed == 0
+
+
+def test_keys_between_after_changes():
+    """
+    Tests that added, modified and removed timestamps are found correctly.
+    """
+    random.seed(0)
+    values = list(test_values)
+    index = TimestampIndex(FrozenTimestampIndex(np.array(values, dtype=object)))
+    for _ in range(100):
+        key = random.randrange(len(values) + 1)
+        value = f"2023-11-{random.randint(1, 30):02d} {random.randint(0, 23):02d}:00:00"
+        if key == len(values):
+            values.append(value)
+            index.add(key, (value,))
+        elif values[key] is None:
+            continue
+        elif random.random() < 0.5:
+            index.discard(key, (values[key],))
+            values[key] = None
+        else:
+            index.discard(key, (values[key],))
+            index.add(key, (value,))
+            values[key] = value
+        minimum, maximum = sorted(pd.Timestamp(f"2023-11-{random.randint(1, 30):02d}").value for _ in range(2))
+        assert index.keys_between(minimum, maximum).tolist() == brute_force_between(values, minimum, maximum)
@@ -0,0 +1,58 @@
+import threading
+
+from src.tools import email
+from src.tools.toolkits import bind_tools_to_workspace, email_toolkit
+from src.tools.workspace import DEFAULT_WORKSPACE, Workspace, current_workspace, pristine_table, use_workspace
+
+
+def test_workspace_changes_are_isolated():
+    """
+    Tests that changes made in a workspace are not visible in the default workspace.
+    """
+    workspace = Workspace()
+    with use_workspace(workspace):
+        assert current_workspace() is workspace
+        email.send_email.func("jane@example.com", "Meeting Reminder", "Don't forget our meeting.")
+        assert len(email.EMAILS) == len(pristine_table("emails")) + 1
+    assert current_workspace() is DEFAULT_WORKSPACE
+    assert email.EMAILS is pristine_table("emails")
+    workspace.reset()
+    assert workspace.table("emails").frame is pristine_table("emails")
+
+
+def test_workspaces_on_different_threads():
+    """
+    Tests that threads using different workspaces do not see each other's changes.
+    """
+    email_ids = list(pristine_table("emails")["email_id"][:4])
+    remaining_emails = {}
+
+    def delete_email(email_id):
+        with use_workspace(Workspace()):
+            email.delete_email.func(email_id)
+            remaining_emails[email_id] = set(email.EMAILS["email_id"])
+
+    threads = [threading.Thread(target=delete_email, args=(email_id,)) for email_id in email_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for email_id in email_ids:
+        assert remaining_emails[email_id] == set(pristine_table("emails")["email_id"]) - {email_id}
+    assert email.EMAILS is pristine_table("emails")
+
+
+def test_bound_tools_use_their_workspace():
+    """
+    Tests that bound tools keep their name and arguments and always use their workspace.
+    """
+    workspace = Workspace()
+    bound_tools = bind_tools_to_workspace(email_toolkit, workspace)
+    assert [tool.name for tool in bound_tools] == [tool.name for tool in email_toolkit]
+    assert [tool.args for tool in bound_tools] == [tool.args for tool in email_toolkit]
+
+    send_email = next(tool for tool in bound_tools if tool.name == "email.send_email")
+    send_email.func("jane@example.com", "Meeting Reminder", "Don't forget our meeting.")
+    assert len(workspace.table("emails").frame) == len(pristine_table("emails")) + 1
+    assert email.EMAILS is pristine_table("emails")